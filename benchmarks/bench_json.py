@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Compare JSON encode/decode cost of the available response backends.
+
+Encodes a question-paper sized payload (UUIDs, datetimes, nested lists) and
+parses a batch answer submission body with each backend.
+
+Usage: python benchmarks/bench_json.py [iterations] [questions]
+"""
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_payload(questions: int) -> dict:
+    import datetime as dt
+    now = dt.datetime.now(dt.timezone.utc)
+    return {
+        'exam_id': uuid.uuid4(),
+        'questions': [
+            {
+                'id': uuid.uuid4(),
+                'question': {
+                    'id': uuid.uuid4(),
+                    'question': f'Question {i} text goes here?',
+                    'score': 2,
+                    'created_at': now,
+                },
+                'answers': [
+                    {'id': uuid.uuid4(), 'answer': f'Option {j}', 'created_at': now}
+                    for j in range(4)
+                ],
+            }
+            for i in range(questions)
+        ],
+    }
+
+
+def run_benchmark(iterations: int, questions: int) -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+    
+    from core.json_backend import BACKENDS
+    
+    payload = build_payload(questions)
+    body = BACKENDS['json'].dumps({
+        'answers': [
+            {'exam_question_id': str(uuid.uuid4()), 'answer_id': str(uuid.uuid4())}
+            for _ in range(questions)
+        ]
+    })
+    
+    print(f'iterations: {iterations}, questions: {questions}')
+    for name, backend in BACKENDS.items():
+        encode = timeit.timeit(lambda: backend.dumps(payload), number=iterations) / iterations * 1e6
+        decode = timeit.timeit(lambda: backend.loads(body), number=iterations) / iterations * 1e6
+        print(f'{name:8} encode {encode:9.1f} us   decode {decode:9.1f} us')
+    if 'orjson' not in BACKENDS:
+        print('orjson is not installed; only the standard library backend was measured')
+
+
+if __name__ == '__main__':
+    run_benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
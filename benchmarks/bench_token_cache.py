@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Compare per-request token verification cost with the JWT token cache on and off.
+
+Usage: python benchmarks/bench_token_cache.py [iterations]
+"""
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_benchmark(iterations: int) -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+    
+    import datetime as dt
+    import jwt
+    from django.conf import settings
+    from django.test.utils import override_settings
+    from core.middleware import _decode_token, _jwt_secret, _token_cache, token_cache_stats
+    
+    now = dt.datetime.utcnow()
+    token = jwt.encode({
+        'sub': str(uuid.uuid4()),
+        'email': 'bench@example.com',
+        'iat': int(now.timestamp()),
+        'exp': int((now + dt.timedelta(hours=1)).timestamp()),
+        'type': 'access',
+    }, _jwt_secret(), algorithm='HS256')
+    
+    results = {}
+    for enabled in (False, True):
+        jwt_auth = {**getattr(settings, 'JWT_AUTH', {}), 'JWT_TOKEN_CACHE_ENABLED': enabled}
+        with override_settings(JWT_AUTH=jwt_auth):
+            _token_cache.clear()
+            _decode_token(token)
+            elapsed = timeit.timeit(lambda: _decode_token(token), number=iterations)
+        results[enabled] = elapsed / iterations * 1e6
+    
+    print(f'iterations:      {iterations}')
+    print(f'cache off:       {results[False]:.2f} us/request')
+    print(f'cache on:        {results[True]:.2f} us/request')
+    print(f'speedup:         {results[False] / results[True]:.1f}x')
+    print(f'cache hit ratio: {token_cache_stats()["hit_ratio"]:.3f}')
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
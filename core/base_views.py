@@ -1,10 +1,11 @@
-import json
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
 from typing import Dict, Any, Optional
 
+from . import json_backend
+
 
 class BaseAPIView(View):
     
@@ -14,8 +15,8 @@ class BaseAPIView(View):
     
     def get_json_data(self, request) -> Dict[str, Any]:
         try:
-            return json.loads(request.body.decode('utf-8'))
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            return json_backend.loads(request.body)
+        except ValueError:
             raise ValueError('Invalid JSON')
     
     def validate_required_fields(self, data: Dict[str, Any], required_fields: list) -> None:
@@ -23,13 +24,19 @@ class BaseAPIView(View):
         if missing_fields:
             raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
     
-    def success_response(self, data: Dict[str, Any], status: int = 200) -> JsonResponse:
-        return JsonResponse(data, status=status)
+    def success_response(self, data: Dict[str, Any], status: int = 200) -> HttpResponse:
+        return self.raw_json_response(self.encode_json(data), status)
+    
+    def encode_json(self, data: Dict[str, Any]) -> bytes:
+        return json_backend.dumps(data)
     
-    def error_response(self, message: str, status: int = 400) -> JsonResponse:
-        return JsonResponse({'detail': message}, status=status)
+    def raw_json_response(self, content: bytes, status: int = 200) -> HttpResponse:
+        return HttpResponse(content, status=status, content_type='application/json')
     
-    def handle_exception(self, exception: Exception) -> JsonResponse:
+    def error_response(self, message: str, status: int = 400) -> HttpResponse:
+        return self.raw_json_response(self.encode_json({'detail': message}), status)
+    
+    def handle_exception(self, exception: Exception) -> HttpResponse:
         if isinstance(exception, ValueError):
             return self.error_response(str(exception), 400)
         elif isinstance(exception, (KeyError, AttributeError)):
@@ -43,4 +50,33 @@ class AuthenticatedAPIView(BaseAPIView):
     def dispatch(self, request, *args, **kwargs):
         if not hasattr(request, 'student'):
             return self.error_response('Authentication required', 401)
-        return super().dispatch(request, *args, **kwargs)
\ No newline at end of file
+        return super().dispatch(request, *args, **kwargs)
+
+
+class StaffAPIView(BaseAPIView):
+    """Base for /api/staff/ views, authenticated by the Django admin session."""
+    
+    def dispatch(self, request, *args, **kwargs):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return self.error_response('Authentication required', 401)
+        if not user.is_staff:
+            return self.error_response('Staff access required', 403)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class AsyncAPIView(BaseAPIView):
+    """Base for views whose handlers are ``async def``.
+    
+    Django runs these natively under ASGI; handlers must use the async ORM
+    (``aget``, ``acreate``, ``aaggregate``, ``async for``) or wrap blocking
+    work in ``sync_to_async``.
+    """
+
+
+class AsyncAuthenticatedAPIView(AsyncAPIView):
+    
+    async def dispatch(self, request, *args, **kwargs):
+        if not hasattr(request, 'student'):
+            return self.error_response('Authentication required', 401)
+        return await super().dispatch(request, *args, **kwargs)
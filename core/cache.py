@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class BoundedTTLCache:
+    """Thread-safe LRU mapping whose entries expire after a TTL.
+
+    Entries may also carry their own expiry time (a ``clock()`` timestamp),
+    which is used instead of the default TTL when it is earlier.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        now = self._clock()
+        ttl_expiry = now + self.ttl
+        if expires_at is None or expires_at > ttl_expiry:
+            expires_at = ttl_expiry
+        if expires_at <= now:
+            self.delete(key)
+            return
+        
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            self._evict(now)
+    
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+    
+    def _evict(self, now: float) -> None:
+        # Expired entries at the cold end go first, then plain LRU eviction.
+        while self._data:
+            oldest_key, (_, expires_at) = next(iter(self._data.items()))
+            if expires_at > now and len(self._data) <= self.maxsize:
+                break
+            del self._data[oldest_key]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits, misses, size = self._hits, self._misses, len(self._data)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+            'size': size,
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,51 @@
+"""PostgreSQL backend that borrows connections from an in-process pool.
+
+Configure with a ``POOL`` dict on the database entry (``MAX_SIZE``,
+``TIMEOUT``, ``MAX_LIFETIME``, ``CHECK_AFTER``) and ``CONN_MAX_AGE = 0`` so
+Django hands each connection back at the end of the request.
+"""
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from core.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+Database = base.Database
+
+
+def _check(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def _reset(connection) -> None:
+    # A connection must come back idle; anything left open by an error is
+    # rolled back, and an unusable one raises so the pool closes it.
+    if connection.closed:
+        raise Database.InterfaceError('connection already closed')
+    if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    
+    def _pool(self) -> ConnectionPool:
+        options = self.settings_dict.get('POOL') or {}
+        return get_pool(self.alias, lambda: ConnectionPool(
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 5.0),
+            max_lifetime=options.get('MAX_LIFETIME', 1800.0),
+            check_after=options.get('CHECK_AFTER', 30.0),
+            check=_check,
+            reset=_reset,
+        ))
+    
+    def get_new_connection(self, conn_params):
+        try:
+            return self._pool().acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        except PoolTimeout as e:
+            raise Database.OperationalError(str(e)) from e
+    
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool().release(self.connection)
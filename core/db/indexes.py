@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def add_index_concurrently(app_label: str, model_name: str, index) -> migrations.SeparateDatabaseAndState:
+    """Migration operation equivalent to ``AddIndex`` that keeps large tables writable.
+    
+    PostgreSQL builds the index ``CONCURRENTLY``, so the calling migration
+    must set ``atomic = False``. Other databases get a plain ``CREATE INDEX``.
+    """
+    
+    def create(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(index.create_sql(model, schema_editor, concurrently=True))
+        else:
+            schema_editor.add_index(model, index)
+    
+    def drop(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(index.remove_sql(model, schema_editor, concurrently=True))
+        else:
+            schema_editor.remove_index(model, index)
+    
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[migrations.RunPython(create, drop)],
+        state_operations=[migrations.AddIndex(model_name=model_name, index=index)],
+    )
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+    
+    At most ``max_size`` connections exist at once; ``acquire`` waits up to
+    ``timeout`` seconds for one to be released before raising ``PoolTimeout``.
+    Connections older than ``max_lifetime`` are closed instead of reused, and
+    ones idle for more than ``check_after`` seconds are probed with ``check``
+    before being handed out.
+    """
+    
+    def __init__(
+        self,
+        connect: Optional[Callable[[], Any]] = None,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_lifetime: float = 1800.0,
+        check_after: float = 30.0,
+        check: Optional[Callable[[Any], None]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+        clock: Callable[[], float] = time.monotonic,  # connection ages only
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.check = check
+        self.reset = reset
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._born: Dict[int, float] = {}
+        self._size = 0
+        self._created = 0
+        self._discarded = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    def _close_quietly(self, connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def _discard(self, connection) -> None:
+        """Drop a checked-out or idle connection; caller holds the lock."""
+        self._born.pop(id(connection), None)
+        self._size -= 1
+        self._discarded += 1
+        self._cond.notify()
+    
+    def _is_expired(self, connection, now: float) -> bool:
+        return now - self._born.get(id(connection), now) >= self.max_lifetime
+    
+    def acquire(self, connect: Optional[Callable[[], Any]] = None):
+        """Check out a connection, opening one with ``connect`` (or the pool's) if none is idle."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        while True:
+            candidate = None
+            with self._cond:
+                while candidate is None:
+                    now = self._clock()
+                    if self._idle:
+                        connection, idle_since = self._idle.pop()
+                        if self._is_expired(connection, now):
+                            self._discard(connection)
+                            self._close_quietly(connection)
+                            continue
+                        candidate = (connection, now - idle_since >= self.check_after)
+                    elif self._size < self.max_size:
+                        self._size += 1
+                        candidate = (None, False)
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeout(
+                                f'Timed out after {self.timeout}s waiting for a connection '
+                                f'({self._size} of {self.max_size} in use)'
+                            )
+                        waited = True
+                        self._cond.wait(remaining)
+                
+                if waited:
+                    wait_time = time.monotonic() - started
+                    self._waits += 1
+                    self._wait_total += wait_time
+                    self._wait_max = max(self._wait_max, wait_time)
+                    waited = False
+            
+            connection, needs_check = candidate
+            if connection is None:
+                try:
+                    connection = (connect or self.connect)()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._born[id(connection)] = self._clock()
+                    self._created += 1
+                return connection
+            
+            if needs_check and self.check is not None:
+                try:
+                    self.check(connection)
+                except Exception:
+                    with self._cond:
+                        self._discard(connection)
+                    self._close_quietly(connection)
+                    continue
+            return connection
+    
+    def release(self, connection, discard: bool = False) -> None:
+        """Return a connection; it is closed instead if broken, expired or ``discard`` is set."""
+        if not discard and self.reset is not None:
+            try:
+                self.reset(connection)
+            except Exception:
+                discard = True
+        
+        with self._cond:
+            if discard or getattr(connection, 'closed', False) or self._is_expired(connection, self._clock()):
+                self._discard(connection)
+            else:
+                self._idle.append((connection, self._clock()))
+                self._cond.notify()
+                return
+        self._close_quietly(connection)
+    
+    def close_all(self) -> None:
+        """Close idle connections; checked-out ones are closed when released."""
+        with self._cond:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            for connection in idle:
+                self._discard(connection)
+        for connection in idle:
+            self._close_quietly(connection)
+    
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._size - idle,
+                'idle': idle,
+                'created': self._created,
+                'discarded': self._discarded,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'wait_time_total': self._wait_total,
+                'wait_time_max': self._wait_max,
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, factory: Callable[[], ConnectionPool]) -> ConnectionPool:
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = factory()
+    return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """Per-alias pool metrics for this process."""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
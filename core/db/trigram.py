@@ -0,0 +1,38 @@
+from typing import Sequence
+from django.db import migrations
+
+
+def _index_name(table: str, column: str) -> str:
+    return f'{table}_{column}_trgm_idx'[:63]
+
+
+def trigram_search_indexes(table: str, columns: Sequence[str]) -> migrations.RunPython:
+    """Migration operation adding ``pg_trgm`` GIN indexes for admin ``search_fields``.
+    
+    The admin searches with ``icontains``, which PostgreSQL runs as
+    ``UPPER(column::text) LIKE UPPER(%s)``, so the indexes are built on that
+    expression. Indexes are built ``CONCURRENTLY`` to keep large tables
+    writable; the calling migration must set ``atomic = False``. Other
+    databases are left unchanged.
+    """
+    
+    def create(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        qn = schema_editor.quote_name
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in columns:
+            schema_editor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {qn(_index_name(table, column))} '
+                f'ON {qn(table)} USING gin ((UPPER({qn(column)}::text)) gin_trgm_ops)'
+            )
+    
+    def drop(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for column in columns:
+            schema_editor.execute(
+                f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(_index_name(table, column))}'
+            )
+    
+    return migrations.RunPython(create, drop)
@@ -0,0 +1,27 @@
+from functools import wraps
+from typing import Awaitable, Callable, Optional
+
+from django.utils.cache import get_conditional_response, quote_etag
+
+
+def async_condition(etag_func: Callable[..., Awaitable[Optional[str]]]):
+    """``django.views.decorators.http.condition`` for async view methods.
+    
+    ``etag_func`` is awaited with the request; a matching ``If-None-Match``
+    short-circuits to 304 without running the handler.
+    """
+    def decorator(method):
+        @wraps(method)
+        async def inner(self, request, *args, **kwargs):
+            etag = await etag_func(request)
+            etag = quote_etag(etag) if etag else None
+            
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await method(self, request, *args, **kwargs)
+            
+            if etag and request.method in ('GET', 'HEAD') and not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+            return response
+        return inner
+    return decorator
@@ -22,4 +22,10 @@ class NotFoundError(ExamAPIException):
 
 class BusinessLogicError(ExamAPIException):
     def __init__(self, message: str = "Business logic error"):
-        super().__init__(message, 422)
\ No newline at end of file
+        super().__init__(message, 422)
+
+
+class ServiceUnavailableError(ExamAPIException):
+    def __init__(self, message: str = "Service temporarily unavailable", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, 503)
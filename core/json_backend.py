@@ -0,0 +1,80 @@
+"""JSON encoding for API responses.
+
+Uses orjson when it is installed and falls back to the standard library.
+Both backends serialize UUIDs, datetimes, dates, times and Decimals the same
+way, so serializers can hand those values over as-is.
+"""
+import datetime as dt
+import decimal
+import json
+import uuid
+from typing import Any
+
+from django.conf import settings
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (dt.datetime, dt.date, dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class StdlibJSONBackend:
+    name = 'json'
+    
+    @staticmethod
+    def dumps(data: Any) -> bytes:
+        return json.dumps(data, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonBackend:
+    name = 'orjson'
+    
+    @staticmethod
+    def dumps(data: Any) -> bytes:
+        return orjson.dumps(data, default=_default)
+    
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+BACKENDS = {StdlibJSONBackend.name: StdlibJSONBackend}
+if orjson is not None:
+    BACKENDS[OrjsonBackend.name] = OrjsonBackend
+
+
+def get_backend(name: str = None):
+    """Return the named backend, or the configured one (``JSON_BACKEND``, default ``auto``)."""
+    name = name or getattr(settings, 'JSON_BACKEND', 'auto')
+    if name == 'auto':
+        return OrjsonBackend if orjson is not None else StdlibJSONBackend
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown or unavailable JSON backend: {name}')
+
+
+def dumps(data: Any) -> bytes:
+    return get_backend().dumps(data)
+
+
+def loads(content: bytes) -> Any:
+    """Parse a request body straight from bytes; raises ``ValueError`` on malformed input."""
+    return get_backend().loads(content)
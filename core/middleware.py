@@ -1,17 +1,59 @@
 import os
 import json
+import uuid
+import hashlib
 import jwt
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 from django.urls import resolve
 from django.conf import settings
 from students.models import Student
+from students.services import StudentStatusService
+from .cache import BoundedTTLCache
+
+
+PUBLIC_PATHS = ('/api/auth/login', '/api/auth/refresh')
+
+# Staff endpoints use the Django admin session instead of student tokens.
+STAFF_PATH_PREFIX = '/api/staff/'
+STAFF_PATHS = ('/api/questions/search',)
 
 
 def _jwt_secret() -> str:
     return getattr(settings, 'JWT_AUTH', {}).get('JWT_SECRET_KEY', os.environ.get('JWT_SECRET', 'dev-secret-change-me'))
 
 
+def _jwt_setting(name: str, default):
+    return getattr(settings, 'JWT_AUTH', {}).get(name, default)
+
+
+# Verified payloads keyed by a digest of (secret, token), kept until the
+# token's own ``exp`` so repeat requests skip signature checks and parsing.
+_token_cache = BoundedTTLCache(
+    maxsize=_jwt_setting('JWT_TOKEN_CACHE_SIZE', 10000),
+    ttl=_jwt_setting('JWT_TOKEN_CACHE_TTL', 3600),
+)
+
+
+def _decode_token(token: str) -> dict:
+    secret = _jwt_secret()
+    if not _jwt_setting('JWT_TOKEN_CACHE_ENABLED', True):
+        return jwt.decode(token, secret, algorithms=['HS256'])
+
+    digest = hashlib.sha256(f'{secret}\x00{token}'.encode('utf-8')).digest()
+    payload = _token_cache.get(digest)
+    if payload is None:
+        payload = jwt.decode(token, secret, algorithms=['HS256'])
+        expires_at = payload.get('exp')
+        if isinstance(expires_at, (int, float)):
+            _token_cache.set(digest, payload, expires_at=expires_at)
+    return payload
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
 class JwtAuthenticationMiddleware(MiddlewareMixin):
     def process_request(self, request):
         # Only guard API routes
@@ -19,8 +61,9 @@ class JwtAuthenticationMiddleware(MiddlewareMixin):
         if not path.startswith('/api/'):
             return None
 
-        # Allow unauthenticated login endpoint
-        if path == '/api/auth/login':
+        # Login and token refresh carry their own credentials; staff views
+        # check the admin session themselves.
+        if path in PUBLIC_PATHS or path in STAFF_PATHS or path.startswith(STAFF_PATH_PREFIX):
             return None
 
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
@@ -29,7 +72,7 @@ class JwtAuthenticationMiddleware(MiddlewareMixin):
 
         token = auth_header.split(' ', 1)[1].strip()
         try:
-            payload = jwt.decode(token, _jwt_secret(), algorithms=['HS256'])
+            payload = _decode_token(token)
         except jwt.ExpiredSignatureError:
             return JsonResponse({'detail': 'Token has expired.'}, status=401)
         except jwt.InvalidTokenError:
@@ -43,12 +86,16 @@ class JwtAuthenticationMiddleware(MiddlewareMixin):
             return JsonResponse({'detail': 'Invalid token payload.'}, status=401)
 
         try:
-            student = Student.objects.get(id=customer_id, is_active=True)
-        except Student.DoesNotExist:
+            customer_id = uuid.UUID(str(customer_id))
+        except ValueError:
+            return JsonResponse({'detail': 'Invalid token payload.'}, status=401)
+
+        if not StudentStatusService.is_active(customer_id):
             return JsonResponse({'detail': 'User not found or inactive.'}, status=401)
 
-        # Attach to request for views
-        request.student = student
+        # Attach to request for views; the row is only read if a view needs
+        # more than the student's id.
+        request.student = Student.deferred(customer_id)
         return None
 
 
@@ -0,0 +1,132 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.db import connections
+
+from .exceptions import ServiceUnavailableError
+
+
+def _verify(raw_password: str, encoded: str) -> bool:
+    return check_password(raw_password, encoded)
+
+
+def _hash(raw_password: str) -> str:
+    return make_password(raw_password)
+
+
+class PasswordHasherPool:
+    """Runs password hashing in a bounded process pool, off the request threads.
+    
+    At most ``PASSWORD_HASH_WORKERS`` hashes run at once and at most
+    ``PASSWORD_HASH_QUEUE_SIZE`` more wait for a worker; past that, callers get
+    ``ServiceUnavailableError`` straight away. ``PASSWORD_HASH_WORKERS = 0``
+    hashes inline on the calling thread.
+    """
+    
+    _lock = threading.Lock()
+    _executor: Optional[ProcessPoolExecutor] = None
+    _slots: Optional[threading.BoundedSemaphore] = None
+    
+    @staticmethod
+    def _workers() -> int:
+        return getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+    
+    @staticmethod
+    def _busy_error() -> ServiceUnavailableError:
+        return ServiceUnavailableError(
+            'Too many sign-ins in progress, please retry shortly',
+            retry_after=getattr(settings, 'PASSWORD_HASH_RETRY_AFTER', 2),
+        )
+    
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                # Spawned rather than forked: forking a threaded server can
+                # copy locks held by other threads into the child.
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=cls._workers(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                cls._slots = threading.BoundedSemaphore(
+                    cls._workers() + getattr(settings, 'PASSWORD_HASH_QUEUE_SIZE', 32)
+                )
+            return cls._executor
+    
+    @classmethod
+    def _submit(cls, fn: Callable, *args) -> Future:
+        executor = cls._get_executor()
+        slots = cls._slots
+        if not slots.acquire(blocking=False):
+            raise cls._busy_error()
+        try:
+            future = executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            slots.release()
+            cls.shutdown()
+            raise cls._busy_error()
+        future.add_done_callback(lambda _: slots.release())
+        return future
+    
+    @classmethod
+    def verify(cls, raw_password: str, encoded: str) -> bool:
+        if cls._workers() <= 0:
+            return _verify(raw_password, encoded)
+        
+        future = cls._submit(_verify, raw_password, encoded)
+        try:
+            return future.result(timeout=getattr(settings, 'PASSWORD_HASH_TIMEOUT', 10))
+        except FutureTimeoutError:
+            raise cls._busy_error()
+        except BrokenProcessPool:
+            cls.shutdown()
+            raise cls._busy_error()
+    
+    @staticmethod
+    def needs_upgrade(encoded: str) -> bool:
+        """True when ``encoded`` uses another algorithm or a lower work factor than the default hasher."""
+        try:
+            hasher = identify_hasher(encoded)
+        except ValueError:
+            return False
+        preferred = get_hasher('default')
+        return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    
+    @classmethod
+    def hash_in_background(cls, raw_password: str, on_done: Callable[[str], None]) -> None:
+        """Hash with the default hasher and pass the result to ``on_done``; skipped when the pool is saturated."""
+        if cls._workers() <= 0:
+            on_done(_hash(raw_password))
+            return
+        
+        try:
+            future = cls._submit(_hash, raw_password)
+        except ServiceUnavailableError:
+            return
+        
+        caller = threading.current_thread()
+        
+        def deliver(done: Future) -> None:
+            if done.cancelled() or done.exception() is not None:
+                return
+            try:
+                on_done(done.result())
+            finally:
+                # Normally runs on the executor's management thread, which has
+                # no request lifecycle to close the connections it opened.
+                if threading.current_thread() is not caller:
+                    connections.close_all()
+        
+        future.add_done_callback(deliver)
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            executor, cls._executor, cls._slots = cls._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -86,15 +86,35 @@ POSTGRES_PASSWORD = os.environ.get('POSTGRES_PASSWORD')
 POSTGRES_HOST = os.environ.get('POSTGRES_HOST', 'localhost')
 POSTGRES_PORT = os.environ.get('POSTGRES_PORT', '5432')
 
+# Persistent connections are reused for this many seconds and health-checked
+# before each request. Setting POSTGRES_POOL_SIZE switches to an in-process
+# pool (core.db.backends.postgresql_pool) that hands connections back at the
+# end of every request instead. Behind a transaction-pooling proxy such as
+# PgBouncer, set POSTGRES_TRANSACTION_POOLING so server-side cursors, which
+# need a session, are not used; psycopg2 never prepares statements server-side.
+POSTGRES_CONN_MAX_AGE = int(os.environ.get('POSTGRES_CONN_MAX_AGE', '60'))
+POSTGRES_POOL_SIZE = int(os.environ.get('POSTGRES_POOL_SIZE', '0'))
+POSTGRES_POOL_TIMEOUT = float(os.environ.get('POSTGRES_POOL_TIMEOUT', '5'))
+POSTGRES_TRANSACTION_POOLING = os.environ.get('POSTGRES_TRANSACTION_POOLING', '').lower() in ('1', 'true', 'yes')
+
 if POSTGRES_NAME and POSTGRES_USER and POSTGRES_PASSWORD:
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.postgresql',
+            'ENGINE': 'core.db.backends.postgresql_pool' if POSTGRES_POOL_SIZE else 'django.db.backends.postgresql',
             'NAME': POSTGRES_NAME,
             'USER': POSTGRES_USER,
             'PASSWORD': POSTGRES_PASSWORD,
             'HOST': POSTGRES_HOST,
             'PORT': POSTGRES_PORT,
+            'CONN_MAX_AGE': 0 if POSTGRES_POOL_SIZE else POSTGRES_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': POSTGRES_TRANSACTION_POOLING,
+            'POOL': {
+                'MAX_SIZE': POSTGRES_POOL_SIZE,
+                'TIMEOUT': POSTGRES_POOL_TIMEOUT,
+                'MAX_LIFETIME': 1800,
+                'CHECK_AFTER': 30,
+            },
         }
     }
 else:
@@ -171,4 +191,81 @@ JWT_AUTH = {
     'JWT_ACCESS_TOKEN_LIFETIME': datetime.timedelta(days=5),
     'JWT_REFRESH_TOKEN_LIFETIME': datetime.timedelta(days=7),
     'JWT_AUTH_HEADER_PREFIX': 'Bearer',
+    'JWT_TOKEN_CACHE_ENABLED': True,
+    'JWT_TOKEN_CACHE_SIZE': 10000,
+    'JWT_TOKEN_CACHE_TTL': 3600,
+    # Issue a new refresh token on every refresh and reject reuse of the old
+    # one; used token ids are remembered in this cache until they expire.
+    'JWT_ROTATE_REFRESH_TOKENS': False,
+    'JWT_DENYLIST_CACHE_ALIAS': 'default',
 }
+
+# Shared cache backend. Set REDIS_URL (needs the ``redis`` package) whenever
+# more than one worker runs; without it each process gets its own local-memory
+# cache and nothing cached is seen by the other workers.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Question paper cache. Content versions live in this cache too.
+EXAM_PAPER_CACHE_ALIAS = 'default'
+EXAM_PAPER_CACHE_TIMEOUT = 3600
+# Whether that cache is shared by every worker; None tells from the backend
+# (local-memory and dummy caches are not). Answer keys are only kept in
+# process memory while it is, otherwise every submission is graded from the
+# database so a corrected key takes effect in all workers at once.
+EXAM_PAPER_CACHE_SHARED = None
+
+# Student active-status cache used by the JWT middleware
+STUDENT_STATUS_CACHE_SIZE = 10000
+STUDENT_STATUS_CACHE_TTL = 60
+
+# Maximum number of answers accepted by /api/submit-answers
+ANSWER_BATCH_MAX_SIZE = 500
+
+# In-process answer keys used to grade submissions
+ANSWER_KEY_CACHE_SIZE = 256
+ANSWER_KEY_CACHE_TTL = 3600
+# Per answer key: drawn question sets of the most recently seen attempt seeds
+ANSWER_KEY_DRAW_CACHE_SIZE = 1024
+
+# JSON encoder for API responses: 'auto' uses orjson when installed, else the
+# standard library; 'orjson' or 'json' pins one.
+JSON_BACKEND = 'auto'
+
+# Route the exam flow to the native async views. Only worthwhile when served
+# by an ASGI server (e.g. ``uvicorn core.asgi:application``); under WSGI every
+# async view is run through a sync bridge.
+ASYNC_API_VIEWS = os.environ.get('ASYNC_API_VIEWS', '').lower() in ('1', 'true', 'yes')
+
+# Password checks run in a process pool so PBKDF2 does not hold request
+# threads. Logins beyond the running workers plus the queue get a 503 with
+# Retry-After. 0 workers hashes inline.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+PASSWORD_HASH_QUEUE_SIZE = 32
+PASSWORD_HASH_TIMEOUT = 10
+PASSWORD_HASH_RETRY_AFTER = 2
+
+# Attempts are closed by ``manage.py expire_exam_attempts`` this many seconds
+# after start_time + exam_timer.
+EXAM_EXPIRY_GRACE_SECONDS = 60
+EXAM_EXPIRY_BATCH_SIZE = 500
+
+# Item statistics are recomputed by ``manage.py analyze_items``; the staff
+# endpoint caches each exam's payload until the next run.
+ITEM_STATISTICS_CACHE_ALIAS = 'default'
+ITEM_STATISTICS_CACHE_TIMEOUT = 3600
+ITEM_ANALYSIS_CHUNK_SIZE = 10000
+
+# Result exports leave out rows written this recently, so an answer whose
+# transaction is still open cannot commit behind an export's resume token.
+RESULT_EXPORT_SETTLE_SECONDS = 5
+
+# Admin changelists of large tables show the planner's row estimate once it
+# passes this many rows (PostgreSQL only); below it they count exactly.
+ADMIN_EXACT_COUNT_LIMIT = 100000
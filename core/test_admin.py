@@ -0,0 +1,77 @@
+import uuid
+from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.test_utils import BaseTestCase, create_test_question_with_answers, create_test_student
+from students.models import StudentExam, StudentExamResult
+from .admin import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTest(BaseTestCase):
+    
+    def _paginator(self):
+        return EstimatedCountPaginator(StudentExam.objects.order_by('pk'), 10)
+    
+    def test_exact_count_without_estimate(self):
+        paginator = self._paginator()
+        
+        self.assertIsNone(paginator.estimate())
+        self.assertEqual(paginator.count, 1)
+    
+    def test_large_estimate_replaces_count(self):
+        with patch.object(EstimatedCountPaginator, 'estimate', return_value=12000000):
+            with self.assertNumQueries(0):
+                self.assertEqual(self._paginator().count, 12000000)
+    
+    def test_small_estimate_is_counted_exactly(self):
+        with patch.object(EstimatedCountPaginator, 'estimate', return_value=50):
+            self.assertEqual(self._paginator().count, 1)
+
+
+class LargeTableChangelistTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.test_user.is_staff = True
+        self.test_user.is_superuser = True
+        self.test_user.save()
+        self.client.force_login(self.test_user)
+    
+    def _add_rows(self, count):
+        for _ in range(count):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {uuid.uuid4().hex}')
+            student_exam = StudentExam.objects.create(
+                student=create_test_student(),
+                exam=self.test_exam,
+                start_time=timezone.now(),
+                status='in_progress',
+                max_exam_score=100
+            )
+            StudentExamResult.objects.create(
+                student_exam=student_exam,
+                exam_question=self.exam_question,
+                answer=self.correct_answer,
+                is_correct=True,
+                score=20
+            )
+    
+    def _changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+    
+    def test_query_count_does_not_grow_with_rows(self):
+        for url in (
+            '/admin/students/studentexam/',
+            '/admin/students/studentexamresult/',
+            '/admin/exams/examquestion/',
+            '/admin/exams/questionanswer/',
+        ):
+            self._add_rows(1)
+            before = self._changelist_queries(url)
+            self._add_rows(5)
+            
+            self.assertEqual(self._changelist_queries(url), before, url)
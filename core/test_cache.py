@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+
+from .cache import BoundedTTLCache
+
+
+class FakeClock:
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+class BoundedTTLCacheTest(SimpleTestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = BoundedTTLCache(maxsize=2, ttl=10, clock=self.clock)
+    
+    def test_get_and_set(self):
+        self.cache.set('a', 1)
+        
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('missing'))
+    
+    def test_entry_expires_after_ttl(self):
+        self.cache.set('a', 1)
+        self.clock.now += 10
+        
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_explicit_expiry_shorter_than_ttl(self):
+        self.cache.set('a', 1, expires_at=self.clock.now + 2)
+        self.clock.now += 3
+        
+        self.assertIsNone(self.cache.get('a'))
+    
+    def test_explicit_expiry_is_capped_by_ttl(self):
+        self.cache.set('a', 1, expires_at=self.clock.now + 100)
+        self.clock.now += 11
+        
+        self.assertIsNone(self.cache.get('a'))
+    
+    def test_already_expired_entry_is_not_stored(self):
+        self.cache.set('a', 1, expires_at=self.clock.now - 1)
+        
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+    
+    def test_delete(self):
+        self.cache.set('a', 1)
+        self.cache.delete('a')
+        
+        self.assertIsNone(self.cache.get('a'))
+    
+    def test_stats(self):
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('b')
+        
+        stats = self.cache.stats()
+        
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+        self.assertEqual(stats['size'], 1)
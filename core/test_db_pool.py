@@ -0,0 +1,121 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from .db.pool import ConnectionPool, PoolTimeout
+from .test_cache import FakeClock
+
+
+class FakeConnection:
+    
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.opened = []
+        self.pool = ConnectionPool(
+            connect=self._connect,
+            max_size=2,
+            timeout=0.05,
+            max_lifetime=100,
+            check_after=10,
+            clock=self.clock,
+        )
+    
+    def _connect(self):
+        connection = FakeConnection(len(self.opened))
+        self.opened.append(connection)
+        return connection
+    
+    def test_released_connection_is_reused(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        
+        self.assertIs(self.pool.acquire(), first)
+        self.assertEqual(len(self.opened), 1)
+    
+    def test_acquire_times_out_when_exhausted(self):
+        self.pool.acquire()
+        self.pool.acquire()
+        
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire()
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+    
+    def test_waiter_gets_released_connection(self):
+        self.pool.timeout = 5
+        first = self.pool.acquire()
+        self.pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(self.pool.acquire()))
+        waiter.start()
+        
+        self.pool.release(first)
+        waiter.join(2)
+        
+        self.assertEqual(acquired, [first])
+        self.assertEqual(self.pool.stats()['waits'], 1)
+    
+    def test_expired_connection_is_replaced(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+        self.clock.now += 100
+        
+        second = self.pool.acquire()
+        
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(self.pool.stats()['size'], 1)
+    
+    def test_failed_health_check_discards_connection(self):
+        def check(connection):
+            raise RuntimeError('server gone')
+        self.pool.check = check
+        first = self.pool.acquire()
+        self.pool.release(first)
+        
+        self.clock.now += 5
+        self.assertIs(self.pool.acquire(), first)
+        self.pool.release(first)
+        
+        self.clock.now += 10
+        second = self.pool.acquire()
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+    
+    def test_broken_connection_is_not_returned_to_pool(self):
+        first = self.pool.acquire()
+        first.closed = True
+        self.pool.release(first)
+        
+        self.assertIsNot(self.pool.acquire(), first)
+        self.assertEqual(self.pool.stats()['discarded'], 1)
+    
+    def test_failed_connect_frees_slot(self):
+        def connect():
+            raise OSError('refused')
+        self.pool.connect = connect
+        
+        for _ in range(3):
+            with self.assertRaises(OSError):
+                self.pool.acquire()
+        self.assertEqual(self.pool.stats()['size'], 0)
+    
+    def test_stats_report_in_use_and_idle(self):
+        first = self.pool.acquire()
+        self.pool.acquire()
+        self.pool.release(first)
+        
+        stats = self.pool.stats()
+        
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['created'], 2)
@@ -0,0 +1,78 @@
+import datetime as dt
+import decimal
+import json
+import uuid
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from . import json_backend
+from .base_views import BaseAPIView
+
+
+class JSONBackendTest(SimpleTestCase):
+    
+    def setUp(self):
+        self.payload = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'created_at': dt.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt.timezone.utc),
+            'day': dt.date(2024, 1, 2),
+            'score': decimal.Decimal('1.50'),
+            'name': 'Café',
+            'items': [1, None, True],
+        }
+    
+    def test_backends_produce_identical_documents(self):
+        expected = {
+            'id': '12345678-1234-5678-1234-567812345678',
+            'created_at': '2024-01-02T03:04:05.678901+00:00',
+            'day': '2024-01-02',
+            'score': '1.50',
+            'name': 'Café',
+            'items': [1, None, True],
+        }
+        for name, backend in json_backend.BACKENDS.items():
+            with self.subTest(backend=name):
+                self.assertEqual(json.loads(backend.dumps(self.payload)), expected)
+    
+    def test_unknown_type_raises_type_error(self):
+        for name, backend in json_backend.BACKENDS.items():
+            with self.subTest(backend=name), self.assertRaises(TypeError):
+                backend.dumps({'value': object()})
+    
+    def test_loads_rejects_malformed_input_with_value_error(self):
+        for name, backend in json_backend.BACKENDS.items():
+            for content in (b'{bad', b'\xff\xfe'):
+                with self.subTest(backend=name, content=content), self.assertRaises(ValueError):
+                    backend.loads(content)
+    
+    def test_setting_pins_backend(self):
+        with override_settings(JSON_BACKEND='json'):
+            self.assertIs(json_backend.get_backend(), json_backend.StdlibJSONBackend)
+        with override_settings(JSON_BACKEND='missing'), self.assertRaises(ValueError):
+            json_backend.get_backend()
+
+
+class BaseAPIViewJSONTest(SimpleTestCase):
+    
+    def setUp(self):
+        self.view = BaseAPIView()
+        self.factory = RequestFactory()
+    
+    def test_success_response_encodes_uuids_and_datetimes(self):
+        exam_id = uuid.uuid4()
+        response = self.view.success_response({'id': exam_id}, status=201)
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {'id': str(exam_id)})
+    
+    def test_get_json_data_parses_body_bytes(self):
+        request = self.factory.post('/', data='{"email": "a@b.c"}', content_type='application/json')
+        
+        self.assertEqual(self.view.get_json_data(request), {'email': 'a@b.c'})
+    
+    def test_get_json_data_invalid_json(self):
+        request = self.factory.post('/', data='{bad', content_type='application/json')
+        
+        with self.assertRaisesMessage(ValueError, 'Invalid JSON'):
+            self.view.get_json_data(request)
@@ -0,0 +1,160 @@
+import json
+from unittest.mock import patch
+
+import jwt
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from core.test_utils import BaseTestCase
+from students.models import Student
+from students.services import AuthenticationService, StudentStatusService
+from .middleware import JwtAuthenticationMiddleware, _token_cache, token_cache_stats
+
+
+class JwtAuthenticationMiddlewareTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        StudentStatusService.invalidate(self.test_student.id)
+        _token_cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = JwtAuthenticationMiddleware(lambda request: HttpResponse())
+        self.token = AuthenticationService.generate_tokens(self.test_student)['access']
+    
+    def _request(self, token=None, path='/api/exams'):
+        headers = {}
+        if token is not None:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        return self.factory.get(path, **headers)
+    
+    def test_non_api_path_is_ignored(self):
+        request = self._request(path='/admin/')
+        
+        self.assertIsNone(self.middleware.process_request(request))
+    
+    def test_auth_endpoints_are_public(self):
+        for path in ('/api/auth/login', '/api/auth/refresh'):
+            self.assertIsNone(self.middleware.process_request(self._request(path=path)))
+    
+    def test_missing_token(self):
+        response = self.middleware.process_request(self._request())
+        
+        self.assertEqual(response.status_code, 401)
+    
+    def test_invalid_token(self):
+        response = self.middleware.process_request(self._request('not-a-token'))
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['detail'], 'Invalid token.')
+    
+    def test_refresh_token_rejected(self):
+        refresh = AuthenticationService.generate_tokens(self.test_student)['refresh']
+        
+        response = self.middleware.process_request(self._request(refresh))
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['detail'], 'Invalid token type.')
+    
+    def test_student_attached_without_loading_row(self):
+        request = self._request(self.token)
+        self.middleware.process_request(request)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(request.student.id, self.test_student.id)
+            self.assertEqual(request.student.pk, self.test_student.pk)
+    
+    def test_student_row_loaded_once_on_field_access(self):
+        request = self._request(self.token)
+        self.middleware.process_request(request)
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(request.student.first_name, 'John')
+            self.assertEqual(request.student.email_address, 'john.doe@example.com')
+    
+    def test_active_status_is_cached(self):
+        with self.assertNumQueries(1):
+            self.middleware.process_request(self._request(self.token))
+        
+        with self.assertNumQueries(0):
+            response = self.middleware.process_request(self._request(self.token))
+        
+        self.assertIsNone(response)
+    
+    def test_deactivating_student_invalidates_cache(self):
+        self.middleware.process_request(self._request(self.token))
+        
+        self.test_student.is_active = False
+        self.test_student.save()
+        
+        response = self.middleware.process_request(self._request(self.token))
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['detail'], 'User not found or inactive.')
+    
+    def test_deleted_student_rejected(self):
+        self.middleware.process_request(self._request(self.token))
+        
+        Student.objects.filter(id=self.test_student.id).delete()
+        
+        response = self.middleware.process_request(self._request(self.token))
+        
+        self.assertEqual(response.status_code, 401)
+
+
+class VerifiedTokenCacheTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        _token_cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = JwtAuthenticationMiddleware(lambda request: HttpResponse())
+        self.token = AuthenticationService.generate_tokens(self.test_student)['access']
+    
+    def _process(self, token):
+        request = self.factory.get('/api/exams', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return self.middleware.process_request(request)
+    
+    def test_repeat_token_skips_verification(self):
+        with patch('core.middleware.jwt.decode', wraps=jwt.decode) as mock_decode:
+            self.assertIsNone(self._process(self.token))
+            self.assertIsNone(self._process(self.token))
+            self.assertIsNone(self._process(self.token))
+        
+        self.assertEqual(mock_decode.call_count, 1)
+        stats = token_cache_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+    
+    def test_invalid_token_is_not_cached(self):
+        self._process('not-a-token')
+        
+        self.assertEqual(len(_token_cache), 0)
+    
+    def test_entry_dropped_at_token_expiry(self):
+        self._process(self.token)
+        expires_at = jwt.decode(self.token, options={'verify_signature': False})['exp']
+        
+        with patch.object(_token_cache, '_clock', return_value=expires_at + 1):
+            with patch('core.middleware.jwt.decode', side_effect=jwt.ExpiredSignatureError):
+                response = self._process(self.token)
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['detail'], 'Token has expired.')
+        self.assertEqual(len(_token_cache), 0)
+    
+    @override_settings(JWT_AUTH={'JWT_SECRET_KEY': 'test-secret-key', 'JWT_TOKEN_CACHE_ENABLED': False})
+    def test_cache_can_be_disabled(self):
+        with patch('core.middleware.jwt.decode', wraps=jwt.decode) as mock_decode:
+            self._process(self.token)
+            self._process(self.token)
+        
+        self.assertEqual(mock_decode.call_count, 2)
+        self.assertEqual(len(_token_cache), 0)
+    
+    def test_secret_change_does_not_reuse_entry(self):
+        self._process(self.token)
+        
+        with override_settings(JWT_AUTH={'JWT_SECRET_KEY': 'rotated-secret'}):
+            response = self._process(self.token)
+        
+        self.assertEqual(response.status_code, 401)
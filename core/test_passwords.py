@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.test import SimpleTestCase, override_settings
+
+from .exceptions import ServiceUnavailableError
+from .passwords import PasswordHasherPool, _verify
+
+
+class FakeExecutor:
+    
+    def __init__(self):
+        self.futures = []
+    
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append((future, fn, args))
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class PasswordHasherPoolTest(SimpleTestCase):
+    
+    def setUp(self):
+        PasswordHasherPool.shutdown()
+        self.encoded = make_password('secret')
+    
+    def tearDown(self):
+        PasswordHasherPool.shutdown()
+    
+    def test_inline_verify(self):
+        self.assertTrue(PasswordHasherPool.verify('secret', self.encoded))
+        self.assertFalse(PasswordHasherPool.verify('wrong', self.encoded))
+    
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_verify_in_worker_process(self):
+        self.assertTrue(PasswordHasherPool.verify('secret', self.encoded))
+        self.assertFalse(PasswordHasherPool.verify('wrong', self.encoded))
+    
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_RETRY_AFTER=7)
+    def test_saturated_pool_rejects_immediately(self):
+        executor = FakeExecutor()
+        with patch.object(PasswordHasherPool, '_get_executor', return_value=executor), \
+             patch.object(PasswordHasherPool, '_slots', threading.BoundedSemaphore(2)):
+            PasswordHasherPool._submit(_verify, 'secret', self.encoded)
+            PasswordHasherPool._submit(_verify, 'secret', self.encoded)
+            
+            with self.assertRaises(ServiceUnavailableError) as caught:
+                PasswordHasherPool.verify('secret', self.encoded)
+            
+            self.assertEqual(caught.exception.status_code, 503)
+            self.assertEqual(caught.exception.retry_after, 7)
+            
+            # A finished hash frees its slot.
+            executor.futures[0][0].set_result(True)
+            PasswordHasherPool._submit(_verify, 'secret', self.encoded)
+            self.assertEqual(len(executor.futures), 3)
+    
+    def test_needs_upgrade_for_lower_work_factor(self):
+        weak = PBKDF2PasswordHasher().encode('secret', 'salt1234', iterations=1000)
+        
+        self.assertTrue(PasswordHasherPool.needs_upgrade(weak))
+        self.assertFalse(PasswordHasherPool.needs_upgrade(self.encoded))
+        self.assertFalse(PasswordHasherPool.needs_upgrade('!unusable'))
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from .settings import *
 
 DATABASES = {
@@ -72,4 +73,5 @@ INSTALLED_APPS = [
     'students',
     'exams',
     'core',
-]
\ No newline at end of file
+]
+PASSWORD_HASH_WORKERS = 0
@@ -11,6 +11,14 @@ from exams.models import Exam, Question, ExamQuestion, QuestionAnswer
 User = get_user_model()
 
 
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'studentexam-tests',
+    }
+}
+
+
 class BaseTestCase(TestCase):
     
     def setUp(self):
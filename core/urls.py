@@ -1,24 +1,54 @@
 """
 URL configuration for core project.
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
-from students.views import StudentLoginView, StartExamView, SubmitAnswerView, CompleteExamView
-from exams.views import ExamListView
-from exams.question.views import QuestionListView
+from students import views as student_views
+from students.views import (
+    StudentLoginView, RefreshTokenView, SubmitAnswersView, ResultsView, DashboardView, LeaderboardView,
+    ItemStatisticsView, ResultExportView,
+)
+from exams import views as exam_views
+from exams.question import views as question_views
+
+if getattr(settings, 'ASYNC_API_VIEWS', False):
+    ExamListView = exam_views.AsyncExamListView
+    QuestionListView = question_views.AsyncQuestionListView
+    StartExamView = student_views.AsyncStartExamView
+    SubmitAnswerView = student_views.AsyncSubmitAnswerView
+    CompleteExamView = student_views.AsyncCompleteExamView
+else:
+    ExamListView = exam_views.ExamListView
+    QuestionListView = question_views.QuestionListView
+    StartExamView = student_views.StartExamView
+    SubmitAnswerView = student_views.SubmitAnswerView
+    CompleteExamView = student_views.CompleteExamView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
     # Authentication endpoints
     path('api/auth/login', StudentLoginView.as_view(), name='student-login'),
+    path('api/auth/refresh', RefreshTokenView.as_view(), name='token-refresh'),
     
     # Exam endpoints
     path('api/exams', ExamListView.as_view(), name='exams-list'),
     path('api/questions', QuestionListView.as_view(), name='questions-list'),
+    path('api/questions/search', question_views.QuestionSearchView.as_view(), name='questions-search'),
     
     # Student exam endpoints
     path('api/start-exam', StartExamView.as_view(), name='start-exam'),
     path('api/submit-answer', SubmitAnswerView.as_view(), name='submit-answer'),
+    path('api/submit-answers', SubmitAnswersView.as_view(), name='submit-answers'),
     path('api/complete-exam', CompleteExamView.as_view(), name='complete-exam'),
-]
\ No newline at end of file
+    
+    # Results endpoints
+    path('api/results', ResultsView.as_view(), name='results'),
+    path('api/dashboard', DashboardView.as_view(), name='dashboard'),
+    path('api/leaderboard', LeaderboardView.as_view(), name='leaderboard'),
+    
+    # Staff endpoints
+    path('api/staff/item-statistics', ItemStatisticsView.as_view(), name='item-statistics'),
+    path('api/staff/results-export', ResultExportView.as_view(), name='results-export'),
+]
@@ -1,4 +1,7 @@
 from django.contrib import admin
+
+from core.admin import LargeTableAdminMixin
+from .question.search import QuestionSearch
 from .models import Exam, Question, ExamQuestion, QuestionAnswer
 
 
@@ -11,9 +14,10 @@ class ExamAdmin(admin.ModelAdmin):
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'short_name', 'category', 'is_active', 'created_by', 'created_at')
     list_filter = ('is_active', 'category', 'created_at')
+    list_select_related = ('created_by',)
     search_fields = ('question_name', 'category')
     ordering = ('-created_at',)
 
@@ -21,19 +25,29 @@ class QuestionAdmin(admin.ModelAdmin):
         return (obj.question_name or '')[:60]
     short_name.short_description = 'question_name'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text index instead of an ILIKE scan per search field.
+        if not search_term.strip():
+            return queryset, False
+        return QuestionSearch.filter(queryset, search_term), False
+
 
 @admin.register(ExamQuestion)
-class ExamQuestionAdmin(admin.ModelAdmin):
+class ExamQuestionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'exam', 'question', 'score', 'is_active', 'created_at')
     list_filter = ('is_active', 'exam', 'created_at')
+    list_select_related = ('exam', 'question')
+    autocomplete_fields = ('exam', 'question')
     search_fields = ('exam__exam_name', 'question__question_name')
     ordering = ('-created_at',)
 
 
 @admin.register(QuestionAnswer)
-class QuestionAnswerAdmin(admin.ModelAdmin):
+class QuestionAnswerAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'question', 'is_correct', 'is_active', 'created_at')
     list_filter = ('is_active', 'is_correct', 'created_at')
+    list_select_related = ('question',)
+    raw_id_fields = ('question',)
     search_fields = ('question__question_name', 'answer')
     ordering = ('-created_at',)
 
@@ -0,0 +1,40 @@
+import hashlib
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+
+from .models import Exam
+from .question.cache import QuestionPaperCache
+
+
+def _strong_etag(*parts) -> str:
+    return hashlib.sha256(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+def exam_list_etag(request) -> Optional[str]:
+    """Version stamp of the active catalog: latest change plus row count, scoped to the query string."""
+    stamp = Exam.objects.filter(is_active=True).aggregate(latest=Max('updated_at'), total=Count('id'))
+    return _strong_etag('exams', stamp['latest'], stamp['total'], request.GET.urlencode())
+
+
+async def aexam_list_etag(request) -> Optional[str]:
+    stamp = await Exam.objects.filter(is_active=True).aaggregate(latest=Max('updated_at'), total=Count('id'))
+    return _strong_etag('exams', stamp['latest'], stamp['total'], request.GET.urlencode())
+
+
+def question_paper_etag(request) -> Optional[str]:
+    exam_id = request.GET.get('exam_id')
+    if not exam_id:
+        return None
+    version = QuestionPaperCache.get_version(exam_id)
+    if version is None:
+        return None
+    student_exam_id = request.GET.get('student_exam_id')
+    if student_exam_id:
+        # An attempt's seed never changes, so its id stands in for the draw.
+        return _strong_etag('questions', QuestionPaperCache._normalize(exam_id), version, student_exam_id.lower())
+    return _strong_etag('questions', QuestionPaperCache._normalize(exam_id), version)
+
+
+async def aquestion_paper_etag(request) -> Optional[str]:
+    return await sync_to_async(question_paper_etag)(request)
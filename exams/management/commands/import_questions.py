@@ -0,0 +1,72 @@
+import os
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.question.importer import READERS, QuestionImporter
+
+
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.xml': 'qti',
+}
+
+
+class Command(BaseCommand):
+    help = 'Import questions, answers and exam links from a CSV, JSONL or QTI 2.x XML file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument('--format', choices=sorted(READERS), help='File format; guessed from the extension by default.')
+        parser.add_argument('--user', required=True, help='Username recorded as the creator of new questions.')
+        parser.add_argument('--exam', dest='exam_id', help='Link questions without an exam_id to this exam.')
+        parser.add_argument('--category', help='Category for questions without one.')
+        parser.add_argument('--score', type=int, help='Score for exam links without one.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Questions written per transaction.')
+        parser.add_argument('--no-copy', action='store_true', help='Use INSERT instead of COPY on PostgreSQL.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if file_format is None:
+            raise CommandError('Cannot tell the file format from its name; pass --format.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options['user']})
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" not found.')
+
+        importer = QuestionImporter(
+            created_by_id=user.pk,
+            exam_id=options['exam_id'],
+            category=options['category'],
+            score=options['score'],
+            chunk_size=options['chunk_size'],
+            use_copy=not options['no_copy'],
+        )
+
+        def report(totals):
+            self.stdout.write(
+                f'{totals["questions"]} questions, {totals["links"]} exam links, '
+                f'{totals["duplicates"]} duplicates, {totals["invalid"]} invalid'
+            )
+
+        # QTI is parsed from bytes so the XML declaration picks the encoding.
+        if file_format == 'qti':
+            stream = open(path, 'rb')
+        else:
+            stream = open(path, encoding='utf-8-sig', newline='')
+        with stream:
+            totals = importer.run(READERS[file_format](stream), progress=report)
+
+        for position, message in totals['errors']:
+            self.stderr.write(f'{path}:{position}: {message}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {totals["questions"]} questions with {totals["answers"]} answers and '
+            f'{totals["links"]} exam links; reused {totals["duplicates"]} existing questions and '
+            f'skipped {totals["invalid"]} invalid records.'
+        ))
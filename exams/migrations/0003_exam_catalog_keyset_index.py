@@ -0,0 +1,17 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_alter_exam_exam_timer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='exams_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+from core.db.indexes import add_index_concurrently
+from core.db.trigram import trigram_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built CONCURRENTLY, which cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('exams', '0003_exam_catalog_keyset_index'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            'exams', 'examquestion',
+            models.Index(fields=['-created_at'], name='exam_questions_created_idx'),
+        ),
+        add_index_concurrently(
+            'exams', 'question',
+            models.Index(fields=['-created_at'], name='questions_created_idx'),
+        ),
+        add_index_concurrently(
+            'exams', 'questionanswer',
+            models.Index(fields=['-created_at'], name='questions_answer_created_idx'),
+        ),
+        trigram_search_indexes('exams', ['exam_name']),
+        # The exam question and answer changelists search question__question_name.
+        trigram_search_indexes('questions', ['question_name']),
+        trigram_search_indexes('questions_answer', ['answer']),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-17 04:02
+
+from django.db import migrations
+
+from exams.question.search import QuestionSearch
+
+
+def install_search(apps, schema_editor):
+    QuestionSearch.install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    QuestionSearch.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    # The search vectors are backfilled in batches that commit on their own
+    # and the index is built CONCURRENTLY, which cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('exams', '0004_admin_large_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
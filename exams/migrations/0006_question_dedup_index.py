@@ -0,0 +1,27 @@
+# Generated by Django 4.2.24 on 2026-10-17 05:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+from core.db.indexes import add_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # The index is built CONCURRENTLY, which cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('exams', '0005_question_search'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            'exams', 'question',
+            models.Index(
+                models.F('category'),
+                django.db.models.functions.text.MD5('question_name'),
+                name='questions_dedup_idx',
+            ),
+        ),
+    ]
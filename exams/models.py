@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import MD5
 from django.conf import settings
 import uuid
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -23,6 +25,7 @@ class Exam(models.Model):
         indexes = [
             models.Index(fields=['exam_name']),
             models.Index(fields=['category']),
+            models.Index(fields=['is_active', '-created_at', '-id'], name='exams_active_created_idx'),
         ]
 
     def __str__(self) -> str:
@@ -44,6 +47,10 @@ class Question(models.Model):
         indexes = [
             models.Index(fields=['category']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['-created_at'], name='questions_created_idx'),
+            # Imports match existing questions on (question_name, category);
+            # names are unbounded text, so they are indexed by their hash.
+            models.Index(F('category'), MD5('question_name'), name='questions_dedup_idx'),
         ]
 
     def __str__(self) -> str:
@@ -65,6 +72,7 @@ class ExamQuestion(models.Model):
         indexes = [
             models.Index(fields=['exam']),
             models.Index(fields=['question']),
+            models.Index(fields=['-created_at'], name='exam_questions_created_idx'),
         ]
 
     def __str__(self) -> str:
@@ -85,6 +93,7 @@ class QuestionAnswer(models.Model):
         indexes = [
             models.Index(fields=['question']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['-created_at'], name='questions_answer_created_idx'),
         ]
 
     def __str__(self) -> str:
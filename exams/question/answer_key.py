@@ -0,0 +1,176 @@
+import hashlib
+import heapq
+import uuid
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from django.conf import settings
+
+from core.cache import BoundedTTLCache
+from core.exceptions import NotFoundError
+from exams.models import ExamQuestion, QuestionAnswer
+from .cache import QuestionPaperCache
+
+
+class AnswerKeyEntry(NamedTuple):
+    question_id: uuid.UUID
+    valid_answer_ids: FrozenSet[uuid.UUID]
+    correct_answer_ids: FrozenSet[uuid.UUID]
+    score: int
+
+
+class AnswerKey:
+    """Grading data for every active question of one exam.
+    
+    ``pool`` lists the exam questions a paper can show, in exam order, and
+    ``number_of_questions`` is how many of them each attempt draws.
+    """
+    
+    def __init__(
+        self,
+        exam_id,
+        entries: Dict[uuid.UUID, AnswerKeyEntry],
+        exam_question_ids: List[uuid.UUID],
+        pool: Optional[List[uuid.UUID]] = None,
+        number_of_questions: int = 0,
+    ):
+        self.exam_id = exam_id
+        self.entries = entries
+        self.exam_question_ids = exam_question_ids
+        self.pool = exam_question_ids if pool is None else pool
+        self.number_of_questions = number_of_questions
+        # The key itself is cached per content version, so a seed's draw can
+        # be kept for as long as the key lives.
+        self._draws = BoundedTTLCache(
+            maxsize=getattr(settings, 'ANSWER_KEY_DRAW_CACHE_SIZE', 1024),
+            ttl=getattr(settings, 'ANSWER_KEY_CACHE_TTL', 3600),
+        )
+    
+    @property
+    def draws_subset(self) -> bool:
+        return 0 < self.number_of_questions < len(self.pool)
+    
+    @staticmethod
+    def _draw_key(seed: int, exam_question_id: uuid.UUID) -> bytes:
+        return hashlib.blake2b(f'{seed}:{exam_question_id}'.encode('ascii'), digest_size=8).digest()
+    
+    def drawn(self, seed: int) -> FrozenSet[uuid.UUID]:
+        """The exam question ids drawn for ``seed``, computed once per seed.
+        
+        Each question gets a pseudo-random rank from the seed and its own id,
+        and the lowest ``number_of_questions`` ranks are drawn. Adding or
+        removing one question therefore changes at most one drawn question.
+        """
+        drawn = self._draws.get(seed)
+        if drawn is None:
+            drawn = frozenset(heapq.nsmallest(
+                self.number_of_questions,
+                self.pool,
+                key=lambda exam_question_id: self._draw_key(seed, exam_question_id),
+            ))
+            self._draws.set(seed, drawn)
+        return drawn
+    
+    def draw(self, seed: Optional[int]) -> List[uuid.UUID]:
+        """The exam question ids on the paper for ``seed``, in exam order.
+        
+        Attempts without a seed predate subsets and get the whole pool.
+        """
+        if seed is None or not self.draws_subset:
+            return list(self.pool)
+        drawn = self.drawn(seed)
+        return [exam_question_id for exam_question_id in self.pool if exam_question_id in drawn]
+    
+    def check_drawn(self, seed: Optional[int], exam_question_id) -> None:
+        """Raise ``NotFoundError`` unless the question is on the paper for ``seed``."""
+        if seed is None or not self.draws_subset:
+            return
+        if self._as_uuid(exam_question_id) not in self.drawn(seed):
+            raise NotFoundError('Exam question not found')
+    
+    @staticmethod
+    def _as_uuid(value) -> Optional[uuid.UUID]:
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return None
+    
+    def grade(self, exam_question_id, answer_id) -> Tuple[uuid.UUID, uuid.UUID, bool, int]:
+        """Return ``(exam_question_id, answer_id, is_correct, score)`` or raise ``NotFoundError``."""
+        exam_question_id = self._as_uuid(exam_question_id)
+        entry = self.entries.get(exam_question_id)
+        if entry is None:
+            raise NotFoundError('Exam question not found')
+        
+        answer_id = self._as_uuid(answer_id)
+        if answer_id not in entry.valid_answer_ids:
+            raise NotFoundError('Answer not found')
+        
+        is_correct = answer_id in entry.correct_answer_ids
+        return exam_question_id, answer_id, is_correct, entry.score if is_correct else 0
+
+
+class AnswerKeyIndex:
+    """Per-process answer keys, rebuilt whenever the exam's content version changes."""
+    
+    _cache = BoundedTTLCache(
+        maxsize=getattr(settings, 'ANSWER_KEY_CACHE_SIZE', 256),
+        ttl=getattr(settings, 'ANSWER_KEY_CACHE_TTL', 3600),
+    )
+    
+    @staticmethod
+    def build(exam_id) -> AnswerKey:
+        exam_questions = list(
+            ExamQuestion.objects
+            .filter(exam_id=exam_id, is_active=True)
+            .order_by('created_at')
+            .values_list('id', 'question_id', 'score', 'question__is_active', 'exam__number_of_questions')
+        )
+        answers: Dict[uuid.UUID, Tuple[set, set]] = {
+            question_id: (set(), set()) for _, question_id, *_ in exam_questions
+        }
+        for answer_id, question_id, is_correct in QuestionAnswer.objects.filter(
+            question_id__in=answers.keys(),
+            is_active=True
+        ).values_list('id', 'question_id', 'is_correct'):
+            valid, correct = answers[question_id]
+            valid.add(answer_id)
+            if is_correct:
+                correct.add(answer_id)
+        
+        entries = {
+            exam_question_id: AnswerKeyEntry(
+                question_id=question_id,
+                valid_answer_ids=frozenset(answers[question_id][0]),
+                correct_answer_ids=frozenset(answers[question_id][1]),
+                score=score,
+            )
+            for exam_question_id, question_id, score, _, _ in exam_questions
+        }
+        return AnswerKey(
+            exam_id,
+            entries,
+            [exam_question_id for exam_question_id, *_ in exam_questions],
+            pool=[exam_question_id for exam_question_id, _, _, question_active, _ in exam_questions if question_active],
+            number_of_questions=exam_questions[0][4] if exam_questions else 0,
+        )
+    
+    @classmethod
+    def get(cls, exam_id) -> AnswerKey:
+        # A key is only reused while its content version is shared by every
+        # worker; a per-process version would keep other workers grading
+        # with a corrected key's stale copy, so grade from the database.
+        if not QuestionPaperCache.is_shared():
+            return cls.build(exam_id)
+        version = QuestionPaperCache.get_version(exam_id)
+        if version is None:
+            return cls.build(exam_id)
+        
+        key = (str(exam_id), version)
+        answer_key = cls._cache.get(key)
+        if answer_key is None:
+            answer_key = cls.build(exam_id)
+            cls._cache.set(key, answer_key)
+        return answer_key
+    
+    @classmethod
+    def stats(cls) -> dict:
+        return cls._cache.stats()
@@ -0,0 +1,123 @@
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class QuestionPaperCache:
+    """Stores encoded question papers keyed by an exam content version.
+
+    Every change to an exam's content bumps its version (see ``exams.signals``),
+    so stale payloads are never served and simply age out of the cache.
+    """
+    
+    VERSION_KEY = 'exam_paper:version:{exam_id}'
+    # v2: payloads stored before per-attempt papers could hold the whole pool
+    # of an exam that now draws a subset, so they must never be read again.
+    PAYLOAD_KEY = 'exam_paper:payload:v2:{exam_id}:{version}'
+    
+    # Backends whose entries are only visible to the process that wrote them.
+    PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+    
+    _lock = threading.Lock()
+    _hits = 0
+    _misses = 0
+    
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'EXAM_PAPER_CACHE_ALIAS', 'default')]
+    
+    @classmethod
+    def is_shared(cls) -> bool:
+        """Whether a version bump in one worker is seen by every other worker."""
+        shared = getattr(settings, 'EXAM_PAPER_CACHE_SHARED', None)
+        if shared is None:
+            shared = not isinstance(cls._cache(), cls.PROCESS_LOCAL_BACKENDS)
+        return shared
+    
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'EXAM_PAPER_CACHE_TIMEOUT', 3600)
+    
+    @staticmethod
+    def _normalize(exam_id) -> Optional[str]:
+        try:
+            return str(uuid.UUID(str(exam_id)))
+        except ValueError:
+            return None
+    
+    @classmethod
+    def get_version(cls, exam_id) -> Optional[int]:
+        exam_key = cls._normalize(exam_id)
+        if exam_key is None:
+            return None
+        
+        cache = cls._cache()
+        version_key = cls.VERSION_KEY.format(exam_id=exam_key)
+        version = cache.get(version_key)
+        if version is None:
+            # Seed from the clock rather than 1 so an evicted counter can never
+            # resurrect a payload stored under an earlier version.
+            cache.add(version_key, time.time_ns(), timeout=None)
+            version = cache.get(version_key)
+        return version
+    
+    @classmethod
+    def bump(cls, exam_ids: Iterable) -> None:
+        cache = cls._cache()
+        for exam_id in set(exam_ids):
+            exam_key = cls._normalize(exam_id)
+            if exam_key is None:
+                continue
+            version_key = cls.VERSION_KEY.format(exam_id=exam_key)
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                cache.add(version_key, time.time_ns(), timeout=None)
+    
+    @classmethod
+    def get(cls, exam_id) -> Tuple[Optional[int], Optional[bytes]]:
+        version = cls.get_version(exam_id)
+        payload = None
+        if version is not None:
+            payload = cls._cache().get(
+                cls.PAYLOAD_KEY.format(exam_id=cls._normalize(exam_id), version=version)
+            )
+        
+        with cls._lock:
+            if payload is None:
+                cls._misses += 1
+            else:
+                cls._hits += 1
+        return version, payload
+    
+    @classmethod
+    def set(cls, exam_id, version: Optional[int], payload: bytes) -> None:
+        if version is None:
+            return
+        cls._cache().set(
+            cls.PAYLOAD_KEY.format(exam_id=cls._normalize(exam_id), version=version),
+            payload,
+            timeout=cls._timeout(),
+        )
+    
+    @classmethod
+    def stats(cls) -> Dict[str, float]:
+        with cls._lock:
+            hits, misses = cls._hits, cls._misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+        }
+    
+    @classmethod
+    def reset_stats(cls) -> None:
+        with cls._lock:
+            cls._hits = 0
+            cls._misses = 0
@@ -0,0 +1,340 @@
+"""Bulk import of question banks from CSV, JSONL and QTI 2.x XML.
+
+Readers turn a file into a stream of ``(position, data)`` pairs; the
+importer writes them in fixed-size chunks, one transaction per chunk, so
+memory use depends on the chunk size and not on the size of the file.
+"""
+import csv
+import hashlib
+import io
+import json
+import re
+import uuid
+import xml.etree.ElementTree as ET
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.db import connections, router, transaction
+from django.db.models.functions import MD5
+
+from exams.models import Exam, ExamQuestion, Question, QuestionAnswer
+from .cache import QuestionPaperCache
+
+
+class ImportRecord(NamedTuple):
+    position: int
+    question_name: str
+    category: str
+    description: str
+    answers: Tuple[Tuple[str, bool], ...]
+    exam_id: Optional[uuid.UUID]
+    score: Optional[int]
+
+
+ANSWER_COLUMN = re.compile(r'^answer_(\d+)$')
+
+
+def read_csv(stream) -> Iterator[Tuple[int, Any]]:
+    """One question per row.
+
+    Columns: ``question_name``, ``category``, ``description``, ``exam_id``,
+    ``score``, ``answer_1`` ... ``answer_N`` and ``correct``, the
+    comma-separated positions of the correct answers (e.g. ``2`` or ``1,3``).
+    """
+    reader = csv.DictReader(stream)
+    answer_columns = sorted(
+        (int(match.group(1)), column)
+        for column in reader.fieldnames or []
+        for match in [ANSWER_COLUMN.match(column)] if match
+    )
+    for row in reader:
+        try:
+            correct = {int(value) for value in (row.get('correct') or '').split(',') if value.strip()}
+        except ValueError:
+            yield reader.line_num, ValueError('correct must list answer positions, e.g. "1" or "1,3"')
+            continue
+        answers = [
+            {'answer': row[column], 'is_correct': number in correct}
+            for number, column in answer_columns if (row[column] or '').strip()
+        ]
+        yield reader.line_num, {**row, 'answers': answers}
+
+
+def read_jsonl(stream) -> Iterator[Tuple[int, Any]]:
+    """One JSON object per line, with ``answers`` as ``[{"answer": ..., "is_correct": ...}]``."""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f'invalid JSON: {e}')
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(element) -> str:
+    return ' '.join(''.join(element.itertext()).split())
+
+
+def _parse_assessment_item(item) -> Dict[str, Any]:
+    correct = set()
+    prompt = None
+    choices = []
+    for element in item.iter():
+        name = _local_name(element.tag)
+        if name == 'correctResponse':
+            correct.update((value.text or '').strip() for value in element if _local_name(value.tag) == 'value')
+        elif name == 'prompt' and prompt is None:
+            prompt = _text(element)
+        elif name == 'simpleChoice':
+            choices.append((element.get('identifier'), _text(element)))
+    return {
+        'question_name': prompt or item.get('title', ''),
+        'answers': [{'answer': text, 'is_correct': identifier in correct} for identifier, text in choices],
+    }
+
+
+def read_qti(stream) -> Iterator[Tuple[int, Any]]:
+    """Choice items of a QTI 2.x file, one ``assessmentItem`` at a time.
+
+    Each item is detached from the tree once read, so a file holding any
+    number of items is parsed in constant memory.
+    """
+    parents = []
+    count = 0
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+        parents.pop()
+        if _local_name(element.tag) != 'assessmentItem':
+            continue
+        count += 1
+        yield count, _parse_assessment_item(element)
+        if parents:
+            parents[-1].remove(element)
+        element.clear()
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+    'qti': read_qti,
+}
+
+
+class QuestionImporter:
+    """Writes questions, their answers and exam links in chunked transactions.
+
+    Questions are matched on ``(question_name, category)``: a question that
+    already exists, in the database or earlier in the file, is not created
+    again, but is still linked to the record's exam. Rows go in with
+    ``COPY`` on PostgreSQL and ``bulk_create`` elsewhere.
+    """
+
+    COPY_VENDORS = ('postgresql',)
+    MAX_ERRORS = 100
+
+    def __init__(
+        self,
+        created_by_id,
+        exam_id=None,
+        category: Optional[str] = None,
+        score: Optional[int] = None,
+        chunk_size: int = 1000,
+        use_copy: bool = True,
+    ):
+        self.created_by_id = created_by_id
+        self.exam_id = exam_id
+        self.category = category
+        self.score = score
+        self.chunk_size = chunk_size
+        self.use_copy = use_copy
+
+    def normalize(self, position: int, data: Any) -> ImportRecord:
+        """Validate one reader item, filling in the importer's defaults; raises ``ValueError``."""
+        if isinstance(data, Exception):
+            raise ValueError(str(data))
+        if not isinstance(data, dict):
+            raise ValueError('expected an object')
+
+        question_name = str(data.get('question_name') or '').strip()
+        if not question_name:
+            raise ValueError('question_name is required')
+        category = str(data.get('category') or self.category or '').strip()
+        if not category:
+            raise ValueError('category is required')
+        if len(category) > Question._meta.get_field('category').max_length:
+            raise ValueError('category is too long')
+
+        answers = tuple(
+            (str(answer.get('answer') or '').strip(), bool(answer.get('is_correct')))
+            for answer in data.get('answers') or []
+            if isinstance(answer, dict)
+        )
+        if len(answers) < 2 or not all(text for text, _ in answers):
+            raise ValueError('at least two non-empty answers are required')
+        if not any(is_correct for _, is_correct in answers):
+            raise ValueError('at least one answer must be correct')
+
+        exam_id = data.get('exam_id') or self.exam_id
+        score = data.get('score')
+        if score in (None, ''):
+            score = self.score
+        if exam_id:
+            try:
+                exam_id = uuid.UUID(str(exam_id))
+            except ValueError:
+                raise ValueError('exam_id must be a valid UUID')
+            try:
+                score = int(score)
+            except (TypeError, ValueError):
+                raise ValueError('score must be an integer when linking to an exam')
+            if not 0 <= score <= 10000:
+                raise ValueError('score must be between 0 and 10000')
+
+        return ImportRecord(
+            position=position,
+            question_name=question_name,
+            category=category,
+            description=str(data.get('description') or ''),
+            answers=answers,
+            exam_id=exam_id or None,
+            score=score if exam_id else None,
+        )
+
+    @staticmethod
+    def name_hash(question_name: str) -> str:
+        """``question_name`` as the database's ``MD5()`` hashes it."""
+        return hashlib.md5(question_name.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _copy_value(value) -> str:
+        if value is None:
+            return '\\N'
+        return '"' + str(value).replace('"', '""') + '"'
+
+    @classmethod
+    def copy_payload(cls, model, objs: List, connection) -> Tuple[str, io.StringIO]:
+        """The ``COPY ... FROM STDIN`` statement and CSV buffer that insert ``objs``."""
+        opts = model._meta
+        fields = opts.concrete_fields
+        qn = connection.ops.quote_name
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write(','.join(
+                cls._copy_value(field.get_db_prep_save(field.pre_save(obj, True), connection))
+                for field in fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        sql = (
+            f'COPY {qn(opts.db_table)} ({", ".join(qn(field.column) for field in fields)}) '
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        return sql, buffer
+
+    def _insert(self, model, objs: List) -> None:
+        if not objs:
+            return
+        connection = connections[router.db_for_write(model)]
+        if self.use_copy and connection.vendor in self.COPY_VENDORS:
+            sql, buffer = self.copy_payload(model, objs, connection)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(sql, buffer)
+        else:
+            model.objects.bulk_create(objs, batch_size=self.chunk_size)
+
+    def _import_chunk(self, records: List[ImportRecord], totals: Dict[str, Any]) -> None:
+        with transaction.atomic():
+            exam_ids = {record.exam_id for record in records if record.exam_id}
+            known_exam_ids = set(Exam.objects.filter(pk__in=exam_ids).values_list('pk', flat=True))
+
+            # Matched on the hash that questions_dedup_idx covers; the names
+            # themselves are compared below.
+            existing = {}
+            for question_id, question_name, category in Question.objects.annotate(
+                name_hash=MD5('question_name'),
+            ).filter(
+                category__in={record.category for record in records},
+                name_hash__in={self.name_hash(record.question_name) for record in records},
+            ).order_by('created_at').values_list('id', 'question_name', 'category'):
+                existing.setdefault((question_name, category), question_id)
+
+            questions, answers, links = [], [], {}
+            for record in records:
+                if record.exam_id and record.exam_id not in known_exam_ids:
+                    self._reject(totals, record.position, 'exam not found')
+                    continue
+
+                key = (record.question_name, record.category)
+                question_id = existing.get(key)
+                if question_id is None:
+                    question = Question(
+                        question_name=record.question_name,
+                        category=record.category,
+                        description=record.description,
+                        created_by_id=self.created_by_id,
+                    )
+                    questions.append(question)
+                    answers.extend(
+                        QuestionAnswer(question_id=question.id, answer=text, is_correct=is_correct)
+                        for text, is_correct in record.answers
+                    )
+                    question_id = existing[key] = question.id
+                else:
+                    totals['duplicates'] += 1
+
+                if record.exam_id:
+                    links.setdefault((record.exam_id, question_id), record.score)
+
+            if links:
+                linked = set(ExamQuestion.objects.filter(
+                    exam_id__in={exam_id for exam_id, _ in links},
+                    question_id__in={question_id for _, question_id in links},
+                ).values_list('exam_id', 'question_id'))
+                links = {key: score for key, score in links.items() if key not in linked}
+
+            self._insert(Question, questions)
+            self._insert(QuestionAnswer, answers)
+            self._insert(ExamQuestion, [
+                ExamQuestion(exam_id=exam_id, question_id=question_id, score=score)
+                for (exam_id, question_id), score in links.items()
+            ])
+
+            # Bulk inserts skip the signals that version cached papers.
+            changed_exam_ids = {exam_id for exam_id, _ in links}
+            if changed_exam_ids:
+                transaction.on_commit(lambda: QuestionPaperCache.bump(changed_exam_ids))
+
+        totals['questions'] += len(questions)
+        totals['answers'] += len(answers)
+        totals['links'] += len(links)
+
+    def _reject(self, totals: Dict[str, Any], position: int, message: str) -> None:
+        totals['invalid'] += 1
+        if len(totals['errors']) < self.MAX_ERRORS:
+            totals['errors'].append((position, message))
+
+    def run(self, items: Iterable[Tuple[int, Any]], progress=None) -> Dict[str, Any]:
+        """Import reader output; ``progress`` is called with the running totals after each chunk."""
+        totals = {'questions': 0, 'answers': 0, 'links': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, self.chunk_size))
+            if not chunk:
+                return totals
+
+            records = []
+            for position, data in chunk:
+                try:
+                    records.append(self.normalize(position, data))
+                except ValueError as e:
+                    self._reject(totals, position, str(e))
+            self._import_chunk(records, totals)
+
+            if progress is not None:
+                progress(totals)
@@ -0,0 +1,270 @@
+"""Full-text search over the question bank.
+
+PostgreSQL keeps a weighted ``tsvector`` in a ``search_vector`` column on
+``questions``, filled by a trigger and covered by a GIN index. SQLite keeps a
+self-contained FTS5 table, ``questions_fts``, that triggers update on every
+write. Both are maintained by the database, so bulk imports and
+``QuerySet.update()`` stay in sync too. Other databases fall back to
+``icontains``.
+"""
+import re
+from typing import List, Optional
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.utils import OperationalError
+
+from core.exceptions import ValidationError
+from exams.models import Question
+
+
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def _postgres_vector(row: str = '') -> str:
+    return (
+        f"setweight(to_tsvector('english', coalesce({row}question_name, '')), 'A') "
+        f"|| setweight(to_tsvector('english', coalesce({row}category, '')), 'B') "
+        f"|| setweight(to_tsvector('english', coalesce({row}description, '')), 'C')"
+    )
+
+
+# A plain column and a trigger rather than a generated column: adding a
+# STORED generated column rewrites the whole table under an exclusive lock.
+# Existing rows are backfilled in batches and the index is built
+# CONCURRENTLY, so ``questions`` stays readable and writable throughout.
+POSTGRES_INSTALL = [
+    'ALTER TABLE questions ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    f"""
+    CREATE OR REPLACE FUNCTION questions_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {_postgres_vector('NEW.')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS questions_search_vector_update ON questions',
+    """
+    CREATE TRIGGER questions_search_vector_update
+    BEFORE INSERT OR UPDATE OF question_name, category, description ON questions
+    FOR EACH ROW EXECUTE FUNCTION questions_search_vector_update()
+    """,
+]
+POSTGRES_BACKFILL = (
+    f'UPDATE questions SET search_vector = {_postgres_vector()} '
+    f'WHERE id IN (SELECT id FROM questions WHERE search_vector IS NULL LIMIT %s)'
+)
+POSTGRES_INDEX = 'CREATE INDEX CONCURRENTLY IF NOT EXISTS questions_search_vector_idx ON questions USING gin (search_vector)'
+POSTGRES_UNINSTALL = [
+    'DROP INDEX CONCURRENTLY IF EXISTS questions_search_vector_idx',
+    'DROP TRIGGER IF EXISTS questions_search_vector_update ON questions',
+    'DROP FUNCTION IF EXISTS questions_search_vector_update()',
+    'ALTER TABLE questions DROP COLUMN IF EXISTS search_vector',
+]
+
+# The FTS rows are keyed on ``questions_fts_ids``, which maps each question's
+# UUID to an INTEGER PRIMARY KEY. ``questions`` has no integer key of its own,
+# so its implicit rowids may change on VACUUM and cannot be joined on.
+SQLITE_INSTALL = [
+    'CREATE TABLE IF NOT EXISTS questions_fts_ids (id INTEGER PRIMARY KEY, question_id TEXT NOT NULL UNIQUE)',
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+        question_name, category, description, tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+        INSERT INTO questions_fts_ids (question_id) VALUES (new.id);
+        INSERT INTO questions_fts (rowid, question_name, category, description)
+        VALUES ((SELECT id FROM questions_fts_ids WHERE question_id = new.id),
+                new.question_name, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+        DELETE FROM questions_fts WHERE rowid = (SELECT id FROM questions_fts_ids WHERE question_id = old.id);
+        DELETE FROM questions_fts_ids WHERE question_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+        UPDATE questions_fts_ids SET question_id = new.id WHERE question_id = old.id;
+        UPDATE questions_fts
+        SET question_name = new.question_name, category = new.category, description = new.description
+        WHERE rowid = (SELECT id FROM questions_fts_ids WHERE question_id = new.id);
+    END
+    """,
+    'INSERT INTO questions_fts_ids (question_id) SELECT id FROM questions',
+    """
+    INSERT INTO questions_fts (rowid, question_name, category, description)
+    SELECT ids.id, q.question_name, q.category, q.description
+    FROM questions q JOIN questions_fts_ids ids ON ids.question_id = q.id
+    """,
+]
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS questions_fts_insert',
+    'DROP TRIGGER IF EXISTS questions_fts_delete',
+    'DROP TRIGGER IF EXISTS questions_fts_update',
+    'DROP TABLE IF EXISTS questions_fts',
+    'DROP TABLE IF EXISTS questions_fts_ids',
+]
+
+
+class QuestionSearch:
+    """Ranked matching of free text against question name, category and description.
+
+    Every word must match; the last one also matches as a prefix, so partial
+    input narrows results while it is typed. Name matches rank above category
+    matches, which rank above description matches.
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+    BACKFILL_BATCH_SIZE = 5000
+
+    @classmethod
+    def parse_limit(cls, limit: Optional[str]) -> int:
+        if not limit:
+            return cls.DEFAULT_LIMIT
+        try:
+            value = int(limit)
+        except ValueError:
+            raise ValidationError('limit must be a valid integer')
+        if value < 1:
+            raise ValidationError('limit must be a positive integer')
+        return min(value, cls.MAX_LIMIT)
+
+    @staticmethod
+    def tokens(query: str) -> List[str]:
+        return TOKEN.findall(query or '')[:16]
+
+    @staticmethod
+    def _sqlite_installed(connection) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE (type = 'trigger' AND name = 'questions_fts_update') "
+                "OR (type = 'table' AND name = 'questions_fts_ids')"
+            )
+            return cursor.fetchone()[0] == 2
+
+    @staticmethod
+    def _postgres_index_state(cursor) -> Optional[bool]:
+        """Whether the GIN index is valid; ``None`` when it does not exist."""
+        cursor.execute(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = 'questions_search_vector_idx'"
+        )
+        row = cursor.fetchone()
+        return None if row is None else row[0]
+
+    @classmethod
+    def _install_postgres(cls, connection) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM pg_trigger WHERE tgname = 'questions_search_vector_update' "
+                "AND tgrelid = to_regclass('questions')"
+            )
+            if cursor.fetchone()[0] and cls._postgres_index_state(cursor):
+                return
+            for statement in POSTGRES_INSTALL:
+                cursor.execute(statement)
+            # The trigger covers rows written from here on. Older rows are
+            # filled a batch at a time, each UPDATE committing on its own.
+            while True:
+                cursor.execute(POSTGRES_BACKFILL, [cls.BACKFILL_BATCH_SIZE])
+                if cursor.rowcount < cls.BACKFILL_BATCH_SIZE:
+                    break
+            # An interrupted concurrent build leaves an invalid index behind.
+            if cls._postgres_index_state(cursor) is False:
+                cursor.execute('DROP INDEX CONCURRENTLY questions_search_vector_idx')
+            cursor.execute(POSTGRES_INDEX)
+
+    @classmethod
+    def install(cls, connection) -> None:
+        """Create the search column or table if missing; safe to call repeatedly.
+
+        On PostgreSQL the backfill commits per batch and the index is built
+        ``CONCURRENTLY``, so this must run outside a transaction.
+        """
+        if connection.vendor == 'postgresql':
+            cls._install_postgres(connection)
+            return
+        if connection.vendor != 'sqlite':
+            return
+        # Rebuilding the table for a schema change drops its triggers, and
+        # the FTS rows must then be rebuilt as well. Installs from before
+        # the id map had no questions_fts_ids and are replaced here too.
+        if cls._sqlite_installed(connection):
+            return
+        statements = SQLITE_UNINSTALL + SQLITE_INSTALL
+        try:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+        except OperationalError:
+            # SQLite built without FTS5; searches fall back to icontains.
+            pass
+
+    @staticmethod
+    def uninstall(connection) -> None:
+        statements = {'postgresql': POSTGRES_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}.get(connection.vendor, [])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    @classmethod
+    def _expressions(cls, queryset: QuerySet, tokens: List[str]):
+        """``(match, rank)`` expressions for this database, or ``None`` without a full-text index."""
+        connection = connections[queryset.db]
+        table = connection.ops.quote_name(Question._meta.db_table)
+        if connection.vendor == 'postgresql':
+            tsquery = ' & '.join(tokens) + ':*'
+            return (
+                RawSQL(f"{table}.search_vector @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField()),
+                RawSQL(f"ts_rank_cd({table}.search_vector, to_tsquery('english', %s))", [tsquery], output_field=FloatField()),
+            )
+        if connection.vendor == 'sqlite' and cls._sqlite_installed(connection):
+            match = ' '.join(f'"{token}"' for token in tokens) + '*'
+            weights = ', '.join(str(weight) for weight in cls.SQLITE_WEIGHTS)
+            pk = f'{table}.{connection.ops.quote_name(Question._meta.pk.column)}'
+            return (
+                RawSQL(
+                    f'{pk} IN (SELECT question_id FROM questions_fts_ids WHERE id IN '
+                    f'(SELECT rowid FROM questions_fts WHERE questions_fts MATCH %s))',
+                    [match], output_field=BooleanField(),
+                ),
+                RawSQL(
+                    f'(SELECT -bm25(questions_fts, {weights}) FROM questions_fts '
+                    f'WHERE questions_fts MATCH %s '
+                    f'AND rowid = (SELECT id FROM questions_fts_ids WHERE question_id = {pk}))',
+                    [match], output_field=FloatField(),
+                ),
+            )
+        return None
+
+    @classmethod
+    def filter(cls, queryset: QuerySet, query: str) -> QuerySet:
+        """Questions in ``queryset`` matching ``query``, in the queryset's own order."""
+        tokens = cls.tokens(query)
+        if not tokens:
+            return queryset.none()
+        expressions = cls._expressions(queryset, tokens)
+        if expressions is None:
+            condition = Q()
+            for token in tokens:
+                condition &= Q(question_name__icontains=token) | Q(category__icontains=token) | Q(description__icontains=token)
+            return queryset.filter(condition)
+        return queryset.filter(expressions[0])
+
+    @classmethod
+    def ranked(cls, queryset: QuerySet, query: str) -> QuerySet:
+        """Matching questions annotated with ``rank``, best first."""
+        tokens = cls.tokens(query)
+        if not tokens:
+            return queryset.none()
+        expressions = cls._expressions(queryset, tokens)
+        if expressions is None:
+            return cls.filter(queryset, query).annotate(rank=Value(0.0, output_field=FloatField())).order_by('-created_at', '-pk')
+        match, rank = expressions
+        return queryset.filter(match).annotate(rank=rank).order_by('-rank', '-created_at', '-pk')
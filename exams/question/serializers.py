@@ -14,6 +14,21 @@ class QuestionSerializer:
         }
 
 
+class QuestionSearchSerializer:
+    
+    @staticmethod
+    def to_dict(question: Question) -> Dict[str, Any]:
+        return {
+            **QuestionSerializer.to_dict(question),
+            'is_active': question.is_active,
+            'rank': round(question.rank, 6),
+        }
+    
+    @classmethod
+    def to_dict_list(cls, questions: List[Question]) -> List[Dict[str, Any]]:
+        return [cls.to_dict(question) for question in questions]
+
+
 class QuestionAnswerSerializer:
     
     @staticmethod
@@ -33,7 +48,9 @@ class ExamQuestionSerializer:
     @staticmethod
     def to_dict(exam_question: ExamQuestion) -> Dict[str, Any]:
         question = exam_question.question
-        answers = QuestionAnswer.objects.filter(question=question, is_active=True)
+        answers = getattr(question, 'active_answers', None)
+        if answers is None:
+            answers = QuestionAnswer.objects.filter(question=question, is_active=True)
         
         return {
             'id': str(question.id),
@@ -0,0 +1,118 @@
+import random
+from asgiref.sync import sync_to_async
+from typing import Dict, Any, List, Optional
+from django.db.models import Prefetch, QuerySet
+
+from core.exceptions import NotFoundError, ValidationError
+from core.validators import InputValidator
+from exams.models import Exam, ExamQuestion, QuestionAnswer
+from .answer_key import AnswerKeyIndex
+from .serializers import ExamQuestionSerializer
+
+
+class QuestionPaperService:
+    """Assembles an exam's question paper in a fixed number of queries."""
+
+    @staticmethod
+    def get_exam(exam_id: str) -> Exam:
+        try:
+            return Exam.objects.get(id=exam_id, is_active=True)
+        except Exam.DoesNotExist:
+            raise NotFoundError('Exam not found')
+
+    @staticmethod
+    async def aget_exam(exam_id: str) -> Exam:
+        try:
+            return await Exam.objects.aget(id=exam_id, is_active=True)
+        except Exam.DoesNotExist:
+            raise NotFoundError('Exam not found')
+
+    @staticmethod
+    def _attempt_seeds(student, exam: Exam, student_exam_id: str) -> QuerySet:
+        InputValidator.validate_uuid(student_exam_id, 'Student exam ID')
+        return student.student_exams.filter(id=student_exam_id, exam=exam).values_list('question_seed', flat=True)[:1]
+
+    @classmethod
+    def get_question_seed(cls, student, exam: Exam, student_exam_id: str) -> Optional[int]:
+        seeds = list(cls._attempt_seeds(student, exam, student_exam_id))
+        if not seeds:
+            raise NotFoundError('Student exam not found')
+        return seeds[0]
+
+    @classmethod
+    async def aget_question_seed(cls, student, exam: Exam, student_exam_id: str) -> Optional[int]:
+        seeds = [seed async for seed in cls._attempt_seeds(student, exam, student_exam_id)]
+        if not seeds:
+            raise NotFoundError('Student exam not found')
+        return seeds[0]
+
+    @staticmethod
+    def check_shared_paper(exam: Exam) -> None:
+        """Refuse to serve the whole pool of an exam that draws a subset per attempt.
+
+        Decided from the exam's cached answer key, before any of the paper is
+        loaded; exams that show every question skip the key altogether.
+        """
+        if exam.number_of_questions > 0 and AnswerKeyIndex.get(exam.id).draws_subset:
+            raise ValidationError('student_exam_id is required for this exam')
+
+    @classmethod
+    async def acheck_shared_paper(cls, exam: Exam) -> None:
+        if exam.number_of_questions > 0:
+            await sync_to_async(cls.check_shared_paper)(exam)
+
+    @staticmethod
+    def get_exam_questions(exam: Exam) -> QuerySet:
+        # One query for the exam questions joined to their questions, one for
+        # every active answer of those questions; Django groups the answers
+        # onto ``question.active_answers`` in memory.
+        active_answers = Prefetch(
+            'question__answers',
+            queryset=QuestionAnswer.objects.filter(is_active=True).order_by('created_at', 'id'),
+            to_attr='active_answers',
+        )
+        return (
+            ExamQuestion.objects
+            .select_related('question')
+            .filter(exam=exam, is_active=True, question__is_active=True)
+            .order_by('created_at')
+            .prefetch_related(active_answers)
+        )
+
+    @classmethod
+    def build_paper(cls, exam: Exam) -> List[Dict[str, Any]]:
+        return ExamQuestionSerializer.to_dict_list(cls.get_exam_questions(exam))
+
+    @classmethod
+    async def abuild_paper(cls, exam: Exam) -> List[Dict[str, Any]]:
+        # Async iteration fetches rows and runs the prefetch in one hop, so
+        # the serializer only touches memory.
+        exam_questions = [exam_question async for exam_question in cls.get_exam_questions(exam)]
+        return ExamQuestionSerializer.to_dict_list(exam_questions)
+
+    @staticmethod
+    def shuffle_answers(paper: List[Dict[str, Any]], seed: Optional[int]) -> List[Dict[str, Any]]:
+        """Reorder each question's answers for ``seed``; the same seed gives the same order."""
+        if seed is not None:
+            for question_data in paper:
+                random.Random(f'{seed}:{question_data["exam_question_id"]}').shuffle(question_data['answers'])
+        return paper
+
+    @classmethod
+    def build_student_paper(cls, exam: Exam, seed: Optional[int]) -> List[Dict[str, Any]]:
+        """The paper drawn for one attempt's seed.
+
+        The draw comes from the exam's cached answer key, so the only queries
+        are the ones that load the drawn questions.
+        """
+        exam_question_ids = AnswerKeyIndex.get(exam.id).draw(seed)
+        exam_questions = cls.get_exam_questions(exam).filter(id__in=exam_question_ids)
+        return cls.shuffle_answers(ExamQuestionSerializer.to_dict_list(exam_questions), seed)
+
+    @classmethod
+    async def abuild_student_paper(cls, exam: Exam, seed: Optional[int]) -> List[Dict[str, Any]]:
+        exam_question_ids = (await sync_to_async(AnswerKeyIndex.get)(exam.id)).draw(seed)
+        exam_questions = [
+            exam_question async for exam_question in cls.get_exam_questions(exam).filter(id__in=exam_question_ids)
+        ]
+        return cls.shuffle_answers(ExamQuestionSerializer.to_dict_list(exam_questions), seed)
@@ -0,0 +1,150 @@
+from django.test import override_settings
+from unittest.mock import patch
+
+from core.exceptions import NotFoundError
+from core.test_utils import BaseTestCase, LOCMEM_CACHES, create_test_question_with_answers
+from .answer_key import AnswerKey, AnswerKeyIndex
+from .cache import QuestionPaperCache
+
+
+class AnswerKeyTest(BaseTestCase):
+    
+    def test_build_maps_exam_questions(self):
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        entry = answer_key.entries[self.exam_question.id]
+        self.assertEqual(entry.question_id, self.test_question.id)
+        self.assertEqual(entry.valid_answer_ids, {self.correct_answer.id, self.incorrect_answer.id})
+        self.assertEqual(entry.correct_answer_ids, {self.correct_answer.id})
+        self.assertEqual(entry.score, 20)
+        self.assertEqual(answer_key.exam_question_ids, [self.exam_question.id])
+    
+    def test_build_query_count_is_constant(self):
+        for i in range(10):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {i}')
+        
+        with self.assertNumQueries(2):
+            answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        self.assertEqual(len(answer_key.entries), 11)
+    
+    def test_grade_correct_and_incorrect(self):
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        _, _, is_correct, score = answer_key.grade(str(self.exam_question.id), str(self.correct_answer.id))
+        self.assertTrue(is_correct)
+        self.assertEqual(score, 20)
+        
+        _, _, is_correct, score = answer_key.grade(str(self.exam_question.id), str(self.incorrect_answer.id))
+        self.assertFalse(is_correct)
+        self.assertEqual(score, 0)
+    
+    def test_grade_rejects_unknown_ids(self):
+        _, other_answers, _ = create_test_question_with_answers(self.test_exam, self.test_user, 'Other')
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        with self.assertRaisesMessage(NotFoundError, 'Exam question not found'):
+            answer_key.grade('not-a-uuid', str(self.correct_answer.id))
+        
+        with self.assertRaisesMessage(NotFoundError, 'Answer not found'):
+            answer_key.grade(str(self.exam_question.id), str(other_answers[0].id))
+    
+    def test_inactive_answers_are_not_valid(self):
+        self.incorrect_answer.is_active = False
+        self.incorrect_answer.save()
+        
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        with self.assertRaises(NotFoundError):
+            answer_key.grade(self.exam_question.id, self.incorrect_answer.id)
+
+
+class AnswerKeyDrawTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        for i in range(9):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {i}')
+        self.answer_key = AnswerKeyIndex.build(self.test_exam.id)
+    
+    def test_draw_is_reproducible_subset_in_exam_order(self):
+        drawn = self.answer_key.draw(42)
+        
+        self.assertEqual(len(drawn), self.test_exam.number_of_questions)
+        self.assertEqual(drawn, self.answer_key.draw(42))
+        self.assertEqual(drawn, [i for i in self.answer_key.pool if i in drawn])
+        self.assertNotEqual(
+            {tuple(self.answer_key.draw(seed)) for seed in range(20)},
+            {tuple(drawn)}
+        )
+    
+    def test_pool_change_replaces_at_most_one_question(self):
+        before = set(self.answer_key.draw(7))
+        
+        create_test_question_with_answers(self.test_exam, self.test_user, 'Late addition')
+        after = set(AnswerKeyIndex.build(self.test_exam.id).draw(7))
+        
+        self.assertLessEqual(len(before - after), 1)
+    
+    def test_unseeded_and_small_pools_draw_everything(self):
+        self.assertEqual(self.answer_key.draw(None), self.answer_key.pool)
+        
+        self.test_exam.number_of_questions = 50
+        self.test_exam.save()
+        
+        self.assertEqual(len(AnswerKeyIndex.build(self.test_exam.id).draw(42)), 10)
+    
+    def test_inactive_questions_are_never_drawn(self):
+        self.test_question.is_active = False
+        self.test_question.save()
+        
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        
+        self.assertNotIn(self.exam_question.id, answer_key.pool)
+        self.assertIn(self.exam_question.id, answer_key.entries)
+    
+    def test_draw_is_computed_once_per_seed(self):
+        first = self.answer_key.drawn(42)
+        
+        with patch.object(AnswerKey, '_draw_key', side_effect=AssertionError('recomputed')):
+            self.assertIs(self.answer_key.drawn(42), first)
+            self.answer_key.check_drawn(42, next(iter(first)))
+    
+    def test_check_drawn(self):
+        drawn = self.answer_key.draw(42)
+        undrawn = next(i for i in self.answer_key.pool if i not in drawn)
+        
+        self.answer_key.check_drawn(42, str(drawn[0]))
+        self.answer_key.check_drawn(None, undrawn)
+        with self.assertRaisesMessage(NotFoundError, 'Exam question not found'):
+            self.answer_key.check_drawn(42, undrawn)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, EXAM_PAPER_CACHE_SHARED=True)
+class AnswerKeyIndexCacheTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        QuestionPaperCache._cache().clear()
+        AnswerKeyIndex._cache.clear()
+    
+    def test_answer_key_reused_until_content_changes(self):
+        first = AnswerKeyIndex.get(self.test_exam.id)
+        
+        with self.assertNumQueries(0):
+            self.assertIs(AnswerKeyIndex.get(self.test_exam.id), first)
+        
+        self.incorrect_answer.is_correct = True
+        self.incorrect_answer.save()
+        
+        rebuilt = AnswerKeyIndex.get(self.test_exam.id)
+        self.assertIsNot(rebuilt, first)
+        self.assertIn(self.incorrect_answer.id, rebuilt.entries[self.exam_question.id].correct_answer_ids)
+    
+    @override_settings(EXAM_PAPER_CACHE_SHARED=None)
+    def test_answer_key_not_reused_with_a_per_process_cache(self):
+        self.assertFalse(QuestionPaperCache.is_shared())
+        first = AnswerKeyIndex.get(self.test_exam.id)
+        
+        self.assertIsNot(AnswerKeyIndex.get(self.test_exam.id), first)
+        self.assertEqual(len(AnswerKeyIndex._cache), 0)
@@ -0,0 +1,165 @@
+import json
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from core.test_utils import BaseTestCase, LOCMEM_CACHES, create_test_question_with_answers
+from exams.models import QuestionAnswer
+from .cache import QuestionPaperCache
+from .views import AsyncQuestionListView, QuestionListView
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QuestionPaperCacheTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        QuestionPaperCache._cache().clear()
+        QuestionPaperCache.reset_stats()
+        self.factory = RequestFactory()
+    
+    def _get_paper(self):
+        request = self.factory.get('/api/questions', {'exam_id': str(self.test_exam.id)})
+        request.student = self.test_student
+        return QuestionListView.as_view()(request)
+    
+    def test_second_request_is_served_without_queries(self):
+        first = self._get_paper()
+        
+        with self.assertNumQueries(0):
+            second = self._get_paper()
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['X-Paper-Cache'], 'miss')
+        self.assertEqual(second['X-Paper-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(QuestionPaperCache.stats()['hits'], 1)
+        self.assertEqual(QuestionPaperCache.stats()['misses'], 1)
+    
+    def test_answer_change_invalidates_paper(self):
+        self._get_paper()
+        
+        self.correct_answer.answer = 'A general-purpose language'
+        self.correct_answer.save()
+        
+        response = self._get_paper()
+        
+        self.assertEqual(response['X-Paper-Cache'], 'miss')
+        self.assertIn(b'A general-purpose language', response.content)
+    
+    def test_new_exam_question_invalidates_paper(self):
+        self._get_paper()
+        
+        create_test_question_with_answers(self.test_exam, self.test_user, 'Brand new question')
+        
+        response = self._get_paper()
+        
+        self.assertEqual(response['X-Paper-Cache'], 'miss')
+        self.assertEqual(len(json.loads(response.content)['results']), 2)
+    
+    def test_question_change_invalidates_paper(self):
+        self._get_paper()
+        
+        self.test_question.question_name = 'What is CPython?'
+        self.test_question.save()
+        
+        response = self._get_paper()
+        
+        self.assertEqual(json.loads(response.content)['results'][0]['question_name'], 'What is CPython?')
+    
+    def test_deactivating_exam_invalidates_paper(self):
+        self._get_paper()
+        
+        self.test_exam.is_active = False
+        self.test_exam.save()
+        
+        response = self._get_paper()
+        
+        self.assertEqual(response.status_code, 404)
+    
+    def test_deleted_answer_invalidates_paper(self):
+        self._get_paper()
+        
+        QuestionAnswer.objects.get(id=self.incorrect_answer.id).delete()
+        
+        response = self._get_paper()
+        
+        self.assertEqual(len(json.loads(response.content)['results'][0]['answers']), 1)
+    
+    def test_bump_changes_version(self):
+        version = QuestionPaperCache.get_version(self.test_exam.id)
+        
+        QuestionPaperCache.bump([self.test_exam.id])
+        
+        self.assertNotEqual(QuestionPaperCache.get_version(self.test_exam.id), version)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QuestionPaperConditionalGetTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        QuestionPaperCache._cache().clear()
+        self.factory = RequestFactory()
+    
+    def _get_paper(self, **headers):
+        request = self.factory.get('/api/questions', {'exam_id': str(self.test_exam.id)}, **headers)
+        request.student = self.test_student
+        return QuestionListView.as_view()(request)
+    
+    def test_matching_etag_returns_not_modified_without_queries(self):
+        etag = self._get_paper()['ETag']
+        
+        with self.assertNumQueries(0):
+            response = self._get_paper(HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 304)
+    
+    def test_content_change_yields_new_etag(self):
+        etag = self._get_paper()['ETag']
+        
+        self.correct_answer.answer = 'Updated answer'
+        self.correct_answer.save()
+        
+        response = self._get_paper(HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AsyncQuestionListViewTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        QuestionPaperCache._cache().clear()
+        self.factory = AsyncRequestFactory()
+    
+    async def _get_paper(self, headers=None):
+        request = self.factory.get('/api/questions', {'exam_id': str(self.test_exam.id)}, headers=headers)
+        request.student = self.test_student
+        return await AsyncQuestionListView.as_view()(request)
+    
+    async def test_serves_paper_then_cache_hit(self):
+        first = await self._get_paper()
+        second = await self._get_paper()
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['X-Paper-Cache'], 'miss')
+        self.assertEqual(second['X-Paper-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+        results = json.loads(first.content)['results']
+        self.assertEqual(results[0]['exam_question_id'], str(self.exam_question.id))
+        self.assertEqual(len(results[0]['answers']), 2)
+    
+    async def test_matching_etag_returns_not_modified(self):
+        etag = (await self._get_paper())['ETag']
+        
+        response = await self._get_paper(headers={'If-None-Match': etag})
+        
+        self.assertEqual(response.status_code, 304)
+    
+    async def test_requires_authentication(self):
+        request = self.factory.get('/api/questions', {'exam_id': str(self.test_exam.id)})
+        
+        response = await AsyncQuestionListView.as_view()(request)
+        
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,180 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.test_utils import BaseTestCase, LOCMEM_CACHES
+from exams.models import ExamQuestion, Question, QuestionAnswer
+from .cache import QuestionPaperCache
+from .importer import QuestionImporter, read_csv, read_jsonl, read_qti
+
+
+QTI = b'''<?xml version="1.0" encoding="UTF-8"?>
+<assessmentTest xmlns="http://www.imsglobal.org/xsd/imsqti_v2p1">
+  <assessmentItem identifier="q1" title="Capitals">
+    <responseDeclaration identifier="RESPONSE" cardinality="single">
+      <correctResponse><value>B</value></correctResponse>
+    </responseDeclaration>
+    <itemBody>
+      <choiceInteraction responseIdentifier="RESPONSE">
+        <prompt>What is the capital of <b>France</b>?</prompt>
+        <simpleChoice identifier="A">Lyon</simpleChoice>
+        <simpleChoice identifier="B">Paris</simpleChoice>
+      </choiceInteraction>
+    </itemBody>
+  </assessmentItem>
+  <assessmentItem identifier="q2" title="Rivers">
+    <responseDeclaration identifier="RESPONSE" cardinality="multiple">
+      <correctResponse><value>A</value><value>C</value></correctResponse>
+    </responseDeclaration>
+    <itemBody>
+      <choiceInteraction responseIdentifier="RESPONSE">
+        <simpleChoice identifier="A">Seine</simpleChoice>
+        <simpleChoice identifier="B">Rhine</simpleChoice>
+        <simpleChoice identifier="C">Loire</simpleChoice>
+      </choiceInteraction>
+    </itemBody>
+  </assessmentItem>
+</assessmentTest>
+'''
+
+
+class ReaderTest(BaseTestCase):
+    
+    def test_read_csv(self):
+        stream = io.StringIO(
+            'question_name,category,answer_1,answer_2,answer_3,correct\n'
+            'What is 2+2?,Maths,3,4,,2\n'
+            'Broken,Maths,a,b,,x\n'
+        )
+        
+        rows = list(read_csv(stream))
+        
+        self.assertEqual(rows[0][0], 2)
+        self.assertEqual(rows[0][1]['answers'], [
+            {'answer': '3', 'is_correct': False},
+            {'answer': '4', 'is_correct': True},
+        ])
+        self.assertIsInstance(rows[1][1], ValueError)
+    
+    def test_read_jsonl_reports_bad_lines(self):
+        stream = io.StringIO('{"question_name": "Q"}\n\nnot json\n')
+        
+        rows = list(read_jsonl(stream))
+        
+        self.assertEqual(rows[0], (1, {'question_name': 'Q'}))
+        self.assertEqual(rows[1][0], 3)
+        self.assertIsInstance(rows[1][1], ValueError)
+    
+    def test_read_qti(self):
+        rows = list(read_qti(io.BytesIO(QTI)))
+        
+        self.assertEqual(rows[0], (1, {
+            'question_name': 'What is the capital of France?',
+            'answers': [{'answer': 'Lyon', 'is_correct': False}, {'answer': 'Paris', 'is_correct': True}],
+        }))
+        self.assertEqual(rows[1][1]['question_name'], 'Rivers')
+        self.assertEqual([answer['is_correct'] for answer in rows[1][1]['answers']], [True, False, True])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QuestionImporterTest(BaseTestCase):
+    
+    def _record(self, name, **extra):
+        return {
+            'question_name': name,
+            'category': 'Geography',
+            'answers': [{'answer': 'Yes', 'is_correct': True}, {'answer': 'No', 'is_correct': False}],
+            **extra,
+        }
+    
+    def _importer(self, **kwargs):
+        return QuestionImporter(created_by_id=self.test_user.id, **kwargs)
+    
+    def test_imports_in_chunks(self):
+        items = enumerate([self._record(f'Question {i}') for i in range(5)], 1)
+        chunks = []
+        
+        totals = self._importer(chunk_size=2).run(items, progress=lambda totals: chunks.append(totals['questions']))
+        
+        self.assertEqual(chunks, [2, 4, 5])
+        self.assertEqual((totals['questions'], totals['answers'], totals['invalid']), (5, 10, 0))
+        self.assertEqual(Question.objects.filter(category='Geography').count(), 5)
+        self.assertEqual(QuestionAnswer.objects.filter(question__category='Geography', is_correct=True).count(), 5)
+    
+    def test_deduplicates_against_database_and_file(self):
+        Question.objects.create(question_name='Is water wet?', category='Geography', created_by=self.test_user)
+        items = enumerate([
+            self._record('Is water wet?'),
+            self._record('Is the earth round?'),
+            self._record('Is the earth round?'),
+        ], 1)
+        
+        totals = self._importer(chunk_size=10).run(items)
+        
+        self.assertEqual((totals['questions'], totals['duplicates']), (1, 2))
+        self.assertEqual(Question.objects.filter(question_name='Is the earth round?').count(), 1)
+    
+    def test_existing_questions_matched_on_name_hash(self):
+        Question.objects.create(question_name='Où est la tour Eiffel ?', category='Geography', created_by=self.test_user)
+        
+        with CaptureQueriesContext(connection) as queries:
+            totals = self._importer().run(enumerate([self._record('Où est la tour Eiffel ?')], 1))
+        
+        self.assertEqual((totals['questions'], totals['duplicates']), (0, 1))
+        lookup = next(q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and '"questions"' in q['sql'])
+        self.assertIn('MD5("questions"."question_name")', lookup)
+    
+    def test_links_new_and_existing_questions_to_exam(self):
+        version = QuestionPaperCache.get_version(self.test_exam.id)
+        items = enumerate([
+            self._record(self.test_question.question_name, category=self.test_question.category),
+            self._record('Is Python compiled?', score='15'),
+        ], 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            totals = self._importer(exam_id=str(self.test_exam.id), score=5).run(items)
+        
+        self.assertEqual(totals['links'], 1)
+        link = ExamQuestion.objects.get(exam=self.test_exam, question__question_name='Is Python compiled?')
+        self.assertEqual(link.score, 15)
+        self.assertNotEqual(QuestionPaperCache.get_version(self.test_exam.id), version)
+    
+    def test_invalid_records_are_reported(self):
+        items = enumerate([
+            self._record(''),
+            {'question_name': 'No answers', 'category': 'Geography'},
+            self._record('No correct answer', answers=[{'answer': 'a'}, {'answer': 'b'}]),
+            self._record('Unknown exam', exam_id=str(self.exam_question.id), score=1),
+            self._record('Valid'),
+        ], 1)
+        
+        totals = self._importer().run(items)
+        
+        self.assertEqual((totals['questions'], totals['invalid']), (1, 4))
+        self.assertEqual([position for position, _ in totals['errors']], [1, 2, 3, 4])
+    
+    def test_copy_payload(self):
+        question = Question(question_name='Say "hi"', category='Greetings', created_by_id=self.test_user.id)
+        
+        sql, buffer = QuestionImporter.copy_payload(Question, [question], connection)
+        
+        self.assertTrue(sql.startswith('COPY "questions" ('))
+        self.assertIn('"Say ""hi"""', buffer.getvalue())
+        self.assertTrue(buffer.getvalue().endswith('\n'))
+    
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            for i in range(3):
+                handle.write(json.dumps(self._record(f'Command question {i}')) + '\n')
+        self.addCleanup(os.unlink, handle.name)
+        out = io.StringIO()
+        
+        call_command('import_questions', handle.name, '--user', self.test_user.username, '--chunk-size', '2', stdout=out)
+        
+        self.assertIn('Imported 3 questions with 6 answers', out.getvalue())
+        self.assertEqual(Question.objects.filter(question_name__startswith='Command question').count(), 3)
@@ -0,0 +1,105 @@
+from django.db import connection
+
+from core.test_utils import BaseTestCase
+from exams.models import Question
+from .search import SQLITE_INSTALL, QuestionSearch
+
+
+class QuestionSearchTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.by_name = Question.objects.create(
+            question_name='Explain recursion in Python',
+            category='Algorithms',
+            description='Base cases and stack depth',
+            created_by=self.test_user
+        )
+        self.by_description = Question.objects.create(
+            question_name='What does this function return?',
+            category='Algorithms',
+            description='A short exercise on recursion',
+            created_by=self.test_user
+        )
+    
+    def _names(self, query, queryset=None):
+        return [q.question_name for q in QuestionSearch.ranked(queryset or Question.objects.all(), query)]
+    
+    def test_index_is_installed(self):
+        self.assertTrue(QuestionSearch._sqlite_installed(connection))
+    
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self._names('recursion'), [self.by_name.question_name, self.by_description.question_name])
+    
+    def test_all_words_must_match_and_last_is_a_prefix(self):
+        self.assertEqual(self._names('recursion pyth'), [self.by_name.question_name])
+        self.assertEqual(self._names('recur'), [self.by_name.question_name, self.by_description.question_name])
+        self.assertEqual(self._names('recursion haskell'), [])
+    
+    def test_stemming(self):
+        self.assertEqual(self._names('explaining'), [self.by_name.question_name])
+    
+    def test_writes_keep_index_in_sync(self):
+        Question.objects.filter(pk=self.by_name.pk).update(question_name='Explain iteration')
+        self.by_description.delete()
+        
+        self.assertEqual(self._names('recursion'), [])
+        self.assertEqual(self._names('iteration'), ['Explain iteration'])
+    
+    def test_rowid_renumbering_does_not_misdirect_matches(self):
+        # VACUUM may renumber the implicit rowids of ``questions``; emulate it
+        # without firing the triggers.
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER questions_fts_update')
+            cursor.execute('UPDATE questions SET rowid = 1000 - rowid')
+            cursor.execute(next(sql for sql in SQLITE_INSTALL if 'questions_fts_update' in sql))
+        
+        self.assertEqual(self._names('base cases'), [self.by_name.question_name])
+        self.assertEqual(self._names('exercise'), [self.by_description.question_name])
+    
+    def test_punctuation_is_not_query_syntax(self):
+        self.assertEqual(self._names('"recursion" OR -python*'), [])
+        self.assertEqual(self._names('***'), [])
+    
+    def test_filter_respects_queryset(self):
+        self.by_name.is_active = False
+        self.by_name.save()
+        
+        results = QuestionSearch.filter(Question.objects.filter(is_active=True), 'recursion')
+        
+        self.assertEqual(list(results), [self.by_description])
+
+
+class QuestionSearchViewTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.test_user.is_staff = True
+        self.test_user.save()
+        self.client.force_login(self.test_user)
+    
+    def test_returns_ranked_results(self):
+        response = self.client.get('/api/questions/search', {'q': 'python'})
+        
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['id'] for r in results], [str(self.test_question.id)])
+        self.assertGreater(results[0]['rank'], 0)
+    
+    def test_filters_and_validation(self):
+        self.assertEqual(self.client.get('/api/questions/search', {'q': 'python', 'category': 'Other'}).json()['results'], [])
+        self.assertEqual(self.client.get('/api/questions/search').status_code, 400)
+        self.assertEqual(self.client.get('/api/questions/search', {'q': 'python', 'limit': 'x'}).status_code, 400)
+    
+    def test_requires_staff(self):
+        self.client.logout()
+        
+        self.assertEqual(self.client.get('/api/questions/search', {'q': 'python'}).status_code, 401)
+    
+    def test_admin_search_uses_index(self):
+        self.test_user.is_superuser = True
+        self.test_user.save()
+        
+        response = self.client.get('/admin/exams/question/', {'q': 'pyth'})
+        
+        self.assertContains(response, 'What is Python?')
@@ -0,0 +1,77 @@
+from core.test_utils import BaseTestCase, create_test_question_with_answers
+from core.exceptions import NotFoundError
+from exams.models import Question, QuestionAnswer
+from .services import QuestionPaperService
+
+
+class QuestionPaperServiceTest(BaseTestCase):
+    
+    def _add_questions(self, count):
+        for i in range(count):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {i}')
+    
+    def _assemble(self):
+        exam = QuestionPaperService.get_exam(str(self.test_exam.id))
+        return QuestionPaperService.build_paper(exam)
+    
+    def test_build_paper_query_count_is_constant(self):
+        with self.assertNumQueries(3):
+            small_paper = self._assemble()
+        
+        self._add_questions(25)
+        
+        with self.assertNumQueries(3):
+            large_paper = self._assemble()
+        
+        self.assertEqual(len(small_paper), 1)
+        self.assertEqual(len(large_paper), 26)
+    
+    def test_build_paper_groups_answers_per_question(self):
+        self._add_questions(3)
+        
+        paper = self._assemble()
+        
+        for question_data in paper:
+            expected_ids = set(
+                str(answer_id) for answer_id in QuestionAnswer.objects.filter(
+                    question_id=question_data['id'], is_active=True
+                ).values_list('id', flat=True)
+            )
+            self.assertEqual({a['id'] for a in question_data['answers']}, expected_ids)
+    
+    def test_build_paper_excludes_inactive_answers(self):
+        self.incorrect_answer.is_active = False
+        self.incorrect_answer.save()
+        
+        paper = self._assemble()
+        
+        self.assertEqual(len(paper), 1)
+        self.assertEqual(
+            [a['id'] for a in paper[0]['answers']],
+            [str(self.correct_answer.id)]
+        )
+    
+    def test_build_paper_excludes_inactive_questions_and_links(self):
+        question, _, exam_question = create_test_question_with_answers(
+            self.test_exam, self.test_user, 'Inactive link'
+        )
+        exam_question.is_active = False
+        exam_question.save()
+        
+        inactive_question, _, _ = create_test_question_with_answers(
+            self.test_exam, self.test_user, 'Inactive question'
+        )
+        Question.objects.filter(id=inactive_question.id).update(is_active=False)
+        
+        paper = self._assemble()
+        
+        self.assertEqual([q['question_name'] for q in paper], ['What is Python?'])
+    
+    def test_get_exam_inactive(self):
+        self.test_exam.is_active = False
+        self.test_exam.save()
+        
+        with self.assertRaises(NotFoundError) as context:
+            QuestionPaperService.get_exam(str(self.test_exam.id))
+        
+        self.assertIn('Exam not found', str(context.exception))
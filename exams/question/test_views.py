@@ -1,9 +1,15 @@
-from django.test import TestCase
+import json
+from django.test import RequestFactory, override_settings
 from unittest.mock import patch
 
-from core.test_utils import BaseTestCase
-from exams.models import Exam, ExamQuestion
+from core.test_utils import BaseTestCase, LOCMEM_CACHES, create_test_question_with_answers, create_test_student
+from exams.models import ExamQuestion
 from exams.models import Question, QuestionAnswer
+from students.models import Student, StudentExam
+from .answer_key import AnswerKeyIndex
+from .cache import QuestionPaperCache
+from .services import QuestionPaperService
+from .views import QuestionListView
 
 
 class QuestionListViewTest(BaseTestCase):
@@ -266,4 +272,82 @@ class QuestionListViewTest(BaseTestCase):
             
             mock_objects.select_related.assert_called_with('question')
             mock_queryset.filter.assert_called_once()
-            mock_queryset.order_by.assert_called_with('created_at')
\ No newline at end of file
+            mock_queryset.order_by.assert_called_with('created_at')
+
+
+class StudentPaperViewTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        for i in range(7):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {i}')
+        self.student_exam.question_seed = 1234
+        self.student_exam.save()
+    
+    def _get(self, **params):
+        request = self.factory.get('/api/questions', {'exam_id': str(self.test_exam.id), **params})
+        request.student = Student.deferred(self.test_student.id)
+        return QuestionListView.as_view()(request)
+    
+    def _paper(self, student_exam):
+        response = self._get(student_exam_id=str(student_exam.id))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)['results']
+    
+    def test_attempt_gets_its_drawn_subset(self):
+        paper = self._paper(self.student_exam)
+        
+        drawn = AnswerKeyIndex.build(self.test_exam.id).draw(1234)
+        self.assertEqual(len(paper), self.test_exam.number_of_questions)
+        self.assertEqual([q['exam_question_id'] for q in paper], [str(i) for i in drawn])
+    
+    def test_retake_with_same_seed_gets_same_paper(self):
+        retake = StudentExam.objects.create(
+            student=self.test_student,
+            exam=self.test_exam,
+            status='in_progress',
+            question_seed=1234
+        )
+        
+        self.assertEqual(self._paper(retake), self._paper(self.student_exam))
+    
+    def test_answer_order_follows_seed(self):
+        orders = set()
+        for seed in range(8):
+            self.student_exam.question_seed = seed
+            self.student_exam.save()
+            first = self._paper(self.student_exam)
+            self.assertEqual(self._paper(self.student_exam), first)
+            orders.update(
+                tuple(answer['answer'] for answer in question['answers'])
+                for question in first if question['question_name'].startswith('Question')
+            )
+        
+        self.assertEqual(orders, {('Correct Answer', 'Incorrect Answer'), ('Incorrect Answer', 'Correct Answer')})
+    
+    def test_whole_pool_needs_an_attempt(self):
+        response = self._get()
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['detail'], 'student_exam_id is required for this exam')
+    
+    def test_whole_pool_refused_before_the_paper_is_built(self):
+        with patch.object(QuestionPaperService, 'build_paper') as build_paper:
+            self.assertEqual(self._get().status_code, 400)
+        
+        build_paper.assert_not_called()
+    
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_whole_pool_cached_before_subsets_is_not_served(self):
+        QuestionPaperCache._cache().clear()
+        version = QuestionPaperCache.get_version(self.test_exam.id)
+        QuestionPaperCache._cache().set(f'exam_paper:payload:{self.test_exam.id}:{version}', b'{"results": []}')
+        
+        self.assertEqual(self._get().status_code, 400)
+    
+    def test_other_students_attempt_is_not_found(self):
+        other = StudentExam.objects.create(student=create_test_student(), exam=self.test_exam, question_seed=1)
+        
+        self.assertEqual(self._get(student_exam_id=str(other.id)).status_code, 404)
+        self.assertEqual(self._get(student_exam_id='bad').status_code, 400)
@@ -1,37 +1,114 @@
-from core.base_views import AuthenticatedAPIView
+from asgiref.sync import sync_to_async
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.base_views import AuthenticatedAPIView, AsyncAuthenticatedAPIView, StaffAPIView
+from core.decorators import async_condition
 from core.exceptions import ExamAPIException
-from exams.models import Exam, ExamQuestion
-from .serializers import ExamQuestionSerializer
+from exams.models import Question
+from exams.etags import aquestion_paper_etag, question_paper_etag
+from .cache import QuestionPaperCache
+from .search import QuestionSearch
+from .serializers import QuestionSearchSerializer
+from .services import QuestionPaperService
 
 
 class QuestionListView(AuthenticatedAPIView):
     
+    @method_decorator(condition(etag_func=question_paper_etag))
     def get(self, request):
         try:
             exam_id = request.GET.get('exam_id')
             if not exam_id:
                 return self.error_response('exam_id is required', 400)
             
-            exam = self._get_exam_by_id(exam_id)
+            student_exam_id = request.GET.get('student_exam_id')
+            if student_exam_id:
+                exam = QuestionPaperService.get_exam(exam_id)
+                seed = QuestionPaperService.get_question_seed(request.student, exam, student_exam_id)
+                return self.success_response({'results': QuestionPaperService.build_student_paper(exam, seed)})
+            
+            version, payload = QuestionPaperCache.get(exam_id)
+            cache_status = 'hit'
+            
+            if payload is None:
+                cache_status = 'miss'
+                exam = QuestionPaperService.get_exam(exam_id)
+                QuestionPaperService.check_shared_paper(exam)
+                
+                questions_data = QuestionPaperService.build_paper(exam)
+                
+                payload = self.encode_json({'results': questions_data})
+                QuestionPaperCache.set(exam_id, version, payload)
+            
+            response = self.raw_json_response(payload)
+            response['X-Paper-Cache'] = cache_status
+            return response
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class AsyncQuestionListView(AsyncAuthenticatedAPIView):
+    
+    @async_condition(etag_func=aquestion_paper_etag)
+    async def get(self, request):
+        try:
+            exam_id = request.GET.get('exam_id')
+            if not exam_id:
+                return self.error_response('exam_id is required', 400)
+            
+            student_exam_id = request.GET.get('student_exam_id')
+            if student_exam_id:
+                exam = await QuestionPaperService.aget_exam(exam_id)
+                seed = await QuestionPaperService.aget_question_seed(request.student, exam, student_exam_id)
+                return self.success_response({'results': await QuestionPaperService.abuild_student_paper(exam, seed)})
             
-            exam_questions = (
-                ExamQuestion.objects
-                .select_related('question')
-                .filter(exam=exam, is_active=True, question__is_active=True)
-                .order_by('created_at')
-            )
+            version, payload = await sync_to_async(QuestionPaperCache.get)(exam_id)
+            cache_status = 'hit'
             
-            questions_data = ExamQuestionSerializer.to_dict_list(exam_questions)
+            if payload is None:
+                cache_status = 'miss'
+                exam = await QuestionPaperService.aget_exam(exam_id)
+                await QuestionPaperService.acheck_shared_paper(exam)
+                
+                questions_data = await QuestionPaperService.abuild_paper(exam)
+                
+                payload = self.encode_json({'results': questions_data})
+                await sync_to_async(QuestionPaperCache.set)(exam_id, version, payload)
             
-            return self.success_response({'results': questions_data})
+            response = self.raw_json_response(payload)
+            response['X-Paper-Cache'] = cache_status
+            return response
             
         except ExamAPIException as e:
             return self.error_response(e.message, e.status_code)
         except Exception as e:
             return self.handle_exception(e)
+
+
+class QuestionSearchView(StaffAPIView):
     
-    def _get_exam_by_id(self, exam_id: str) -> Exam:
+    def get(self, request):
         try:
-            return Exam.objects.get(id=exam_id, is_active=True)
-        except Exam.DoesNotExist:
-            raise ExamAPIException('Exam not found', 404)
\ No newline at end of file
+            query = request.GET.get('q', '').strip()
+            if not query:
+                return self.error_response('q is required', 400)
+            
+            questions = Question.objects.all()
+            if request.GET.get('include_inactive', '').lower() not in ('1', 'true', 'yes'):
+                questions = questions.filter(is_active=True)
+            if request.GET.get('category'):
+                questions = questions.filter(category=request.GET['category'])
+            
+            limit = QuestionSearch.parse_limit(request.GET.get('limit'))
+            results = QuestionSearch.ranked(questions, query)[:limit]
+            
+            return self.success_response({'results': QuestionSearchSerializer.to_dict_list(results)})
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
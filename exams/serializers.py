@@ -1,26 +1,31 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from .models import Exam
 
 
 class ExamSerializer:
     
-    @staticmethod
-    def to_dict(exam: Exam) -> Dict[str, Any]:
-        return {
-            'id': str(exam.id),
-            'exam_name': exam.exam_name,
-            'category': exam.category,
-            'description': exam.description,
-            'number_of_questions': exam.number_of_questions,
-            'passing_score': exam.passing_score,
-            'max_score': exam.max_score,
-            'exam_timer': exam.exam_timer,
-            'is_active': exam.is_active,
-            'created_at': exam.created_at.isoformat(),
-            'updated_at': exam.updated_at.isoformat(),
-            'created_by': exam.created_by_id,
-        }
+    # Serialized field names match the model fields they read, so a field
+    # list can be passed straight to ``QuerySet.only()``. UUIDs and datetimes
+    # are left as-is; ``core.json_backend`` encodes them.
+    FIELDS = {
+        'id': lambda exam: exam.id,
+        'exam_name': lambda exam: exam.exam_name,
+        'category': lambda exam: exam.category,
+        'description': lambda exam: exam.description,
+        'number_of_questions': lambda exam: exam.number_of_questions,
+        'passing_score': lambda exam: exam.passing_score,
+        'max_score': lambda exam: exam.max_score,
+        'exam_timer': lambda exam: exam.exam_timer,
+        'is_active': lambda exam: exam.is_active,
+        'created_at': lambda exam: exam.created_at,
+        'updated_at': lambda exam: exam.updated_at,
+        'created_by': lambda exam: exam.created_by_id,
+    }
     
     @classmethod
-    def to_dict_list(cls, exams: List[Exam]) -> List[Dict[str, Any]]:
-        return [cls.to_dict(exam) for exam in exams]
\ No newline at end of file
+    def to_dict(cls, exam: Exam, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return {field: cls.FIELDS[field](exam) for field in (fields or cls.FIELDS)}
+    
+    @classmethod
+    def to_dict_list(cls, exams: List[Exam], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return [cls.to_dict(exam, fields) for exam in exams]
@@ -0,0 +1,104 @@
+import base64
+import datetime as dt
+import uuid
+from typing import List, Optional, Sequence, Tuple
+from django.db.models import Q, QuerySet
+
+from core.exceptions import ValidationError
+from .models import Exam
+from .serializers import ExamSerializer
+
+
+class ExamCatalogService:
+    """Keyset-paginated listing of active exams, newest first."""
+    
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+    ORDERING = ('-created_at', '-id')
+    
+    @staticmethod
+    def encode_cursor(exam: Exam) -> str:
+        raw = f'{exam.created_at.isoformat()}|{exam.id}'
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[dt.datetime, uuid.UUID]:
+        try:
+            created_at, exam_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            return dt.datetime.fromisoformat(created_at), uuid.UUID(exam_id)
+        except (ValueError, UnicodeError):
+            raise ValidationError('Invalid cursor')
+    
+    @classmethod
+    def parse_fields(cls, fields: Optional[str]) -> Optional[List[str]]:
+        if not fields:
+            return None
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in requested if field not in ExamSerializer.FIELDS]
+        if unknown:
+            raise ValidationError(f'Unknown fields: {", ".join(unknown)}')
+        return requested
+    
+    @classmethod
+    def parse_limit(cls, limit: Optional[str]) -> int:
+        if not limit:
+            return cls.DEFAULT_LIMIT
+        try:
+            value = int(limit)
+        except ValueError:
+            raise ValidationError('limit must be a valid integer')
+        if value < 1:
+            raise ValidationError('limit must be a positive integer')
+        return min(value, cls.MAX_LIMIT)
+    
+    @classmethod
+    def catalog_queryset(
+        cls,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Sequence[str]] = None,
+    ) -> QuerySet:
+        """One page of the catalog plus one extra row to detect a following page."""
+        exams = Exam.objects.filter(is_active=True)
+        if category:
+            exams = exams.filter(category=category)
+        if search:
+            exams = exams.filter(exam_name__icontains=search)
+        if cursor:
+            created_at, exam_id = cls.decode_cursor(cursor)
+            exams = exams.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=exam_id))
+        if fields:
+            # The cursor always needs the ordering columns.
+            exams = exams.only(*{'id', 'created_at', *fields})
+        return exams.order_by(*cls.ORDERING)[:limit + 1]
+    
+    @classmethod
+    def paginate(cls, page: List[Exam], limit: int) -> Tuple[List[Exam], Optional[str]]:
+        next_cursor = cls.encode_cursor(page[limit - 1]) if len(page) > limit else None
+        return page[:limit], next_cursor
+    
+    @classmethod
+    def list_exams(
+        cls,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Exam], Optional[str]]:
+        page = list(cls.catalog_queryset(category, search, cursor, limit, fields))
+        return cls.paginate(page, limit)
+    
+    @classmethod
+    async def alist_exams(
+        cls,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Exam], Optional[str]]:
+        page = [exam async for exam in cls.catalog_queryset(category, search, cursor, limit, fields)]
+        return cls.paginate(page, limit)
@@ -0,0 +1,39 @@
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from .models import Exam, Question, ExamQuestion, QuestionAnswer
+from .question.cache import QuestionPaperCache
+from .question.search import QuestionSearch
+
+
+def _exam_ids_for_question(question_id):
+    return ExamQuestion.objects.filter(question_id=question_id).values_list('exam_id', flat=True)
+
+
+@receiver([post_save, post_delete], sender=Exam)
+def exam_changed(sender, instance, **kwargs):
+    QuestionPaperCache.bump([instance.id])
+
+
+@receiver([post_save, post_delete], sender=ExamQuestion)
+def exam_question_changed(sender, instance, **kwargs):
+    QuestionPaperCache.bump([instance.exam_id])
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, **kwargs):
+    QuestionPaperCache.bump(_exam_ids_for_question(instance.id))
+
+
+@receiver([post_save, post_delete], sender=QuestionAnswer)
+def question_answer_changed(sender, instance, **kwargs):
+    QuestionPaperCache.bump(_exam_ids_for_question(instance.question_id))
+
+
+@receiver(post_migrate)
+def install_question_search(sender, using, **kwargs):
+    # Also covers databases built without migrations (the test settings) and
+    # SQLite table rebuilds, which drop the FTS triggers.
+    if sender.label == 'exams':
+        QuestionSearch.install(connections[using])
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.exceptions import ValidationError
+from core.test_utils import BaseTestCase
+from .models import Exam
+from .services import ExamCatalogService
+
+
+class ExamCatalogServiceTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        base_time = timezone.now() - timedelta(days=1)
+        self.exams = [self.test_exam]
+        for i in range(6):
+            exam = Exam.objects.create(
+                exam_name=f'Catalog Exam {i}',
+                category='Maths' if i % 2 else 'Science',
+                description='Long description',
+                number_of_questions=3,
+                passing_score=60,
+                max_score=100,
+                created_by=self.test_user
+            )
+            self.exams.append(exam)
+        # Two exams share a timestamp so the id tiebreaker is exercised.
+        Exam.objects.filter(id__in=[e.id for e in self.exams[1:3]]).update(created_at=base_time)
+        Exam.objects.filter(id__in=[e.id for e in self.exams[3:]]).update(created_at=base_time - timedelta(hours=1))
+    
+    def _all_pages(self, **kwargs):
+        seen, cursor = [], None
+        while True:
+            page, cursor = ExamCatalogService.list_exams(cursor=cursor, limit=2, **kwargs)
+            seen.extend(exam.id for exam in page)
+            if cursor is None:
+                return seen
+    
+    def test_pages_cover_catalog_in_order_without_duplicates(self):
+        expected = list(Exam.objects.filter(is_active=True).order_by('-created_at', '-id').values_list('id', flat=True))
+        
+        self.assertEqual(self._all_pages(), expected)
+    
+    def test_category_filter(self):
+        ids = self._all_pages(category='Maths')
+        
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(set(Exam.objects.filter(id__in=ids).values_list('category', flat=True)), {'Maths'})
+    
+    def test_search_filter(self):
+        exams, next_cursor = ExamCatalogService.list_exams(search='catalog exam 4')
+        
+        self.assertEqual([exam.exam_name for exam in exams], ['Catalog Exam 4'])
+        self.assertIsNone(next_cursor)
+    
+    def test_projection_defers_unused_columns(self):
+        exams, _ = ExamCatalogService.list_exams(fields=['exam_name'])
+        
+        self.assertIn('description', exams[0].get_deferred_fields())
+        self.assertNotIn('exam_name', exams[0].get_deferred_fields())
+    
+    def test_page_query_count_is_constant(self):
+        _, cursor = ExamCatalogService.list_exams(limit=2)
+        
+        with self.assertNumQueries(1):
+            ExamCatalogService.list_exams(cursor=cursor, limit=2)
+    
+    def test_invalid_cursor(self):
+        with self.assertRaisesMessage(ValidationError, 'Invalid cursor'):
+            ExamCatalogService.list_exams(cursor='not-a-cursor')
+    
+    def test_parse_fields_rejects_unknown(self):
+        with self.assertRaisesMessage(ValidationError, 'Unknown fields: password'):
+            ExamCatalogService.parse_fields('exam_name,password')
+    
+    def test_parse_limit(self):
+        self.assertEqual(ExamCatalogService.parse_limit(None), ExamCatalogService.DEFAULT_LIMIT)
+        self.assertEqual(ExamCatalogService.parse_limit('5000'), ExamCatalogService.MAX_LIMIT)
+        with self.assertRaises(ValidationError):
+            ExamCatalogService.parse_limit('0')
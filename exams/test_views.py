@@ -1,8 +1,11 @@
-from django.test import TestCase
+import json
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
 from django.contrib.auth import get_user_model
 
 from core.test_utils import BaseTestCase
 from .models import Exam
+from .views import AsyncExamListView, ExamListView
 
 
 User = get_user_model()
@@ -154,4 +157,125 @@ class ExamListViewTest(BaseTestCase):
             self.assertIsInstance(exam['updated_at'], str)
             
             self.assertIsInstance(exam['id'], str)
-            self.assertGreater(len(exam['id']), 30)
\ No newline at end of file
+            self.assertGreater(len(exam['id']), 30)
+
+
+class ExamListConditionalGetTest(BaseTestCase):
+    
+    def test_response_carries_strong_etag(self):
+        response = self.client.get('/api/exams')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+    
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get('/api/exams')['ETag']
+        
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/exams', HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+    
+    def test_etag_changes_when_catalog_changes(self):
+        etag = self.client.get('/api/exams')['ETag']
+        
+        self.test_exam.exam_name = 'Renamed exam'
+        self.test_exam.save()
+        
+        response = self.client.get('/api/exams', HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_etag_changes_when_exam_deactivated(self):
+        Exam.objects.create(
+            exam_name='Second Exam',
+            category='Programming',
+            number_of_questions=3,
+            passing_score=60,
+            max_score=100,
+            created_by=self.test_user
+        )
+        etag = self.client.get('/api/exams')['ETag']
+        
+        Exam.objects.filter(id=self.test_exam.id).update(is_active=False)
+        
+        response = self.client.get('/api/exams', HTTP_IF_NONE_MATCH=etag)
+        
+        self.assertEqual(response.status_code, 200)
+
+
+class ExamListPaginationTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            Exam.objects.create(
+                exam_name=f'Paged Exam {i}',
+                category='Maths',
+                number_of_questions=3,
+                passing_score=60,
+                max_score=100,
+                created_by=self.test_user
+            )
+    
+    def test_limit_and_cursor(self):
+        first = self.client.get('/api/exams', {'limit': 3}).json()
+        
+        self.assertEqual(len(first['results']), 3)
+        self.assertIsNotNone(first['next_cursor'])
+        
+        second = self.client.get('/api/exams', {'limit': 3, 'cursor': first['next_cursor']}).json()
+        
+        self.assertEqual([exam['exam_name'] for exam in second['results']], ['Python Programming Test'])
+        self.assertIsNone(second['next_cursor'])
+    
+    def test_fields_projection(self):
+        response = self.client.get('/api/exams', {'fields': 'id,exam_name', 'category': 'Maths'})
+        
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(set(results[0].keys()), {'id', 'exam_name'})
+    
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/exams', {'cursor': '!!'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/exams', {'fields': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/exams', {'limit': 'abc'}).status_code, 400)
+
+
+class AsyncExamListViewTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+    
+    async def _get(self, params=None, headers=None):
+        request = self.factory.get('/api/exams', params or {}, headers=headers)
+        return await AsyncExamListView.as_view()(request)
+    
+    def test_view_is_async(self):
+        self.assertTrue(AsyncExamListView.view_is_async)
+    
+    async def test_matches_sync_listing(self):
+        request = RequestFactory().get('/api/exams', {'fields': 'id,exam_name'})
+        expected = await sync_to_async(ExamListView.as_view())(request)
+        
+        response = await self._get({'fields': 'id,exam_name'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        self.assertEqual(response['ETag'], expected['ETag'])
+    
+    async def test_matching_etag_returns_not_modified(self):
+        etag = (await self._get())['ETag']
+        
+        response = await self._get(headers={'If-None-Match': etag})
+        
+        self.assertEqual(response.status_code, 304)
+    
+    async def test_invalid_limit(self):
+        response = await self._get({'limit': 'abc'})
+        
+        self.assertEqual(response.status_code, 400)
@@ -1,17 +1,59 @@
-from core.base_views import BaseAPIView
-from .models import Exam
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from core.base_views import BaseAPIView, AsyncAPIView
+from core.decorators import async_condition
+from core.exceptions import ExamAPIException
+from .etags import aexam_list_etag, exam_list_etag
 from .serializers import ExamSerializer
+from .services import ExamCatalogService
 
 
 class ExamListView(BaseAPIView):
     
+    @method_decorator(condition(etag_func=exam_list_etag))
     def get(self, request):
         try:
-            exams = Exam.objects.filter(is_active=True).order_by('-created_at')
+            fields = ExamCatalogService.parse_fields(request.GET.get('fields'))
+            
+            exams, next_cursor = ExamCatalogService.list_exams(
+                category=request.GET.get('category'),
+                search=request.GET.get('search'),
+                cursor=request.GET.get('cursor'),
+                limit=ExamCatalogService.parse_limit(request.GET.get('limit')),
+                fields=fields,
+            )
+            
+            exam_data = ExamSerializer.to_dict_list(exams, fields)
+            
+            return self.success_response({'results': exam_data, 'next_cursor': next_cursor})
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class AsyncExamListView(AsyncAPIView):
+    
+    @async_condition(etag_func=aexam_list_etag)
+    async def get(self, request):
+        try:
+            fields = ExamCatalogService.parse_fields(request.GET.get('fields'))
+            
+            exams, next_cursor = await ExamCatalogService.alist_exams(
+                category=request.GET.get('category'),
+                search=request.GET.get('search'),
+                cursor=request.GET.get('cursor'),
+                limit=ExamCatalogService.parse_limit(request.GET.get('limit')),
+                fields=fields,
+            )
             
-            exam_data = ExamSerializer.to_dict_list(exams)
+            exam_data = ExamSerializer.to_dict_list(exams, fields)
             
-            return self.success_response({'results': exam_data})
+            return self.success_response({'results': exam_data, 'next_cursor': next_cursor})
             
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
         except Exception as e:
-            return self.handle_exception(e)
\ No newline at end of file
+            return self.handle_exception(e)
@@ -1,10 +1,12 @@
 from django.contrib import admin
+
+from core.admin import LargeTableAdminMixin
 from .models import Student, StudentExam, StudentExamResult
 from .forms import StudentAdminForm
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     form = StudentAdminForm
     list_display = (
         'id',
@@ -21,18 +23,24 @@ class StudentAdmin(admin.ModelAdmin):
 
 
 @admin.register(StudentExam)
-class StudentExamAdmin(admin.ModelAdmin):
+class StudentExamAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'student', 'exam', 'status', 'exam_result', 'total_score', 'max_exam_score', 'start_time', 'end_time', 'created_at')
     list_filter = ('status', 'exam_result', 'created_at')
+    list_select_related = ('student', 'exam')
+    raw_id_fields = ('student', 'exam')
     search_fields = ('student__first_name', 'student__last_name', 'exam__exam_name')
     ordering = ('-created_at',)
 
 
 @admin.register(StudentExamResult)
-class StudentExamResultAdmin(admin.ModelAdmin):
+class StudentExamResultAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'student_exam', 'exam_question', 'answer', 'is_correct', 'score')
     list_filter = ('is_correct',)
+    list_select_related = ('student_exam', 'exam_question', 'answer')
+    raw_id_fields = ('student_exam', 'exam_question', 'answer')
     search_fields = ('student_exam__student__first_name', 'student_exam__student__last_name')
-    ordering = ('-student_exam__created_at',)
+    # Walks the (student_exam, exam_question) unique index instead of sorting
+    # the table by a joined column.
+    ordering = ('student_exam', 'exam_question')
 
 # Register your models here.
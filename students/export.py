@@ -0,0 +1,239 @@
+"""Streaming export of stored answers joined to student, exam, question and answer.
+
+Rows are read in keyset pages ordered by ``(updated_at, id)``, so an export
+holds at most one page in memory and can resume after the last row it
+wrote. Result ids are random UUIDs, but every insert and update moves a
+result to the end of that order, so a resumed export picks up new answers
+and changed rows as well. Pages are separate queries, which keeps memory
+flat even where server-side cursors are disabled
+(``DISABLE_SERVER_SIDE_CURSORS`` behind a transaction pooler).
+"""
+import csv
+import datetime as dt
+import io
+import uuid
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core import json_backend
+from core.exceptions import ValidationError
+from .models import StudentExamResult
+
+
+EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+
+class ResultExporter:
+    """One export of ``StudentExamResult`` rows as CSV or JSON Lines, optionally gzipped.
+
+    ``since`` is inclusive and ``until`` exclusive; both apply to the
+    attempt's ``start_time``. ``after`` takes the ``resume_token`` of an
+    earlier export and continues behind its last row; a row updated since
+    then is written again, so consumers keep the latest copy per
+    ``result_id``. Rows written in the last ``RESULT_EXPORT_SETTLE_SECONDS``
+    are left for the next export, because a transaction still open when the
+    export starts can commit with an earlier ``updated_at``.
+    """
+
+    COLUMNS = (
+        ('result_id', 'id'),
+        ('student_exam_id', 'student_exam_id'),
+        ('student_id', 'student_exam__student_id'),
+        ('student_email', 'student_exam__student__email_address'),
+        ('student_first_name', 'student_exam__student__first_name'),
+        ('student_last_name', 'student_exam__student__last_name'),
+        ('exam_id', 'student_exam__exam_id'),
+        ('exam_name', 'student_exam__exam__exam_name'),
+        ('exam_category', 'student_exam__exam__category'),
+        ('attempt_status', 'student_exam__status'),
+        ('attempt_start_time', 'student_exam__start_time'),
+        ('attempt_end_time', 'student_exam__end_time'),
+        ('attempt_total_score', 'student_exam__total_score'),
+        ('exam_question_id', 'exam_question_id'),
+        ('question_id', 'exam_question__question_id'),
+        ('question_name', 'exam_question__question__question_name'),
+        ('answer_id', 'answer_id'),
+        ('answer', 'answer__answer'),
+        ('is_correct', 'is_correct'),
+        ('score', 'score'),
+        ('result_updated_at', 'updated_at'),
+    )
+    UPDATED_AT = len(COLUMNS) - 1
+    FORMATS = {
+        'csv': ('text/csv', 'csv'),
+        'jsonl': ('application/x-ndjson', 'jsonl'),
+    }
+
+    def __init__(
+        self,
+        file_format: str = 'csv',
+        exam_id=None,
+        since=None,
+        until=None,
+        after=None,
+        limit: Optional[int] = None,
+        chunk_size: int = 2000,
+        compress: bool = False,
+    ):
+        if file_format not in self.FORMATS:
+            raise ValidationError(f'format must be one of: {", ".join(self.FORMATS)}')
+        self.file_format = file_format
+        self.exam_id = self._parse_uuid(exam_id, 'exam_id')
+        self.since = self._parse_moment(since, 'since')
+        self.until = self._parse_moment(until, 'until')
+        self.watermark = self._parse_token(after)
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self.upto = timezone.now() - dt.timedelta(seconds=getattr(settings, 'RESULT_EXPORT_SETTLE_SECONDS', 5))
+        self.exported = 0
+
+    @staticmethod
+    def _parse_uuid(value, name: str) -> Optional[uuid.UUID]:
+        if value in (None, ''):
+            return None
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise ValidationError(f'{name} must be a valid UUID')
+
+    @staticmethod
+    def _parse_token(value) -> Optional[Tuple[dt.datetime, uuid.UUID]]:
+        if value in (None, ''):
+            return None
+        micros, _, result_id = str(value).partition(':')
+        try:
+            updated_at = EPOCH + dt.timedelta(microseconds=int(micros))
+            return updated_at, uuid.UUID(result_id)
+        except (ValueError, OverflowError):
+            raise ValidationError('after must be a resume token printed by an earlier export')
+
+    @property
+    def resume_token(self) -> Optional[str]:
+        """``after`` value that continues behind the last row written, or ``None`` before any row."""
+        if self.watermark is None:
+            return None
+        updated_at, result_id = self.watermark
+        return f'{(updated_at - EPOCH) // dt.timedelta(microseconds=1)}:{result_id}'
+
+    @staticmethod
+    def parse_limit(value) -> Optional[int]:
+        if value in (None, ''):
+            return None
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError('limit must be a valid integer')
+        if limit < 1:
+            raise ValidationError('limit must be a positive integer')
+        return limit
+
+    @staticmethod
+    def _parse_moment(value, name: str) -> Optional[dt.datetime]:
+        """Accept an ISO date or datetime; naive values are in the current time zone."""
+        if value in (None, '') or isinstance(value, dt.datetime):
+            moment = value or None
+        else:
+            try:
+                moment = parse_datetime(value)
+                if moment is None:
+                    day = parse_date(value)
+                    moment = dt.datetime.combine(day, dt.time.min) if day else None
+            except ValueError:
+                moment = None
+            if moment is None:
+                raise ValidationError(f'{name} must be an ISO date or datetime')
+        if moment is not None and timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+    @property
+    def content_type(self) -> str:
+        return 'application/gzip' if self.compress else self.FORMATS[self.file_format][0]
+
+    @property
+    def filename(self) -> str:
+        name = f'exam-results.{self.FORMATS[self.file_format][1]}'
+        return f'{name}.gz' if self.compress else name
+
+    def queryset(self):
+        results = StudentExamResult.objects.filter(updated_at__lt=self.upto)
+        if self.exam_id:
+            results = results.filter(student_exam__exam_id=self.exam_id)
+        if self.since:
+            results = results.filter(student_exam__start_time__gte=self.since)
+        if self.until:
+            results = results.filter(student_exam__start_time__lt=self.until)
+        return results.order_by('updated_at', 'pk').values_list(*(path for _, path in self.COLUMNS))
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Every matching row in ``(updated_at, id)`` order, one keyset page per query."""
+        queryset = self.queryset()
+        while self.limit is None or self.exported < self.limit:
+            page_size = self.chunk_size if self.limit is None else min(self.chunk_size, self.limit - self.exported)
+            page = queryset
+            if self.watermark is not None:
+                updated_at, result_id = self.watermark
+                page = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=result_id))
+            fetched = 0
+            for row in page[:page_size].iterator(chunk_size=page_size):
+                fetched += 1
+                self.exported += 1
+                self.watermark = (row[self.UPDATED_AT], row[0])
+                yield row
+            if fetched < page_size:
+                return
+
+    @staticmethod
+    def _csv_value(value) -> Any:
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, dt.datetime):
+            return value.isoformat()
+        return value
+
+    def _encode_pages(self) -> Iterator[bytes]:
+        names = [name for name, _ in self.COLUMNS]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        lines: List[bytes] = []
+
+        if self.file_format == 'csv':
+            writer.writerow(names)
+
+        for row in self.rows():
+            if self.file_format == 'csv':
+                writer.writerow([self._csv_value(value) for value in row])
+            else:
+                lines.append(json_backend.dumps(dict(zip(names, row))))
+                lines.append(b'\n')
+            if self.exported % self.chunk_size == 0:
+                yield self._drain(buffer, lines)
+        yield self._drain(buffer, lines)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO, lines: List[bytes]) -> bytes:
+        data = buffer.getvalue().encode('utf-8') + b''.join(lines)
+        buffer.seek(0)
+        buffer.truncate()
+        lines.clear()
+        return data
+
+    def stream(self) -> Iterator[bytes]:
+        """Encoded (and, if requested, gzipped) output, about one page per chunk."""
+        if not self.compress:
+            yield from (data for data in self._encode_pages() if data)
+            return
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        for data in self._encode_pages():
+            compressed = compressor.compress(data)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
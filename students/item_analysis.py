@@ -0,0 +1,208 @@
+"""Classical item analysis over finished attempts.
+
+Each exam's results are streamed once into flat NumPy index arrays; every
+statistic is then a ``bincount`` over those arrays instead of a query or a
+Python loop per question.
+"""
+import uuid
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from exams.models import ExamQuestion, QuestionAnswer
+from .models import ItemStatistic, StudentExam, StudentExamResult
+from .services import ItemStatisticsService
+
+
+class ItemAnalysisService:
+    """Computes difficulty, discrimination and distractor rates per exam question.
+
+    * difficulty is the share of finished attempts that answered correctly
+      (the classical p-value); an unanswered question counts as incorrect;
+    * discrimination is the point-biserial correlation between answering
+      correctly and the attempt's total score;
+    * each answer's rate is the share of finished attempts that picked it.
+    """
+
+    @staticmethod
+    def _index(values) -> Dict[Any, int]:
+        return {value: position for position, value in enumerate(values)}
+
+    @staticmethod
+    def _load_results(
+        exam_id,
+        attempt_index: Dict[uuid.UUID, int],
+        item_index: Dict[uuid.UUID, int],
+        answer_index: Dict[uuid.UUID, int],
+        chunk_size: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Stream the exam's results into ``(attempt, item, answer, correct, score)`` arrays.
+
+        The indexes are read by earlier queries, so on a live exam results can
+        arrive for attempts finished, questions linked or answers added since;
+        those rows are skipped, keeping the statistics consistent with the
+        indexed attempts.
+        """
+        rows = (
+            StudentExamResult.objects
+            .filter(student_exam__exam_id=exam_id, student_exam__status='done')
+            .values_list('student_exam_id', 'exam_question_id', 'answer_id', 'is_correct', 'score')
+            .iterator(chunk_size=chunk_size)
+        )
+
+        chunks = []
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                break
+            batch = [
+                row for row in batch
+                if row[0] in attempt_index and row[1] in item_index and row[2] in answer_index
+            ]
+            if not batch:
+                continue
+            attempt_ids, item_ids, answer_ids, correct, scores = zip(*batch)
+            count = len(batch)
+            chunks.append((
+                np.fromiter(map(attempt_index.__getitem__, attempt_ids), dtype=np.int64, count=count),
+                np.fromiter(map(item_index.__getitem__, item_ids), dtype=np.int64, count=count),
+                np.fromiter(map(answer_index.__getitem__, answer_ids), dtype=np.int64, count=count),
+                np.fromiter(correct, dtype=np.float64, count=count),
+                np.fromiter(scores, dtype=np.float64, count=count),
+            ))
+
+        if not chunks:
+            empty_index = np.empty(0, dtype=np.int64)
+            return empty_index, empty_index, empty_index, np.empty(0), np.empty(0)
+        return tuple(np.concatenate(column) for column in zip(*chunks))
+
+    @staticmethod
+    def compute(
+        attempts: int,
+        items: int,
+        answers: int,
+        attempt: np.ndarray,
+        item: np.ndarray,
+        answer: np.ndarray,
+        correct: np.ndarray,
+        score: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """Vectorized statistics for ``items`` questions over ``attempts`` attempts.
+
+        Undefined values (no attempts, no score variance, or a question that
+        everyone or no one answered correctly) are returned as NaN.
+        """
+        responses = np.bincount(item, minlength=items)
+        correct_counts = np.bincount(item, weights=correct, minlength=items)
+        answer_counts = np.bincount(answer, minlength=answers)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            difficulty = correct_counts / attempts if attempts else np.full(items, np.nan)
+
+            totals = np.bincount(attempt, weights=score, minlength=attempts)
+            mean = totals.mean() if attempts else np.nan
+            std = totals.std() if attempts else np.nan
+            # r_pb = (M1 - M) / s * sqrt(p / q), with M1 the mean total of the
+            # attempts that answered the question correctly.
+            correct_totals = np.bincount(item, weights=correct * totals[attempt], minlength=items)
+            discrimination = (
+                (correct_totals / correct_counts - mean) / std
+                * np.sqrt(difficulty / (1 - difficulty))
+            )
+            defined = (std > 0) & (difficulty > 0) & (difficulty < 1)
+            discrimination = np.where(defined, discrimination, np.nan)
+
+            answer_rates = answer_counts / attempts if attempts else np.full(answers, np.nan)
+
+        return {
+            'responses': responses,
+            'correct': correct_counts.astype(np.int64),
+            'difficulty': difficulty,
+            'discrimination': discrimination,
+            'answer_counts': answer_counts,
+            'answer_rates': answer_rates,
+        }
+
+    @staticmethod
+    def _float(value) -> Optional[float]:
+        return None if np.isnan(value) else round(float(value), 6)
+
+    @classmethod
+    def analyze_exam(cls, exam_id, chunk_size: int = 10000) -> int:
+        """Recompute and store the statistics of every question of ``exam_id``."""
+        attempt_ids = (
+            StudentExam.objects
+            .filter(exam_id=exam_id, status='done')
+            .values_list('id', flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        attempt_index = cls._index(attempt_ids)
+
+        exam_questions = list(
+            ExamQuestion.objects.filter(exam_id=exam_id).order_by('created_at', 'pk').values_list('id', 'question_id')
+        )
+        item_index = cls._index(exam_question_id for exam_question_id, _ in exam_questions)
+        item_of_question = {question_id: item_index[exam_question_id] for exam_question_id, question_id in exam_questions}
+
+        answer_rows = list(
+            QuestionAnswer.objects
+            .filter(question_id__in=item_of_question.keys())
+            .order_by('created_at', 'pk')
+            .values_list('id', 'question_id', 'is_correct')
+        )
+        answer_index = cls._index(answer_id for answer_id, _, _ in answer_rows)
+
+        arrays = cls._load_results(exam_id, attempt_index, item_index, answer_index, chunk_size)
+        stats = cls.compute(len(attempt_index), len(item_index), len(answer_index), *arrays)
+
+        answer_rates: List[List[Dict[str, Any]]] = [[] for _ in exam_questions]
+        for position, (answer_id, question_id, is_correct) in enumerate(answer_rows):
+            answer_rates[item_of_question[question_id]].append({
+                'answer_id': str(answer_id),
+                'is_correct': is_correct,
+                'selections': int(stats['answer_counts'][position]),
+                'rate': cls._float(stats['answer_rates'][position]),
+            })
+
+        computed_at = timezone.now()
+        statistics = [
+            ItemStatistic(
+                exam_id=exam_id,
+                exam_question_id=exam_question_id,
+                attempts=len(attempt_index),
+                responses=int(stats['responses'][position]),
+                correct=int(stats['correct'][position]),
+                difficulty=cls._float(stats['difficulty'][position]),
+                discrimination=cls._float(stats['discrimination'][position]),
+                answer_rates=answer_rates[position],
+                computed_at=computed_at,
+            )
+            for position, (exam_question_id, _) in enumerate(exam_questions)
+        ]
+
+        with transaction.atomic():
+            ItemStatistic.objects.filter(exam_id=exam_id).delete()
+            ItemStatistic.objects.bulk_create(statistics)
+            transaction.on_commit(lambda: ItemStatisticsService.invalidate(exam_id))
+        return len(statistics)
+
+    @classmethod
+    def analyze(cls, exam_id=None, chunk_size: int = 10000, progress=None) -> Dict[str, int]:
+        """Analyze ``exam_id``, or every exam with a finished attempt."""
+        if exam_id is not None:
+            exam_ids = [exam_id]
+        else:
+            exam_ids = list(
+                StudentExam.objects.filter(status='done').values_list('exam_id', flat=True).distinct().order_by('exam_id')
+            )
+
+        items = 0
+        for analyzed_exam_id in exam_ids:
+            analyzed = cls.analyze_exam(analyzed_exam_id, chunk_size=chunk_size)
+            items += analyzed
+            if progress is not None:
+                progress(analyzed_exam_id, analyzed)
+        return {'exams': len(exam_ids), 'items': items}
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from students.item_analysis import ItemAnalysisService
+
+
+class Command(BaseCommand):
+    help = 'Recompute difficulty, discrimination and answer rates for exam questions from finished attempts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', dest='exam_id', help='Analyze only this exam.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=getattr(settings, 'ITEM_ANALYSIS_CHUNK_SIZE', 10000),
+            help='Result rows fetched per database round trip.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        def report(exam_id, items):
+            self.stdout.write(f'Exam {exam_id}: {items} questions analyzed')
+
+        totals = ItemAnalysisService.analyze(
+            exam_id=options['exam_id'],
+            chunk_size=options['chunk_size'],
+            progress=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Analyzed {totals["items"]} questions across {totals["exams"]} exams.'
+        ))
@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from students.services import ExamExpiryService
+
+
+class Command(BaseCommand):
+    help = 'Complete in-progress attempts whose exam timer has run out.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'EXAM_EXPIRY_BATCH_SIZE', 500),
+            help='Attempts closed per transaction.'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running, sweeping every this many seconds (0 sweeps once).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            swept = ExamExpiryService.expire_attempts(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Expired {swept["attempts"]} attempts across {swept["exams"]} exams.'
+            ))
+            if not options['interval']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
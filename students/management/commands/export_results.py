@@ -0,0 +1,50 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exceptions import ValidationError
+from students.export import ResultExporter
+
+
+class Command(BaseCommand):
+    help = 'Stream stored answers joined to student, exam, question and answer to a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='File to write; "-" writes to stdout.')
+        parser.add_argument('--format', dest='file_format', choices=sorted(ResultExporter.FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output.')
+        parser.add_argument('--exam', dest='exam_id', help='Export only this exam.')
+        parser.add_argument('--since', help='Attempts started at or after this ISO date or datetime.')
+        parser.add_argument('--until', help='Attempts started before this ISO date or datetime.')
+        parser.add_argument('--after', help='Resume behind the last row of an earlier run, using the token it printed.')
+        parser.add_argument('--limit', type=int, help='Stop after this many rows.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per query.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        try:
+            exporter = ResultExporter(
+                file_format=options['file_format'],
+                exam_id=options['exam_id'],
+                since=options['since'],
+                until=options['until'],
+                after=options['after'],
+                limit=ResultExporter.parse_limit(options['limit']),
+                chunk_size=options['chunk_size'],
+                compress=options['gzip'],
+            )
+        except ValidationError as e:
+            raise CommandError(e.message)
+
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for data in exporter.stream():
+                output.write(data)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        # Progress goes to stderr so stdout can carry the export itself.
+        self.stderr.write(f'Exported {exporter.exported} rows.')
+        if exporter.resume_token is not None:
+            self.stderr.write(f'Resume with --after {exporter.resume_token}')
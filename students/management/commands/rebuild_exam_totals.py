@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from students.models import StudentExam
+from students.services import ExamCompletionService
+
+
+class Command(BaseCommand):
+    help = 'Recompute StudentExam.total_score from the stored answer results to repair drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', dest='exam_id', help='Only rebuild attempts of this exam.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Attempts updated per transaction.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        attempts = StudentExam.objects.order_by('pk')
+        if options['exam_id']:
+            attempts = attempts.filter(exam_id=options['exam_id'])
+
+        checked = repaired = 0
+        last_pk = None
+        while True:
+            batch = attempts if last_pk is None else attempts.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                repaired += ExamCompletionService.rebuild_totals(StudentExam.objects.filter(pk__in=pks))
+            checked += len(pks)
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} attempts, repaired {repaired} drifted totals.'
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from exams.models import Exam
+from students.services import LeaderboardService
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-exam score histograms behind leaderboards and completion ranks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', dest='exam_id', help='Rebuild only this exam.')
+
+    def handle(self, *args, **options):
+        if options['exam_id']:
+            exam_ids = [options['exam_id']]
+        else:
+            exam_ids = Exam.objects.order_by('pk').values_list('pk', flat=True)
+
+        rebuilt = 0
+        for exam_id in exam_ids:
+            LeaderboardService.rebuild([exam_id])
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt leaderboards for {rebuilt} exams.'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from students.models import Student
+from students.services import ResultSummaryService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-student result summaries behind /api/results and /api/dashboard.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Students rebuilt per transaction.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        students = Student.objects.order_by('pk')
+
+        rebuilt = 0
+        last_pk = None
+        while True:
+            batch = students if last_pk is None else students.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            ResultSummaryService.refresh(pks)
+            rebuilt += len(pks)
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt result summaries for {rebuilt} students.'))
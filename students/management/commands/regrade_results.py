@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from students.services import RegradeService
+
+
+class Command(BaseCommand):
+    help = 'Re-apply the current answer key and question scores to stored results and attempt totals.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exam', dest='exam_id', help='Regrade results of this exam.')
+        parser.add_argument('--question', dest='question_id', help='Regrade results of this question in every exam.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Attempts regraded per transaction.')
+        parser.add_argument('--start-after', help='Resume after this attempt id, as printed by an earlier run.')
+
+    def handle(self, *args, **options):
+        if not options['exam_id'] and not options['question_id']:
+            raise CommandError('Pass --exam and/or --question.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+
+        def report(totals):
+            self.stdout.write(
+                f'Chunk {totals["chunks"]}: {totals["results"]} results changed, '
+                f'{totals["attempts"]} attempts re-totalled, through attempt {totals["last_attempt_id"]}'
+            )
+
+        totals = RegradeService.regrade(
+            exam_id=options['exam_id'],
+            question_id=options['question_id'],
+            chunk_size=options['chunk_size'],
+            start_after=options['start_after'],
+            progress=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Regraded in {totals["chunks"]} chunks: {totals["results"]} results changed, '
+            f'{totals["attempts"]} attempts re-totalled.'
+        ))
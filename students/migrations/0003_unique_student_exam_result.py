@@ -0,0 +1,36 @@
+# Generated by Django 4.2.24 on 2026-10-17 02:51
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicate_results(apps, schema_editor):
+    StudentExamResult = apps.get_model('students', 'StudentExamResult')
+    duplicates = (
+        StudentExamResult.objects
+        .values('student_exam_id', 'exam_question_id')
+        .annotate(copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for row in duplicates.iterator():
+        rows = StudentExamResult.objects.filter(
+            student_exam_id=row['student_exam_id'],
+            exam_question_id=row['exam_question_id'],
+        )
+        extra_ids = list(rows.values_list('id', flat=True)[1:])
+        rows.filter(id__in=extra_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_studentexam_studentexamresult_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_results, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='studentexamresult',
+            constraint=models.UniqueConstraint(fields=('student_exam', 'exam_question'), name='unique_student_exam_question_result'),
+        ),
+    ]
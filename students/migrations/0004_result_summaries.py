@@ -0,0 +1,58 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_exam_catalog_keyset_index'),
+        ('students', '0003_unique_student_exam_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentCategorySummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('category', models.CharField(max_length=100)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('passes', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('max_score_sum', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_summaries', to='students.student')),
+            ],
+            options={
+                'db_table': 'student_category_summaries',
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentExamSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('passes', models.PositiveIntegerField(default=0)),
+                ('best_score', models.SmallIntegerField(default=0)),
+                ('latest_score', models.SmallIntegerField(default=0)),
+                ('latest_result', models.CharField(blank=True, choices=[('pass', 'Pass'), ('fail', 'Fail')], max_length=10, null=True)),
+                ('latest_completed_at', models.DateTimeField(blank=True, null=True)),
+                ('max_score', models.SmallIntegerField(default=0)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_summaries', to='exams.exam')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_summaries', to='students.student')),
+            ],
+            options={
+                'db_table': 'student_exam_summaries',
+                'indexes': [models.Index(fields=['student', '-latest_completed_at'], name='student_summary_latest_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentexamsummary',
+            constraint=models.UniqueConstraint(fields=('student', 'exam'), name='unique_student_exam_summary'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentcategorysummary',
+            constraint=models.UniqueConstraint(fields=('student', 'category'), name='unique_student_category_summary'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_exam_catalog_keyset_index'),
+        ('students', '0004_result_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemStatistic',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('difficulty', models.FloatField(blank=True, null=True)),
+                ('discrimination', models.FloatField(blank=True, null=True)),
+                ('answer_rates', models.JSONField(blank=True, default=list)),
+                ('computed_at', models.DateTimeField()),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_statistics', to='exams.exam')),
+                ('exam_question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistic', to='exams.examquestion')),
+            ],
+            options={
+                'db_table': 'item_statistics',
+                'indexes': [models.Index(fields=['exam'], name='item_statis_exam_id_f4e1bd_idx')],
+            },
+        ),
+    ]
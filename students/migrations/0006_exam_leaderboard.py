@@ -0,0 +1,40 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_exam_catalog_keyset_index'),
+        ('students', '0005_item_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamScoreBucket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('score', models.SmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'exam_score_buckets',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='studentexam',
+            index=models.Index(fields=['exam', 'status', '-total_score'], name='student_exam_leaderboard_idx'),
+        ),
+        migrations.AddField(
+            model_name='examscorebucket',
+            name='exam',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_buckets', to='exams.exam'),
+        ),
+        migrations.AddConstraint(
+            model_name='examscorebucket',
+            constraint=models.UniqueConstraint(fields=('exam', 'score'), name='unique_exam_score_bucket'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.24 on 2026-10-17 03:57
+
+from django.db import migrations, models
+
+from core.db.indexes import add_index_concurrently
+from core.db.trigram import trigram_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built CONCURRENTLY, which cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('students', '0006_exam_leaderboard'),
+    ]
+
+    operations = [
+        add_index_concurrently(
+            'students', 'studentexam',
+            models.Index(fields=['-created_at'], name='student_exams_created_idx'),
+        ),
+        trigram_search_indexes('students', ['first_name', 'last_name', 'email_address', 'mobile_number']),
+    ]
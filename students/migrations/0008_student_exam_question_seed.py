@@ -0,0 +1,18 @@
+# Generated by Django 4.2.24 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_admin_large_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentexam',
+            name='question_seed',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.24 on 2026-10-17 05:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+from core.db.indexes import add_index_concurrently
+
+
+class Migration(migrations.Migration):
+
+    # The index is built CONCURRENTLY, which cannot run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ('students', '0008_student_exam_question_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentexamresult',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        add_index_concurrently(
+            'students', 'studentexamresult',
+            models.Index(fields=['updated_at', 'id'], name='student_exam_results_sync_idx'),
+        ),
+    ]
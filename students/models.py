@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router
 from django.contrib.auth.hashers import make_password, check_password
 import uuid
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -26,6 +26,19 @@ class Student(models.Model):
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def deferred(cls, student_id) -> 'Student':
+        """Return an instance holding only the primary key; other columns load on first access."""
+        return cls.from_db(router.db_for_read(cls), ['id'], [student_id])
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Reading one deferred column loads all of them, so a deferred
+        # student costs at most one query however many fields a view reads.
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and deferred_fields and set(fields) <= deferred_fields:
+            fields = deferred_fields
+        super().refresh_from_db(using=using, fields=fields)
+
     def set_password(self, raw_password: str) -> None:
         self.password = make_password(raw_password)
 
@@ -64,6 +77,9 @@ class StudentExam(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(10000)],
         default=0
     )
+    # Picks this attempt's questions and answer order; null for attempts that
+    # predate per-attempt papers, which see every question.
+    question_seed = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,6 +89,8 @@ class StudentExam(models.Model):
             models.Index(fields=['student']),
             models.Index(fields=['exam']),
             models.Index(fields=['status']),
+            models.Index(fields=['exam', 'status', '-total_score'], name='student_exam_leaderboard_idx'),
+            models.Index(fields=['-created_at'], name='student_exams_created_idx'),
         ]
 
     def __str__(self) -> str:
@@ -89,15 +107,111 @@ class StudentExamResult(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(10000)],
         default=0
     )
+    # Set on every insert and update, including the raw upserts and regrades
+    # in students.services; result exports resume on (updated_at, id).
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'student_exam_results'
         indexes = [
             models.Index(fields=['student_exam']),
             models.Index(fields=['exam_question']),
+            models.Index(fields=['updated_at', 'id'], name='student_exam_results_sync_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student_exam', 'exam_question'],
+                name='unique_student_exam_question_result',
+            ),
         ]
 
     def __str__(self) -> str:
         return f"StudentExamResult({self.student_exam_id}, {self.exam_question_id})"
 
+
+class StudentExamSummary(models.Model):
+    """Per student and exam rollup of finished attempts, maintained by ``ResultSummaryService``."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='exam_summaries')
+    exam = models.ForeignKey('exams.Exam', on_delete=models.CASCADE, related_name='student_summaries')
+    attempts = models.PositiveIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    best_score = models.SmallIntegerField(default=0)
+    latest_score = models.SmallIntegerField(default=0)
+    latest_result = models.CharField(max_length=10, choices=StudentExam.EXAM_RESULT_CHOICES, null=True, blank=True)
+    latest_completed_at = models.DateTimeField(null=True, blank=True)
+    max_score = models.SmallIntegerField(default=0)
+
+    class Meta:
+        db_table = 'student_exam_summaries'
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'exam'], name='unique_student_exam_summary'),
+        ]
+        indexes = [
+            models.Index(fields=['student', '-latest_completed_at'], name='student_summary_latest_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"StudentExamSummary({self.student_id}, {self.exam_id})"
+
+
+class StudentCategorySummary(models.Model):
+    """Per student and exam category totals of finished attempts."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='category_summaries')
+    category = models.CharField(max_length=100)
+    attempts = models.PositiveIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    max_score_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'student_category_summaries'
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'category'], name='unique_student_category_summary'),
+        ]
+
+    def __str__(self) -> str:
+        return f"StudentCategorySummary({self.student_id}, {self.category})"
+
+
+class ExamScoreBucket(models.Model):
+    """Number of finished attempts of an exam that ended on ``score``, maintained by ``LeaderboardService``."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    exam = models.ForeignKey('exams.Exam', on_delete=models.CASCADE, related_name='score_buckets')
+    score = models.SmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'exam_score_buckets'
+        constraints = [
+            models.UniqueConstraint(fields=['exam', 'score'], name='unique_exam_score_bucket'),
+        ]
+
+    def __str__(self) -> str:
+        return f"ExamScoreBucket({self.exam_id}, {self.score})"
+
+
+class ItemStatistic(models.Model):
+    """Classical item analysis of one exam question over finished attempts."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    exam = models.ForeignKey('exams.Exam', on_delete=models.CASCADE, related_name='item_statistics')
+    exam_question = models.OneToOneField('exams.ExamQuestion', on_delete=models.CASCADE, related_name='statistic')
+    attempts = models.PositiveIntegerField(default=0)
+    responses = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    difficulty = models.FloatField(null=True, blank=True)
+    discrimination = models.FloatField(null=True, blank=True)
+    answer_rates = models.JSONField(default=list, blank=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'item_statistics'
+        indexes = [
+            models.Index(fields=['exam']),
+        ]
+
+    def __str__(self) -> str:
+        return f"ItemStatistic({self.exam_question_id})"
+
 # Create your models here.
@@ -1,5 +1,5 @@
 from typing import Dict, Any, List
-from .models import Student, StudentExam, StudentExamResult
+from .models import ItemStatistic, Student, StudentCategorySummary, StudentExam, StudentExamResult, StudentExamSummary
 from exams.models import Exam, Question, ExamQuestion, QuestionAnswer
 
 
@@ -70,7 +70,9 @@ class ExamQuestionSerializer:
     @staticmethod
     def to_dict(exam_question: ExamQuestion) -> Dict[str, Any]:
         question = exam_question.question
-        answers = QuestionAnswer.objects.filter(question=question, is_active=True)
+        answers = getattr(question, 'active_answers', None)
+        if answers is None:
+            answers = QuestionAnswer.objects.filter(question=question, is_active=True)
         
         return {
             'id': str(question.id),
@@ -108,9 +110,9 @@ class StudentExamResultSerializer:
     def to_dict(result: StudentExamResult) -> Dict[str, Any]:
         return {
             'result_id': str(result.id),
-            'student_exam_id': str(result.student_exam.id),
-            'exam_question_id': str(result.exam_question.id),
-            'answer_id': str(result.answer.id),
+            'student_exam_id': str(result.student_exam_id),
+            'exam_question_id': str(result.exam_question_id),
+            'answer_id': str(result.answer_id),
             'score': result.score,
             'is_correct': result.is_correct,
         }
@@ -123,4 +125,120 @@ class ExamCompletionSerializer:
         return {
             'student_exam_id': str(student_exam_id),
             **completion_data
-        }
\ No newline at end of file
+        }
+
+
+class BatchSubmissionSerializer:
+    
+    ITEM_FIELDS = ('exam_question_id', 'answer_id', 'status', 'detail', 'result_id', 'is_correct', 'score')
+    
+    @classmethod
+    def to_dict(cls, student_exam_id: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results = [
+            {field: item[field] for field in cls.ITEM_FIELDS if field in item}
+            for item in items
+        ]
+        return {
+            'student_exam_id': str(student_exam_id),
+            'submitted': sum(1 for item in items if item['status'] in ('created', 'updated')),
+            'failed': sum(1 for item in items if item['status'] == 'error'),
+            'results': results,
+        }
+
+
+class ExamSummarySerializer:
+    
+    @staticmethod
+    def to_dict(summary: StudentExamSummary) -> Dict[str, Any]:
+        return {
+            'exam_id': str(summary.exam_id),
+            'exam_name': summary.exam.exam_name,
+            'category': summary.exam.category,
+            'attempts': summary.attempts,
+            'passes': summary.passes,
+            'best_score': summary.best_score,
+            'latest_score': summary.latest_score,
+            'latest_result': summary.latest_result,
+            'latest_completed_at': summary.latest_completed_at.isoformat() if summary.latest_completed_at else None,
+            'max_score': summary.max_score,
+        }
+    
+    @classmethod
+    def to_dict_list(cls, summaries: List[StudentExamSummary]) -> List[Dict[str, Any]]:
+        return [cls.to_dict(summary) for summary in summaries]
+
+
+class DashboardSerializer:
+    
+    @staticmethod
+    def _percentage(score_sum: int, max_score_sum: int) -> float:
+        return round(score_sum * 100 / max_score_sum, 2) if max_score_sum else 0.0
+    
+    @classmethod
+    def to_dict(cls, categories: List[StudentCategorySummary]) -> Dict[str, Any]:
+        attempts = sum(category.attempts for category in categories)
+        passes = sum(category.passes for category in categories)
+        return {
+            'overall': {
+                'attempts': attempts,
+                'passes': passes,
+                'pass_rate': round(passes * 100 / attempts, 2) if attempts else 0.0,
+                'average_percentage': cls._percentage(
+                    sum(category.score_sum for category in categories),
+                    sum(category.max_score_sum for category in categories),
+                ),
+            },
+            'categories': [
+                {
+                    'category': category.category,
+                    'attempts': category.attempts,
+                    'passes': category.passes,
+                    'average_score': round(category.score_sum / category.attempts, 2) if category.attempts else 0.0,
+                    'average_percentage': cls._percentage(category.score_sum, category.max_score_sum),
+                }
+                for category in categories
+            ],
+        }
+
+
+class LeaderboardSerializer:
+    
+    @staticmethod
+    def entry(rank: int, student_exam: StudentExam) -> Dict[str, Any]:
+        student = student_exam.student
+        return {
+            'rank': rank,
+            'student_name': f'{student.first_name} {student.last_name[:1]}'.strip(),
+            'total_score': student_exam.total_score,
+            'completed_at': student_exam.end_time.isoformat() if student_exam.end_time else None,
+        }
+    
+    @classmethod
+    def to_dict(cls, exam: Exam, entries: List, ranked_attempts: int) -> Dict[str, Any]:
+        return {
+            'exam_id': str(exam.id),
+            'max_score': exam.max_score,
+            'ranked_attempts': ranked_attempts,
+            'results': [cls.entry(rank, student_exam) for rank, student_exam in entries],
+        }
+
+
+class ItemStatisticSerializer:
+    
+    @staticmethod
+    def to_dict(statistic: ItemStatistic) -> Dict[str, Any]:
+        return {
+            'exam_question_id': str(statistic.exam_question_id),
+            'question_name': statistic.exam_question.question.question_name,
+            'attempts': statistic.attempts,
+            'responses': statistic.responses,
+            'correct': statistic.correct,
+            'difficulty': statistic.difficulty,
+            'discrimination': statistic.discrimination,
+            'answers': statistic.answer_rates,
+            'computed_at': statistic.computed_at.isoformat(),
+        }
+    
+    @classmethod
+    def to_dict_list(cls, statistics: List[ItemStatistic]) -> List[Dict[str, Any]]:
+        return [cls.to_dict(statistic) for statistic in statistics]
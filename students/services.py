@@ -1,13 +1,29 @@
 import datetime as dt
+import hashlib
+import secrets
+import uuid
 import jwt
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
 from django.utils import timezone
-from django.db.models import Sum
-from typing import Dict, Any, Optional
+from django.db.models import (
+    Case, Count, DateTimeField, Exists, ExpressionWrapper, F, IntegerField, Max, OuterRef, Q, QuerySet, Subquery,
+    Sum, Value, When
+)
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
+from core.cache import BoundedTTLCache
+from core.passwords import PasswordHasherPool
 from core.exceptions import AuthenticationError, ValidationError, NotFoundError, BusinessLogicError
-from .models import Student, StudentExam, StudentExamResult
+from core.validators import InputValidator
+from .models import ExamScoreBucket, ItemStatistic, Student, StudentCategorySummary, StudentExam, StudentExamResult, StudentExamSummary
 from exams.models import Exam, ExamQuestion, QuestionAnswer
+from exams.question.answer_key import AnswerKeyIndex
 
 
 class AuthenticationService:
@@ -33,11 +49,24 @@ class AuthenticationService:
         except Student.DoesNotExist:
             raise AuthenticationError('Invalid credentials')
         
-        if not student.check_password(password):
+        if not PasswordHasherPool.verify(password, student.password):
             raise AuthenticationError('Invalid credentials')
         
+        if PasswordHasherPool.needs_upgrade(student.password):
+            cls._upgrade_password_hash(student, password)
+        
         return student
     
+    @staticmethod
+    def _upgrade_password_hash(student: Student, password: str) -> None:
+        current = student.password
+        
+        def store(encoded: str) -> None:
+            # Only replace the hash that was verified, never a newer password.
+            Student.objects.filter(pk=student.pk, password=current).update(password=encoded)
+        
+        PasswordHasherPool.hash_in_background(password, store)
+    
     @classmethod
     def generate_tokens(cls, student: Student) -> Dict[str, str]:
         now = dt.datetime.utcnow()
@@ -57,6 +86,7 @@ class AuthenticationService:
             'iat': int(now.timestamp()),
             'exp': int((now + jwt_settings['refresh_lifetime']).timestamp()),
             'type': 'refresh',
+            'jti': uuid.uuid4().hex,
         }
         
         access_token = jwt.encode(access_payload, secret, algorithm='HS256')
@@ -66,6 +96,70 @@ class AuthenticationService:
             'access': access_token,
             'refresh': refresh_token
         }
+    
+    @classmethod
+    def _decode_refresh_token(cls, refresh_token: str) -> Dict[str, Any]:
+        try:
+            payload = jwt.decode(refresh_token, cls._get_jwt_secret(), algorithms=['HS256'])
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationError('Refresh token has expired')
+        except jwt.InvalidTokenError:
+            raise AuthenticationError('Invalid refresh token')
+        
+        if payload.get('type') != 'refresh' or not payload.get('sub'):
+            raise AuthenticationError('Invalid refresh token')
+        return payload
+    
+    @staticmethod
+    def _consume_refresh_token(payload: Dict[str, Any], refresh_token: str) -> None:
+        """Mark a refresh token as used; a second use is rejected until it expires."""
+        jwt_settings = getattr(settings, 'JWT_AUTH', {})
+        token_id = payload.get('jti') or hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()
+        timeout = max(int(payload['exp'] - dt.datetime.utcnow().timestamp()), 1)
+        cache = caches[jwt_settings.get('JWT_DENYLIST_CACHE_ALIAS', 'default')]
+        if not cache.add(f'jwt:used_refresh:{token_id}', 1, timeout=timeout):
+            raise AuthenticationError('Refresh token has already been used')
+    
+    @classmethod
+    def refresh_tokens(cls, refresh_token: str) -> Dict[str, str]:
+        """Exchange a valid refresh token for a new access token without checking the password."""
+        payload = cls._decode_refresh_token(refresh_token)
+        
+        try:
+            student = Student.objects.only('id', 'email_address').get(id=payload['sub'], is_active=True)
+        except (Student.DoesNotExist, DjangoValidationError):
+            raise AuthenticationError('Invalid refresh token')
+        
+        if not getattr(settings, 'JWT_AUTH', {}).get('JWT_ROTATE_REFRESH_TOKENS', False):
+            tokens = cls.generate_tokens(student)
+            tokens['refresh'] = refresh_token
+            return tokens
+        
+        cls._consume_refresh_token(payload, refresh_token)
+        return cls.generate_tokens(student)
+
+
+class StudentStatusService:
+    
+    _cache = BoundedTTLCache(
+        maxsize=getattr(settings, 'STUDENT_STATUS_CACHE_SIZE', 10000),
+        ttl=getattr(settings, 'STUDENT_STATUS_CACHE_TTL', 60),
+    )
+    
+    @classmethod
+    def is_active(cls, student_id) -> bool:
+        key = str(student_id)
+        is_active = cls._cache.get(key)
+        if is_active is None:
+            is_active = bool(
+                Student.objects.filter(id=student_id).values_list('is_active', flat=True).first()
+            )
+            cls._cache.set(key, is_active)
+        return is_active
+    
+    @classmethod
+    def invalidate(cls, student_id) -> None:
+        cls._cache.delete(str(student_id))
 
 
 class ExamService:
@@ -78,7 +172,28 @@ class ExamService:
             raise NotFoundError('Exam not found')
     
     @staticmethod
-    def get_or_create_student_exam(student: Student, exam: Exam) -> StudentExam:
+    async def aget_exam_by_id(exam_id: str) -> Exam:
+        try:
+            return await Exam.objects.aget(id=exam_id, is_active=True)
+        except Exam.DoesNotExist:
+            raise NotFoundError('Exam not found')
+    
+    @staticmethod
+    def _previous_seeds(student: Student, exam: Exam) -> QuerySet:
+        return StudentExam.objects.filter(
+            student=student,
+            exam=exam,
+            question_seed__isnull=False
+        ).order_by('-created_at').values_list('question_seed', flat=True)
+    
+    @staticmethod
+    def _new_seed(previous_seed: Optional[int]) -> int:
+        # A retake reuses the seed of the student's earlier attempt, so it
+        # draws the same questions in the same answer order.
+        return secrets.randbelow(2 ** 31) if previous_seed is None else previous_seed
+    
+    @classmethod
+    def get_or_create_student_exam(cls, student: Student, exam: Exam) -> StudentExam:
         existing_exam = StudentExam.objects.filter(
             student=student,
             exam=exam,
@@ -93,7 +208,30 @@ class ExamService:
             exam=exam,
             start_time=timezone.now(),
             status='in_progress',
-            max_exam_score=exam.max_score
+            max_exam_score=exam.max_score,
+            question_seed=cls._new_seed(cls._previous_seeds(student, exam).first())
+        )
+    
+    @classmethod
+    async def aget_or_create_student_exam(cls, student: Student, exam: Exam) -> StudentExam:
+        existing_exam = await StudentExam.objects.filter(
+            student=student,
+            exam=exam,
+            status__in=['pending', 'in_progress']
+        ).afirst()
+        
+        if existing_exam:
+            # Serializers read the exam; a lazy load is not allowed in async code.
+            existing_exam.exam = exam
+            return existing_exam
+        
+        return await StudentExam.objects.acreate(
+            student=student,
+            exam=exam,
+            start_time=timezone.now(),
+            status='in_progress',
+            max_exam_score=exam.max_score,
+            question_seed=cls._new_seed(await cls._previous_seeds(student, exam).afirst())
         )
     
     @staticmethod
@@ -107,6 +245,17 @@ class ExamService:
         except StudentExam.DoesNotExist:
             raise NotFoundError('Student exam not found or not in progress')
     
+    @staticmethod
+    async def aget_active_student_exam(student: Student, student_exam_id: str) -> StudentExam:
+        try:
+            return await StudentExam.objects.aget(
+                id=student_exam_id,
+                student=student,
+                status='in_progress'
+            )
+        except StudentExam.DoesNotExist:
+            raise NotFoundError('Student exam not found or not in progress')
+    
     @staticmethod
     def get_exam_question(exam_question_id: str, exam: Exam) -> ExamQuestion:
         try:
@@ -132,54 +281,777 @@ class ExamService:
 
 class AnswerSubmissionService:
     
+    UPSERT_VENDORS = ('postgresql', 'sqlite')
+    
+    @classmethod
+    def _upsert_result(cls, student_exam_id, exam_question_id, answer_id, is_correct: bool, score: int):
+        """Insert or update the result for (student_exam, exam_question) in one statement; returns its id."""
+        connection = connections[router.db_for_write(StudentExamResult)]
+        if connection.vendor not in cls.UPSERT_VENDORS:
+            result, _ = StudentExamResult.objects.update_or_create(
+                student_exam_id=student_exam_id,
+                exam_question_id=exam_question_id,
+                defaults={'answer_id': answer_id, 'is_correct': is_correct, 'score': score},
+            )
+            return result.id
+        
+        opts = StudentExamResult._meta
+        qn = connection.ops.quote_name
+        values = {
+            'id': uuid.uuid4(),
+            'student_exam': student_exam_id,
+            'exam_question': exam_question_id,
+            'answer': answer_id,
+            'is_correct': is_correct,
+            'score': score,
+            'updated_at': timezone.now(),
+        }
+        fields = [opts.get_field(name) for name in values]
+        params = [field.get_db_prep_value(values[field.name], connection) for field in fields]
+        columns = {field.name: qn(field.column) for field in fields}
+        sql = (
+            f'INSERT INTO {qn(opts.db_table)} ({", ".join(columns.values())}) '
+            f'VALUES ({", ".join(["%s"] * len(fields))}) '
+            f'ON CONFLICT ({columns["student_exam"]}, {columns["exam_question"]}) DO UPDATE SET '
+            + ', '.join(f'{columns[name]} = EXCLUDED.{columns[name]}' for name in ('answer', 'is_correct', 'score', 'updated_at'))
+            + f' RETURNING {columns["id"]}'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return uuid.UUID(str(cursor.fetchone()[0]))
+    
     @staticmethod
-    def submit_answer(student_exam: StudentExam, exam_question: ExamQuestion, answer: QuestionAnswer) -> StudentExamResult:
+    def _lock_attempt(student_exam_id) -> None:
+        # A result row that does not exist yet cannot be locked, so two first
+        # answers to one question would both read a previous score of 0 and
+        # both add theirs. Locking the attempt serializes its writers instead,
+        # and rechecking its status under the lock keeps answers out of an
+        # attempt that was completed or expired after it was loaded.
+        locked = list(
+            StudentExam.objects.select_for_update()
+            .filter(pk=student_exam_id, status='in_progress')
+            .values_list('pk', flat=True)
+        )
+        if not locked:
+            raise NotFoundError('Student exam not found or not in progress')
+    
+    @classmethod
+    def record_answer(cls, student_exam: StudentExam, exam_question_id, answer_id, is_correct: bool, score: int) -> StudentExamResult:
+        with transaction.atomic():
+            cls._lock_attempt(student_exam.id)
+            previous_score = StudentExamResult.objects.select_for_update().filter(
+                student_exam_id=student_exam.id,
+                exam_question_id=exam_question_id
+            ).values_list('score', flat=True).first() or 0
+            
+            result_id = cls._upsert_result(student_exam.id, exam_question_id, answer_id, is_correct, score)
+            
+            ExamCompletionService.apply_score_delta(student_exam.id, score - previous_score)
+        
+        result = StudentExamResult(
+            id=result_id,
+            student_exam_id=student_exam.id,
+            exam_question_id=exam_question_id,
+            answer_id=answer_id,
+            is_correct=is_correct,
+            score=score
+        )
+        result._state.adding = False
+        result._state.db = router.db_for_write(StudentExamResult)
+        return result
+    
+    @classmethod
+    def submit_answer(cls, student_exam: StudentExam, exam_question: ExamQuestion, answer: QuestionAnswer) -> StudentExamResult:
         is_correct = answer.is_correct
         score = exam_question.score if is_correct else 0
         
-        existing_result = StudentExamResult.objects.filter(
-            student_exam=student_exam,
-            exam_question=exam_question
-        ).first()
-        
-        if existing_result:
-            existing_result.answer = answer
-            existing_result.is_correct = is_correct
-            existing_result.score = score
-            existing_result.save()
-            return existing_result
+        result = cls.record_answer(student_exam, exam_question.id, answer.id, is_correct, score)
+        result.student_exam = student_exam
+        result.exam_question = exam_question
+        result.answer = answer
+        return result
+    
+    @classmethod
+    def submit_answer_by_id(cls, student_exam: StudentExam, exam_question_id: str, answer_id: str) -> StudentExamResult:
+        """Validate and grade against the exam's in-memory answer key, then record the answer."""
+        answer_key = AnswerKeyIndex.get(student_exam.exam_id)
+        exam_question_id, answer_id, is_correct, score = answer_key.grade(exam_question_id, answer_id)
+        answer_key.check_drawn(student_exam.question_seed, exam_question_id)
+        return cls.record_answer(student_exam, exam_question_id, answer_id, is_correct, score)
+    
+    @classmethod
+    async def asubmit_answer_by_id(cls, student_exam: StudentExam, exam_question_id: str, answer_id: str) -> StudentExamResult:
+        # The async ORM has no transactions, so the locked read-upsert-delta
+        # sequence runs as one unit on the thread that owns the connection.
+        return await sync_to_async(cls.submit_answer_by_id)(student_exam, exam_question_id, answer_id)
+    
+    @staticmethod
+    def _parse_batch_item(item) -> Dict[str, Any]:
+        if isinstance(item, dict):
+            exam_question_id, answer_id = item.get('exam_question_id'), item.get('answer_id')
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            exam_question_id, answer_id = item
         else:
-            return StudentExamResult.objects.create(
-                student_exam=student_exam,
-                exam_question=exam_question,
-                answer=answer,
-                is_correct=is_correct,
-                score=score
-            )
+            return {'exam_question_id': None, 'answer_id': None, 'status': 'error', 'detail': 'Invalid data format'}
+        
+        parsed = {
+            'exam_question_id': str(exam_question_id) if exam_question_id else None,
+            'answer_id': str(answer_id) if answer_id else None,
+        }
+        try:
+            InputValidator.validate_uuid(parsed['exam_question_id'], 'Exam Question ID')
+            InputValidator.validate_uuid(parsed['answer_id'], 'Answer ID')
+        except ValidationError as e:
+            parsed.update(status='error', detail=e.message)
+            return parsed
+        
+        parsed['exam_question_id'] = parsed['exam_question_id'].lower()
+        parsed['answer_id'] = parsed['answer_id'].lower()
+        return parsed
+    
+    @classmethod
+    def submit_answers(cls, student_exam: StudentExam, answers: list) -> List[Dict[str, Any]]:
+        max_size = getattr(settings, 'ANSWER_BATCH_MAX_SIZE', 500)
+        if not isinstance(answers, list):
+            raise ValidationError('answers must be a list')
+        if len(answers) > max_size:
+            raise ValidationError(f'At most {max_size} answers can be submitted at once')
+        
+        items = [cls._parse_batch_item(item) for item in answers]
+        
+        # Later answers for the same question win, mirroring repeated single submissions.
+        latest_by_question = {}
+        for item in items:
+            if 'status' not in item:
+                latest_by_question[item['exam_question_id']] = item
+        for item in items:
+            if 'status' not in item and latest_by_question[item['exam_question_id']] is not item:
+                item.update(status='skipped', detail='Superseded by a later answer')
+        
+        pending = list(latest_by_question.values())
+        answer_key = AnswerKeyIndex.get(student_exam.exam_id) if student_exam.question_seed is not None else None
+        if answer_key is not None and answer_key.draws_subset:
+            # Questions outside this attempt's draw are not on its paper.
+            drawn = {str(exam_question_id) for exam_question_id in answer_key.drawn(student_exam.question_seed)}
+            for item in pending:
+                if item['exam_question_id'] not in drawn:
+                    item.update(status='error', detail='Exam question not found')
+            pending = [item for item in pending if 'status' not in item]
+        exam_questions = {
+            str(eq_id): (question_id, score)
+            for eq_id, question_id, score in ExamQuestion.objects.filter(
+                id__in=[item['exam_question_id'] for item in pending],
+                exam_id=student_exam.exam_id,
+                is_active=True
+            ).values_list('id', 'question_id', 'score')
+        }
+        question_answers = {
+            str(answer_id): (question_id, is_correct)
+            for answer_id, question_id, is_correct in QuestionAnswer.objects.filter(
+                id__in=[item['answer_id'] for item in pending],
+                is_active=True
+            ).values_list('id', 'question_id', 'is_correct')
+        }
+        
+        graded = []
+        for item in pending:
+            exam_question = exam_questions.get(item['exam_question_id'])
+            if exam_question is None:
+                item.update(status='error', detail='Exam question not found')
+                continue
+            answer = question_answers.get(item['answer_id'])
+            if answer is None or answer[0] != exam_question[0]:
+                item.update(status='error', detail='Answer not found')
+                continue
+            item['is_correct'] = answer[1]
+            item['score'] = exam_question[1] if answer[1] else 0
+            graded.append(item)
+        
+        with transaction.atomic():
+            cls._lock_attempt(student_exam.id)
+            existing = {
+                str(exam_question_id): (result_id, previous_score)
+                for exam_question_id, result_id, previous_score in StudentExamResult.objects.select_for_update().filter(
+                    student_exam=student_exam,
+                    exam_question_id__in=[item['exam_question_id'] for item in graded]
+                ).values_list('exam_question_id', 'id', 'score')
+            }
+            rows = []
+            score_delta = 0
+            for item in graded:
+                result_id, previous_score = existing.get(item['exam_question_id'], (None, 0))
+                score_delta += item['score'] - previous_score
+                item['status'] = 'updated' if result_id else 'created'
+                row = StudentExamResult(
+                    student_exam_id=student_exam.id,
+                    exam_question_id=item['exam_question_id'],
+                    answer_id=item['answer_id'],
+                    is_correct=item['is_correct'],
+                    score=item['score'],
+                )
+                if result_id:
+                    row.id = result_id
+                item['result_id'] = str(row.id)
+                rows.append(row)
+            
+            if rows:
+                # A single INSERT ... ON CONFLICT DO UPDATE; concurrent retries
+                # collapse onto the (student_exam, exam_question) constraint.
+                StudentExamResult.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['student_exam', 'exam_question'],
+                    update_fields=['answer', 'is_correct', 'score', 'updated_at'],
+                )
+            
+            ExamCompletionService.apply_score_delta(student_exam.id, score_delta)
+        
+        return items
 
 
 class ExamCompletionService:
     
+    COMPLETION_FIELDS = ['end_time', 'status', 'exam_result', 'max_exam_score', 'updated_at']
+    
     @staticmethod
-    def complete_exam(student_exam: StudentExam) -> Dict[str, Any]:
-        total_score = StudentExamResult.objects.filter(
-            student_exam=student_exam
-        ).aggregate(total=Sum('score'))['total'] or 0
+    def apply_score_delta(student_exam_id, delta: int) -> None:
+        if delta:
+            StudentExam.objects.filter(pk=student_exam_id).update(total_score=F('total_score') + delta)
+    
+    @staticmethod
+    def results_total_expression() -> Coalesce:
+        """Sum of an attempt's result scores, for set-based updates of ``StudentExam`` rows."""
+        totals = (
+            StudentExamResult.objects
+            .filter(student_exam=OuterRef('pk'))
+            .values('student_exam')
+            .annotate(total=Sum('score'))
+            .values('total')
+        )
+        return Coalesce(Subquery(totals[:1]), 0, output_field=IntegerField())
+    
+    @classmethod
+    def rebuild_totals(cls, student_exams: QuerySet) -> int:
+        """Recompute ``total_score`` from the raw results; returns the number of attempts that had drifted.
         
-        passing_score = student_exam.exam.passing_score
-        max_score = student_exam.exam.max_score
+        Finished attempts are re-graded and moved between leaderboard buckets,
+        and their students' summaries rebuilt, as after a regrade.
+        """
+        return RegradeService.reaggregate(student_exams)
+    
+    @staticmethod
+    def _finish(student_exam: StudentExam, total_score: int, passing_score: int, max_score: int) -> Dict[str, Any]:
         exam_result = 'pass' if total_score >= passing_score else 'fail'
         
         student_exam.end_time = timezone.now()
         student_exam.status = 'done'
-        student_exam.total_score = total_score
         student_exam.exam_result = exam_result
         student_exam.max_exam_score = max_score
-        student_exam.save()
         
         return {
             'total_score': total_score,
             'max_score': max_score,
             'exam_result': exam_result,
             'end_time': student_exam.end_time.isoformat()
-        }
\ No newline at end of file
+        }
+    
+    @classmethod
+    def _save_completion(cls, student_exam: StudentExam, passing_score: int, max_score: int) -> Dict[str, Any]:
+        """Grade and persist a finished attempt; returns the completion with its leaderboard standing."""
+        with transaction.atomic():
+            # Lock the attempt so a concurrent expiry sweep cannot count it twice,
+            # and read the running total under that lock so an answer still in
+            # flight is either in it or rejected once the attempt is done.
+            previous_status, student_exam.total_score = StudentExam.objects.select_for_update().filter(
+                pk=student_exam.pk
+            ).values_list('status', 'total_score').get()
+            completion = cls._finish(student_exam, student_exam.total_score, passing_score, max_score)
+            student_exam.save(update_fields=cls.COMPLETION_FIELDS)
+            if previous_status != 'done':
+                LeaderboardService.adjust({(student_exam.exam_id, student_exam.total_score): 1})
+            ResultSummaryService.refresh([student_exam.student_id])
+            completion.update(LeaderboardService.standing(student_exam.exam_id, student_exam.total_score))
+            return completion
+    
+    @classmethod
+    def complete_exam(cls, student_exam: StudentExam) -> Dict[str, Any]:
+        # The running total is maintained as answers are submitted.
+        return cls._save_completion(student_exam, student_exam.exam.passing_score, student_exam.exam.max_score)
+    
+    @classmethod
+    async def acomplete_exam(cls, student_exam: StudentExam) -> Dict[str, Any]:
+        exam = await Exam.objects.filter(pk=student_exam.exam_id).values('passing_score', 'max_score').aget()
+        return await sync_to_async(cls._save_completion)(student_exam, exam['passing_score'], exam['max_score'])
+
+
+class ExamExpiryService:
+    """Closes attempts whose ``exam_timer`` ran out, one exam and one batch at a time."""
+    
+    @staticmethod
+    def _grace() -> dt.timedelta:
+        return dt.timedelta(seconds=getattr(settings, 'EXAM_EXPIRY_GRACE_SECONDS', 60))
+    
+    @staticmethod
+    def timed_exams_with_open_attempts() -> QuerySet:
+        return Exam.objects.filter(
+            exam_timer__gt=0,
+            id__in=StudentExam.objects.filter(status='in_progress').values('exam_id')
+        ).only('id', 'exam_timer', 'passing_score', 'max_score').order_by('id')
+    
+    @classmethod
+    def expired_attempts(cls, exam: Exam, now: dt.datetime) -> QuerySet:
+        # ``exam_timer`` is in seconds; the grace period covers clock skew and
+        # answers still in flight when time runs out.
+        cutoff = now - dt.timedelta(seconds=exam.exam_timer) - cls._grace()
+        return StudentExam.objects.filter(exam_id=exam.id, status='in_progress', start_time__lt=cutoff)
+    
+    @staticmethod
+    def close_attempts(exam: Exam, student_exam_ids: List, now: dt.datetime) -> int:
+        """Total, grade and close the given attempts in one UPDATE."""
+        total = ExamCompletionService.results_total_expression()
+        return StudentExam.objects.filter(pk__in=student_exam_ids, status='in_progress').update(
+            total_score=total,
+            exam_result=Case(
+                When(GreaterThanOrEqual(total, exam.passing_score), then=Value('pass')),
+                default=Value('fail'),
+            ),
+            status='done',
+            end_time=ExpressionWrapper(
+                F('start_time') + dt.timedelta(seconds=exam.exam_timer),
+                output_field=DateTimeField()
+            ),
+            max_exam_score=exam.max_score,
+            updated_at=now,
+        )
+    
+    @classmethod
+    def expire_exam(cls, exam: Exam, batch_size: int = 500, now: Optional[dt.datetime] = None) -> int:
+        now = now or timezone.now()
+        expired = cls.expired_attempts(exam, now).order_by('pk')
+        closed = 0
+        while True:
+            # Each batch is its own short transaction; attempts locked by an
+            # in-flight answer are skipped and picked up by the next sweep.
+            with transaction.atomic():
+                ids = list(expired.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    return closed
+                closed += cls.close_attempts(exam, ids, now)
+                closed_attempts = StudentExam.objects.filter(pk__in=ids)
+                LeaderboardService.adjust(LeaderboardService.bucket_counts(closed_attempts))
+                ResultSummaryService.refresh(closed_attempts.values('student_id'))
+            if len(ids) < batch_size:
+                return closed
+    
+    @classmethod
+    def expire_attempts(cls, batch_size: int = 500, now: Optional[dt.datetime] = None) -> Dict[str, int]:
+        now = now or timezone.now()
+        closed = exams = 0
+        for exam in cls.timed_exams_with_open_attempts():
+            expired = cls.expire_exam(exam, batch_size, now)
+            if expired:
+                exams += 1
+                closed += expired
+        return {'attempts': closed, 'exams': exams}
+
+
+class RegradeService:
+    """Re-applies the current answer key to stored results after a correction.
+    
+    Work is chunked by attempt id: each chunk's results are rewritten with one
+    ``UPDATE ... FROM`` joined to the exam questions and answers, then only
+    the attempts whose totals moved are re-aggregated. Chunks commit on their
+    own, so an interrupted run resumes from the last reported attempt id.
+    """
+    
+    UPDATE_FROM_VENDORS = ('postgresql', 'sqlite')
+    
+    @staticmethod
+    def affected_exam_ids(exam_id=None, question_id=None) -> QuerySet:
+        exam_questions = ExamQuestion.objects.all()
+        if exam_id:
+            exam_questions = exam_questions.filter(exam_id=exam_id)
+        if question_id:
+            exam_questions = exam_questions.filter(question_id=question_id)
+        return exam_questions.values('exam_id')
+    
+    @classmethod
+    def affected_attempts(cls, exam_id=None, question_id=None) -> QuerySet:
+        return StudentExam.objects.filter(
+            exam_id__in=cls.affected_exam_ids(exam_id, question_id)
+        ).order_by('pk')
+    
+    @staticmethod
+    def _chunk_bounds(attempts: QuerySet, start_after, chunk_size: int):
+        """Upper attempt id of the next chunk; ``None`` when the rest fits in one chunk."""
+        remaining = attempts if start_after is None else attempts.filter(pk__gt=start_after)
+        return remaining.values_list('pk', flat=True)[chunk_size - 1:chunk_size].first()
+    
+    @classmethod
+    def regrade_results(cls, start_after, upto, exam_id=None, question_id=None) -> int:
+        """Rewrite stale ``is_correct``/``score`` of results of attempts in (start_after, upto]; returns rows changed."""
+        connection = connections[router.db_for_write(StudentExamResult)]
+        if connection.vendor not in cls.UPDATE_FROM_VENDORS:
+            return cls._regrade_results_correlated(start_after, upto, exam_id, question_id)
+        
+        qn = connection.ops.quote_name
+        
+        def column(model, name):
+            return qn(model._meta.get_field(name).column)
+        
+        def prep(model, name, value):
+            return model._meta.get_field(name).target_field.get_db_prep_value(value, connection)
+        
+        results = qn(StudentExamResult._meta.db_table)
+        new_score = f'CASE WHEN qa.{column(QuestionAnswer, "is_correct")} THEN eq.{column(ExamQuestion, "score")} ELSE 0 END'
+        conditions = [
+            f'eq.{column(ExamQuestion, "id")} = {results}.{column(StudentExamResult, "exam_question")}',
+            f'qa.{column(QuestionAnswer, "id")} = {results}.{column(StudentExamResult, "answer")}',
+            f'({results}.{column(StudentExamResult, "is_correct")} <> qa.{column(QuestionAnswer, "is_correct")}'
+            f' OR {results}.{column(StudentExamResult, "score")} <> {new_score})',
+        ]
+        params = []
+        if start_after is not None:
+            conditions.append(f'{results}.{column(StudentExamResult, "student_exam")} > %s')
+            params.append(prep(StudentExamResult, 'student_exam', start_after))
+        if upto is not None:
+            conditions.append(f'{results}.{column(StudentExamResult, "student_exam")} <= %s')
+            params.append(prep(StudentExamResult, 'student_exam', upto))
+        if exam_id:
+            conditions.append(f'eq.{column(ExamQuestion, "exam")} = %s')
+            params.append(prep(ExamQuestion, 'exam', exam_id))
+        if question_id:
+            conditions.append(f'eq.{column(ExamQuestion, "question")} = %s')
+            params.append(prep(ExamQuestion, 'question', question_id))
+        
+        sql = (
+            f'UPDATE {results} SET '
+            f'{column(StudentExamResult, "is_correct")} = qa.{column(QuestionAnswer, "is_correct")}, '
+            f'{column(StudentExamResult, "score")} = {new_score}, '
+            f'{column(StudentExamResult, "updated_at")} = %s '
+            f'FROM {qn(ExamQuestion._meta.db_table)} eq, {qn(QuestionAnswer._meta.db_table)} qa '
+            f'WHERE ' + ' AND '.join(conditions)
+        )
+        updated_at = StudentExamResult._meta.get_field('updated_at').get_db_prep_value(timezone.now(), connection)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [updated_at] + params)
+            return cursor.rowcount
+    
+    @staticmethod
+    def _regrade_results_correlated(start_after, upto, exam_id=None, question_id=None) -> int:
+        results = StudentExamResult.objects.all()
+        if start_after is not None:
+            results = results.filter(student_exam_id__gt=start_after)
+        if upto is not None:
+            results = results.filter(student_exam_id__lte=upto)
+        if exam_id:
+            results = results.filter(exam_question__exam_id=exam_id)
+        if question_id:
+            results = results.filter(exam_question__question_id=question_id)
+        
+        answer_is_correct = Subquery(
+            QuestionAnswer.objects.filter(pk=OuterRef('answer_id')).values('is_correct')[:1]
+        )
+        question_score = Subquery(
+            ExamQuestion.objects.filter(pk=OuterRef('exam_question_id')).values('score')[:1]
+        )
+        return results.update(
+            is_correct=answer_is_correct,
+            score=Case(When(Exists(
+                QuestionAnswer.objects.filter(pk=OuterRef('answer_id'), is_correct=True)
+            ), then=question_score), default=Value(0)),
+            updated_at=timezone.now(),
+        )
+    
+    @staticmethod
+    def reaggregate(attempts: QuerySet) -> int:
+        """Re-total attempts whose stored total no longer matches their results, re-grading finished ones."""
+        total = ExamCompletionService.results_total_expression()
+        passing_score = Subquery(Exam.objects.filter(pk=OuterRef('exam_id')).values('passing_score')[:1])
+        drifted_ids = list(
+            attempts.annotate(computed_total=total).exclude(total_score=F('computed_total')).values_list('pk', flat=True)
+        )
+        if not drifted_ids:
+            return 0
+        drifted = StudentExam.objects.filter(pk__in=drifted_ids)
+        # Move finished attempts from their old histogram buckets to the new ones.
+        buckets = {key: -count for key, count in LeaderboardService.bucket_counts(drifted).items()}
+        updated = drifted.update(
+            total_score=total,
+            exam_result=Case(
+                When(~Q(status='done'), then=F('exam_result')),
+                When(GreaterThanOrEqual(total, passing_score), then=Value('pass')),
+                default=Value('fail'),
+            ),
+        )
+        for key, count in LeaderboardService.bucket_counts(drifted).items():
+            buckets[key] = buckets.get(key, 0) + count
+        LeaderboardService.adjust(buckets)
+        ResultSummaryService.refresh(drifted.filter(status='done').values('student_id'))
+        return updated
+    
+    @classmethod
+    def regrade(cls, exam_id=None, question_id=None, chunk_size: int = 1000, start_after=None, progress=None) -> Dict[str, Any]:
+        """Regrade every attempt touched by ``exam_id`` and/or ``question_id``.
+        
+        ``progress`` is called after each committed chunk with the running
+        totals and the last attempt id, which can be passed back as
+        ``start_after`` to resume.
+        """
+        attempts = cls.affected_attempts(exam_id, question_id)
+        totals = {'chunks': 0, 'results': 0, 'attempts': 0, 'last_attempt_id': start_after}
+        while True:
+            upto = cls._chunk_bounds(attempts, start_after, chunk_size)
+            chunk = attempts if start_after is None else attempts.filter(pk__gt=start_after)
+            if upto is not None:
+                chunk = chunk.filter(pk__lte=upto)
+            
+            with transaction.atomic():
+                totals['results'] += cls.regrade_results(start_after, upto, exam_id, question_id)
+                totals['attempts'] += cls.reaggregate(chunk)
+            totals['chunks'] += 1
+            
+            if upto is None:
+                return totals
+            start_after = totals['last_attempt_id'] = upto
+            if progress is not None:
+                progress(totals)
+
+
+class ResultSummaryService:
+    """Maintains the per-student rollups served by /api/results and /api/dashboard.
+    
+    Rollups are recomputed from a student's finished attempts whenever one of
+    them changes, so they never drift from ``student_exams``.
+    """
+    
+    @staticmethod
+    def refresh(student_ids) -> None:
+        """Rebuild the summaries of ``student_ids`` (an iterable or a ``values('student_id')`` queryset)."""
+        finished = StudentExam.objects.filter(student_id__in=student_ids, status='done')
+        latest = StudentExam.objects.filter(
+            student_id=OuterRef('student_id'), exam_id=OuterRef('exam_id'), status='done'
+        ).order_by('-end_time', '-pk')
+        
+        with transaction.atomic():
+            # Serialize concurrent refreshes of the same student.
+            list(Student.objects.select_for_update().filter(pk__in=student_ids).order_by('pk').values_list('pk', flat=True))
+            
+            exam_rows = finished.values('student_id', 'exam_id').annotate(
+                attempts=Count('pk'),
+                passes=Count('pk', filter=Q(exam_result='pass')),
+                best_score=Max('total_score'),
+                max_score=Max('max_exam_score'),
+                latest_completed_at=Max('end_time'),
+                latest_score=Subquery(latest.values('total_score')[:1]),
+                latest_result=Subquery(latest.values('exam_result')[:1]),
+            ).order_by()
+            category_rows = finished.values('student_id', category=F('exam__category')).annotate(
+                attempts=Count('pk'),
+                passes=Count('pk', filter=Q(exam_result='pass')),
+                score_sum=Sum('total_score'),
+                max_score_sum=Sum('max_exam_score'),
+            ).order_by()
+            
+            StudentExamSummary.objects.filter(student_id__in=student_ids).delete()
+            StudentCategorySummary.objects.filter(student_id__in=student_ids).delete()
+            StudentExamSummary.objects.bulk_create([StudentExamSummary(**row) for row in exam_rows])
+            StudentCategorySummary.objects.bulk_create([StudentCategorySummary(**row) for row in category_rows])
+    
+    @staticmethod
+    def exam_summaries(student: Student) -> QuerySet:
+        return (
+            StudentExamSummary.objects
+            .filter(student=student)
+            .select_related('exam')
+            .order_by('-latest_completed_at')
+        )
+    
+    @staticmethod
+    def category_summaries(student: Student) -> QuerySet:
+        return StudentCategorySummary.objects.filter(student=student).order_by('category')
+
+
+class ItemStatisticsService:
+    """Reads stored item statistics and caches their encoded payload per exam.
+    
+    Statistics only change when ``ItemAnalysisService`` rewrites them, which
+    drops the cached payload.
+    """
+    
+    PAYLOAD_KEY = 'item_statistics:{exam_id}'
+    
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'ITEM_STATISTICS_CACHE_ALIAS', 'default')]
+    
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'ITEM_STATISTICS_CACHE_TIMEOUT', 3600)
+    
+    @classmethod
+    def _key(cls, exam_id) -> str:
+        try:
+            return cls.PAYLOAD_KEY.format(exam_id=uuid.UUID(str(exam_id)))
+        except ValueError:
+            raise ValidationError('exam_id must be a valid UUID')
+    
+    @staticmethod
+    def get_exam(exam_id: str) -> Exam:
+        try:
+            return Exam.objects.get(id=exam_id)
+        except Exam.DoesNotExist:
+            raise NotFoundError('Exam not found')
+    
+    @staticmethod
+    def statistics(exam: Exam) -> QuerySet:
+        return (
+            ItemStatistic.objects
+            .filter(exam=exam)
+            .select_related('exam_question__question')
+            .order_by('exam_question__created_at', 'exam_question_id')
+        )
+    
+    @classmethod
+    def get_cached(cls, exam_id) -> Optional[bytes]:
+        return cls._cache().get(cls._key(exam_id))
+    
+    @classmethod
+    def set_cached(cls, exam_id, payload: bytes) -> None:
+        cls._cache().set(cls._key(exam_id), payload, timeout=cls._timeout())
+    
+    @classmethod
+    def invalidate(cls, exam_id) -> None:
+        cls._cache().delete(cls._key(exam_id))
+
+
+class LeaderboardService:
+    """Per-exam histograms of finished attempts' total scores.
+    
+    Totals are bounded by the exam's ``max_score``, so a histogram has at most
+    ``max_score + 1`` buckets. Completion, the expiry sweep and regrades move
+    attempts between buckets as they happen; rank and percentile are then
+    read off one exam's buckets instead of counting attempts.
+    """
+    
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 100
+    
+    @staticmethod
+    def bucket_counts(attempts: QuerySet) -> Dict[Tuple[uuid.UUID, int], int]:
+        """Finished attempts in ``attempts`` grouped as ``{(exam_id, total_score): count}``."""
+        rows = attempts.filter(status='done').values('exam_id', 'total_score').annotate(attempts=Count('pk')).order_by()
+        return {(row['exam_id'], row['total_score']): row['attempts'] for row in rows}
+    
+    @staticmethod
+    def adjust(deltas: Dict[Tuple[uuid.UUID, int], int]) -> None:
+        """Add ``{(exam_id, score): delta}`` to the histograms."""
+        for (exam_id, score), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            if not delta:
+                continue
+            buckets = ExamScoreBucket.objects.filter(exam_id=exam_id, score=score)
+            if buckets.update(count=F('count') + delta) or delta < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    ExamScoreBucket.objects.create(exam_id=exam_id, score=score, count=delta)
+            except IntegrityError:
+                # Another transaction created the bucket first.
+                buckets.update(count=F('count') + delta)
+    
+    @classmethod
+    def rebuild(cls, exam_ids: Iterable) -> None:
+        """Recount the histograms of ``exam_ids`` from ``student_exams``."""
+        exam_ids = list(exam_ids)
+        with transaction.atomic():
+            list(Exam.objects.select_for_update().filter(pk__in=exam_ids).order_by('pk').values_list('pk', flat=True))
+            ExamScoreBucket.objects.filter(exam_id__in=exam_ids).delete()
+            counts = cls.bucket_counts(StudentExam.objects.filter(exam_id__in=exam_ids))
+            ExamScoreBucket.objects.bulk_create([
+                ExamScoreBucket(exam_id=exam_id, score=score, count=count)
+                for (exam_id, score), count in counts.items()
+            ])
+    
+    @staticmethod
+    def histogram(exam_id) -> List[Tuple[int, int]]:
+        """``(score, attempts)`` buckets of the exam, highest score first."""
+        return list(
+            ExamScoreBucket.objects
+            .filter(exam_id=exam_id, count__gt=0)
+            .order_by('-score')
+            .values_list('score', 'count')
+        )
+    
+    @staticmethod
+    def rank_in(histogram: List[Tuple[int, int]], score: int) -> Dict[str, Any]:
+        """Competition rank and percentile rank of ``score`` in one pass over the buckets.
+        
+        The percentile is the share of attempts scoring below ``score`` plus
+        half of those tied with it.
+        """
+        above = tied = total = 0
+        for bucket_score, count in histogram:
+            total += count
+            if bucket_score > score:
+                above += count
+            elif bucket_score == score:
+                tied += count
+        below = total - above - tied
+        return {
+            'rank': above + 1,
+            'ranked_attempts': total,
+            'percentile': round((below + tied / 2) * 100 / total, 2) if total else None,
+        }
+    
+    @classmethod
+    def standing(cls, exam_id, score: int) -> Dict[str, Any]:
+        return cls.rank_in(cls.histogram(exam_id), score)
+    
+    @classmethod
+    def parse_limit(cls, limit: Optional[str]) -> int:
+        if not limit:
+            return cls.DEFAULT_LIMIT
+        try:
+            value = int(limit)
+        except ValueError:
+            raise ValidationError('limit must be a valid integer')
+        if value < 1:
+            raise ValidationError('limit must be a positive integer')
+        return min(value, cls.MAX_LIMIT)
+    
+    @staticmethod
+    def get_exam(exam_id: str) -> Exam:
+        try:
+            return Exam.objects.get(id=exam_id, is_active=True)
+        except Exam.DoesNotExist:
+            raise NotFoundError('Exam not found')
+    
+    @classmethod
+    def top(cls, exam: Exam, limit: int) -> Tuple[List[Tuple[int, StudentExam]], int]:
+        """The ``limit`` best finished attempts with their ranks, and the number of ranked attempts.
+        
+        The histogram gives the lowest score that still makes the cut, so the
+        attempt query only reads rows at or above it.
+        """
+        histogram = cls.histogram(exam.id)
+        ranks = {}
+        seen = 0
+        for score, count in histogram:
+            if seen >= limit:
+                break
+            ranks[score] = seen + 1
+            seen += count
+        if not ranks:
+            return [], 0
+        
+        attempts = (
+            StudentExam.objects
+            .filter(exam=exam, status='done', total_score__gte=min(ranks))
+            .select_related('student')
+            .only('id', 'total_score', 'end_time', 'student__first_name', 'student__last_name')
+            .order_by('-total_score', 'end_time', 'pk')[:limit]
+        )
+        return [
+            (ranks.get(attempt.total_score) or cls.rank_in(histogram, attempt.total_score)['rank'], attempt)
+            for attempt in attempts
+        ], sum(count for _, count in histogram)
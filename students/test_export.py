@@ -0,0 +1,142 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import datetime as dt
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from core.exceptions import ValidationError
+from core.test_utils import BaseTestCase, create_test_exam_data, create_test_student
+from .export import ResultExporter
+from .models import StudentExam, StudentExamResult
+from .services import AnswerSubmissionService
+
+
+@override_settings(RESULT_EXPORT_SETTLE_SECONDS=0)
+class ResultExporterTest(BaseTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.results = [
+            StudentExamResult.objects.create(
+                student_exam=StudentExam.objects.create(
+                    student=create_test_student(),
+                    exam=self.test_exam,
+                    start_time=timezone.now() - dt.timedelta(days=i),
+                    status='done',
+                    max_exam_score=100
+                ),
+                exam_question=self.exam_question,
+                answer=self.correct_answer,
+                is_correct=True,
+                score=20
+            )
+            for i in range(5)
+        ]
+        # Distinct, increasing write times in creation order.
+        start = timezone.now() - dt.timedelta(minutes=10)
+        for i, result in enumerate(self.results):
+            StudentExamResult.objects.filter(pk=result.pk).update(updated_at=start + dt.timedelta(seconds=i))
+        self.result_ids = [str(result.id) for result in self.results]
+    
+    def _csv_rows(self, exporter):
+        return list(csv.DictReader(io.StringIO(b''.join(exporter.stream()).decode('utf-8'))))
+    
+    def test_csv_rows_in_write_order(self):
+        exporter = ResultExporter(chunk_size=2)
+        
+        rows = self._csv_rows(exporter)
+        
+        self.assertEqual([row['result_id'] for row in rows], self.result_ids)
+        self.assertEqual(rows[0]['exam_name'], self.test_exam.exam_name)
+        self.assertEqual(rows[0]['answer'], self.correct_answer.answer)
+        self.assertEqual(rows[0]['is_correct'], 'true')
+        self.assertEqual(exporter.exported, 5)
+        self.assertEqual(str(exporter.watermark[1]), self.result_ids[-1])
+    
+    def test_pages_are_separate_queries(self):
+        with self.assertNumQueries(3):
+            list(ResultExporter(chunk_size=2).rows())
+    
+    def test_resume_after_watermark(self):
+        first = ResultExporter(limit=2, chunk_size=10)
+        self.assertEqual(len(list(first.rows())), 2)
+        
+        rest = [str(row[0]) for row in ResultExporter(after=first.resume_token).rows()]
+        
+        self.assertEqual(rest, self.result_ids[2:])
+    
+    def test_resume_picks_up_rows_written_since(self):
+        first = ResultExporter()
+        list(first.rows())
+        
+        new_result = StudentExamResult.objects.create(
+            id='00000000-0000-4000-8000-000000000000',
+            student_exam=self.student_exam,
+            exam_question=self.exam_question,
+            answer=self.incorrect_answer,
+        )
+        # Only attempts still in progress take answers.
+        StudentExam.objects.filter(pk=self.results[0].student_exam_id).update(status='in_progress')
+        AnswerSubmissionService.record_answer(
+            self.results[0].student_exam, self.exam_question.id, self.incorrect_answer.id, False, 0
+        )
+        
+        rest = [str(row[0]) for row in ResultExporter(after=first.resume_token).rows()]
+        
+        self.assertEqual(rest, [str(new_result.id), self.result_ids[0]])
+    
+    @override_settings(RESULT_EXPORT_SETTLE_SECONDS=60)
+    def test_rows_still_settling_are_left_for_the_next_export(self):
+        StudentExamResult.objects.filter(pk=self.results[-1].pk).update(updated_at=timezone.now())
+        
+        self.assertEqual(len(list(ResultExporter().rows())), 4)
+    
+    def test_filters(self):
+        _, other_exam = create_test_exam_data()
+        
+        self.assertEqual(len(list(ResultExporter(exam_id=other_exam.id).rows())), 0)
+        since = (timezone.now() - dt.timedelta(days=1, hours=12)).isoformat()
+        self.assertEqual(len(list(ResultExporter(since=since).rows())), 2)
+        until = (timezone.localdate() - dt.timedelta(days=2)).isoformat()
+        self.assertEqual(len(list(ResultExporter(until=until).rows())), 2)
+    
+    def test_gzip_jsonl(self):
+        exporter = ResultExporter(file_format='jsonl', compress=True, chunk_size=2)
+        
+        lines = gzip.decompress(b''.join(exporter.stream())).decode('utf-8').splitlines()
+        
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['result_id'], self.result_ids[0])
+        self.assertEqual(exporter.filename, 'exam-results.jsonl.gz')
+    
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValidationError):
+            ResultExporter(file_format='xml')
+        with self.assertRaises(ValidationError):
+            ResultExporter(since='yesterday')
+        with self.assertRaises(ValidationError):
+            ResultExporter(after='nope')
+        with self.assertRaises(ValidationError):
+            ResultExporter(after=self.result_ids[0])
+    
+    def test_command_writes_file_and_watermark(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as handle:
+            pass
+        self.addCleanup(os.unlink, handle.name)
+        err = io.StringIO()
+        
+        call_command('export_results', '--output', handle.name, '--limit', '3', stderr=err)
+        
+        with open(handle.name, encoding='utf-8') as exported:
+            self.assertEqual(len(list(csv.DictReader(exported))), 3)
+        token = err.getvalue().split('Resume with --after ')[1].strip()
+        self.assertTrue(token.endswith(f':{self.result_ids[2]}'))
+        self.assertEqual([str(row[0]) for row in ResultExporter(after=token).rows()], self.result_ids[3:])
+        with self.assertRaises(CommandError):
+            call_command('export_results', '--since', 'soon', stderr=err)
@@ -0,0 +1,162 @@
+from io import StringIO
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+
+from core.test_utils import BaseTestCase, LOCMEM_CACHES, create_test_question_with_answers, create_test_student
+from .item_analysis import ItemAnalysisService
+from .models import ItemStatistic, StudentExam, StudentExamResult
+from .services import ItemStatisticsService
+
+
+class ItemAnalysisComputeTest(TestCase):
+
+    def test_matches_dense_reference(self):
+        rng = np.random.default_rng(7)
+        attempts, items = 40, 5
+        responses = rng.random((attempts, items)) < rng.uniform(0.2, 0.8, items)
+        answered = rng.random((attempts, items)) < 0.9
+        correct = responses & answered
+        weights = np.array([10, 20, 5, 15, 25])
+
+        attempt, item = np.nonzero(answered)
+        is_correct = correct[attempt, item].astype(float)
+        # Two answers per item: 2 * item is correct, 2 * item + 1 is not.
+        answer = 2 * item + (1 - is_correct).astype(np.int64)
+        stats = ItemAnalysisService.compute(
+            attempts, items, 2 * items, attempt, item, answer, is_correct, is_correct * weights[item]
+        )
+
+        totals = (correct * weights).sum(axis=1)
+        np.testing.assert_allclose(stats['difficulty'], correct.mean(axis=0))
+        np.testing.assert_allclose(
+            stats['discrimination'],
+            [np.corrcoef(correct[:, column], totals)[0, 1] for column in range(items)],
+        )
+        np.testing.assert_array_equal(stats['responses'], answered.sum(axis=0))
+        np.testing.assert_allclose(stats['answer_rates'][0::2], correct.mean(axis=0))
+        np.testing.assert_allclose(stats['answer_rates'][1::2], (answered & ~correct).mean(axis=0))
+
+    def test_undefined_values_are_nan(self):
+        stats = ItemAnalysisService.compute(
+            2, 2, 4,
+            np.array([0, 1, 0, 1]), np.array([0, 0, 1, 1]), np.array([0, 0, 2, 3]),
+            np.array([1.0, 1.0, 1.0, 0.0]), np.array([5.0, 5.0, 5.0, 0.0]),
+        )
+
+        self.assertEqual(stats['difficulty'][0], 1.0)
+        self.assertTrue(np.isnan(stats['discrimination'][0]))
+        self.assertAlmostEqual(stats['discrimination'][1], 1.0)
+
+    def test_no_attempts(self):
+        empty = np.empty(0, dtype=np.int64)
+
+        stats = ItemAnalysisService.compute(0, 1, 2, empty, empty, empty, np.empty(0), np.empty(0))
+
+        self.assertTrue(np.isnan(stats['difficulty'][0]))
+        self.assertTrue(np.isnan(stats['discrimination'][0]))
+        self.assertEqual(stats['responses'][0], 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ItemAnalysisServiceTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.second_question, (self.second_correct, self.second_wrong), self.second_exam_question = (
+            create_test_question_with_answers(self.test_exam, self.test_user, 'Second question')
+        )
+
+    def _finished_attempt(self, *answers):
+        attempt = StudentExam.objects.create(
+            student=create_test_student(),
+            exam=self.test_exam,
+            start_time=timezone.now(),
+            status='done',
+            max_exam_score=self.test_exam.max_score
+        )
+        for exam_question, answer in answers:
+            StudentExamResult.objects.create(
+                student_exam=attempt,
+                exam_question=exam_question,
+                answer=answer,
+                is_correct=answer.is_correct,
+                score=exam_question.score if answer.is_correct else 0
+            )
+        return attempt
+
+    def test_analyze_exam_stores_statistics(self):
+        self._finished_attempt((self.exam_question, self.correct_answer), (self.second_exam_question, self.second_correct))
+        self._finished_attempt((self.exam_question, self.correct_answer), (self.second_exam_question, self.second_wrong))
+        self._finished_attempt((self.exam_question, self.incorrect_answer))
+        self._finished_attempt()
+
+        self.assertEqual(ItemAnalysisService.analyze_exam(self.test_exam.id, chunk_size=2), 2)
+
+        first = ItemStatistic.objects.get(exam_question=self.exam_question)
+        self.assertEqual((first.attempts, first.responses, first.correct), (4, 3, 2))
+        self.assertEqual(first.difficulty, 0.5)
+        self.assertGreater(first.discrimination, 0)
+        rates = {rate['answer_id']: rate for rate in first.answer_rates}
+        self.assertEqual(rates[str(self.correct_answer.id)]['selections'], 2)
+        self.assertEqual(rates[str(self.incorrect_answer.id)]['rate'], 0.25)
+        self.assertTrue(rates[str(self.correct_answer.id)]['is_correct'])
+
+        second = ItemStatistic.objects.get(exam_question=self.second_exam_question)
+        self.assertEqual(second.difficulty, 0.25)
+
+    def test_in_progress_attempts_ignored(self):
+        StudentExamResult.objects.create(
+            student_exam=self.student_exam,
+            exam_question=self.exam_question,
+            answer=self.correct_answer,
+            is_correct=True,
+            score=20
+        )
+
+        ItemAnalysisService.analyze_exam(self.test_exam.id)
+
+        statistic = ItemStatistic.objects.get(exam_question=self.exam_question)
+        self.assertEqual((statistic.attempts, statistic.responses), (0, 0))
+        self.assertIsNone(statistic.difficulty)
+
+    def test_rows_written_during_the_run_are_skipped(self):
+        self._finished_attempt((self.exam_question, self.correct_answer))
+        load_results = ItemAnalysisService._load_results
+
+        def finish_attempts_meanwhile(*args, **kwargs):
+            # Arrives after the attempt, question and answer indexes were read.
+            _, (late_correct, _), late_exam_question = create_test_question_with_answers(
+                self.test_exam, self.test_user, 'Late question'
+            )
+            self._finished_attempt((self.exam_question, self.incorrect_answer), (late_exam_question, late_correct))
+            return load_results(*args, **kwargs)
+
+        with patch.object(ItemAnalysisService, '_load_results', side_effect=finish_attempts_meanwhile):
+            self.assertEqual(ItemAnalysisService.analyze_exam(self.test_exam.id, chunk_size=1), 2)
+
+        statistic = ItemStatistic.objects.get(exam_question=self.exam_question)
+        self.assertEqual((statistic.attempts, statistic.responses, statistic.correct), (1, 1, 1))
+
+    def test_rerun_replaces_rows_and_drops_cache(self):
+        ItemAnalysisService.analyze_exam(self.test_exam.id)
+        ItemStatisticsService.set_cached(self.test_exam.id, b'stale')
+        self._finished_attempt((self.exam_question, self.correct_answer))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ItemAnalysisService.analyze_exam(self.test_exam.id)
+
+        self.assertEqual(ItemStatistic.objects.filter(exam=self.test_exam).count(), 2)
+        self.assertEqual(ItemStatistic.objects.get(exam_question=self.exam_question).correct, 1)
+        self.assertIsNone(ItemStatisticsService.get_cached(self.test_exam.id))
+
+    def test_command_analyzes_exams_with_finished_attempts(self):
+        self._finished_attempt((self.exam_question, self.correct_answer))
+        out = StringIO()
+
+        call_command('analyze_items', stdout=out)
+
+        self.assertIn('Analyzed 2 questions across 1 exams', out.getvalue())
+        self.assertEqual(ItemStatistic.objects.filter(exam=self.test_exam).count(), 2)
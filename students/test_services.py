@@ -1,12 +1,24 @@
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils import timezone
 from unittest.mock import patch, MagicMock
 import jwt
 import datetime as dt
 
-from core.test_utils import ServiceTestCase, create_test_student, create_test_exam_data
+from core.test_utils import ServiceTestCase, LOCMEM_CACHES, create_test_student, create_test_exam_data, create_test_question_with_answers
 from core.exceptions import AuthenticationError, NotFoundError, ValidationError, BusinessLogicError
-from .models import Student, StudentExam, StudentExamResult
+from core.passwords import PasswordHasherPool
+from .models import ExamScoreBucket, Student, StudentCategorySummary, StudentExam, StudentExamResult, StudentExamSummary
+from .services import ExamCompletionService, ExamExpiryService, LeaderboardService, RegradeService, ResultSummaryService
+from exams.models import ExamQuestion, QuestionAnswer
+from exams.question.answer_key import AnswerKeyIndex
 
 
 User = get_user_model()
@@ -50,6 +62,25 @@ class AuthenticationServiceTest(ServiceTestCase):
         
         self.assertIn('Invalid credentials', str(context.exception))
     
+    def test_authenticate_student_upgrades_weak_hash(self):
+        weak = PBKDF2PasswordHasher().encode('testpass123', 'salt1234', iterations=1000)
+        Student.objects.filter(pk=self.test_student.pk).update(password=weak)
+        
+        self.auth_service.authenticate_student(self.test_student.email_address, 'testpass123')
+        
+        self.test_student.refresh_from_db()
+        self.assertNotEqual(self.test_student.password, weak)
+        self.assertFalse(PasswordHasherPool.needs_upgrade(self.test_student.password))
+        self.assertTrue(self.test_student.check_password('testpass123'))
+    
+    def test_authenticate_student_keeps_current_hash(self):
+        encoded = self.test_student.password
+        
+        self.auth_service.authenticate_student(self.test_student.email_address, 'testpass123')
+        
+        self.test_student.refresh_from_db()
+        self.assertEqual(self.test_student.password, encoded)
+    
     @override_settings(
         JWT_AUTH={
             'JWT_SECRET_KEY': 'test-secret',
@@ -87,6 +118,56 @@ class AuthenticationServiceTest(ServiceTestCase):
         self.assertEqual(decoded['sub'], str(self.test_student.id))
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class RefreshTokensTest(ServiceTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.refresh = self.auth_service.generate_tokens(self.test_student)['refresh']
+    
+    def test_refresh_issues_access_token_without_password_check(self):
+        with patch('core.passwords.PasswordHasherPool.verify') as mock_verify:
+            tokens = self.auth_service.refresh_tokens(self.refresh)
+        
+        mock_verify.assert_not_called()
+        decoded = jwt.decode(tokens['access'], self.auth_service._get_jwt_secret(), algorithms=['HS256'])
+        self.assertEqual(decoded['sub'], str(self.test_student.id))
+        self.assertEqual(decoded['type'], 'access')
+        self.assertEqual(tokens['refresh'], self.refresh)
+    
+    def test_access_token_rejected(self):
+        access = self.auth_service.generate_tokens(self.test_student)['access']
+        
+        with self.assertRaisesMessage(AuthenticationError, 'Invalid refresh token'):
+            self.auth_service.refresh_tokens(access)
+    
+    def test_expired_refresh_token_rejected(self):
+        expired = jwt.encode({
+            'sub': str(self.test_student.id),
+            'exp': int((dt.datetime.utcnow() - dt.timedelta(minutes=1)).timestamp()),
+            'type': 'refresh',
+        }, self.auth_service._get_jwt_secret(), algorithm='HS256')
+        
+        with self.assertRaisesMessage(AuthenticationError, 'Refresh token has expired'):
+            self.auth_service.refresh_tokens(expired)
+    
+    def test_inactive_student_rejected(self):
+        Student.objects.filter(pk=self.test_student.pk).update(is_active=False)
+        
+        with self.assertRaisesMessage(AuthenticationError, 'Invalid refresh token'):
+            self.auth_service.refresh_tokens(self.refresh)
+    
+    def test_rotation_issues_new_token_and_rejects_reuse(self):
+        jwt_auth = {**settings.JWT_AUTH, 'JWT_ROTATE_REFRESH_TOKENS': True}
+        with override_settings(JWT_AUTH=jwt_auth):
+            tokens = self.auth_service.refresh_tokens(self.refresh)
+            
+            self.assertNotEqual(tokens['refresh'], self.refresh)
+            with self.assertRaisesMessage(AuthenticationError, 'Refresh token has already been used'):
+                self.auth_service.refresh_tokens(self.refresh)
+            self.auth_service.refresh_tokens(tokens['refresh'])
+
+
 class ExamServiceTest(ServiceTestCase):
     
     def test_get_exam_by_id_valid(self):
@@ -131,6 +212,18 @@ class ExamServiceTest(ServiceTestCase):
         
         self.assertEqual(student_exam, self.student_exam)
     
+    def test_new_attempts_get_a_seed_that_retakes_reuse(self):
+        new_student = create_test_student()
+        
+        first = self.exam_service.get_or_create_student_exam(new_student, self.test_exam)
+        first.status = 'done'
+        first.save()
+        retake = self.exam_service.get_or_create_student_exam(new_student, self.test_exam)
+        
+        self.assertIsNotNone(first.question_seed)
+        self.assertNotEqual(retake.id, first.id)
+        self.assertEqual(retake.question_seed, first.question_seed)
+    
     def test_get_active_student_exam_valid(self):
         student_exam = self.exam_service.get_active_student_exam(
             self.test_student, 
@@ -194,6 +287,30 @@ class ExamServiceTest(ServiceTestCase):
 
 class AnswerSubmissionServiceTest(ServiceTestCase):
     
+    def test_answers_outside_the_draw_are_rejected(self):
+        for i in range(7):
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Question {i}')
+        self.student_exam.question_seed = 99
+        self.student_exam.save()
+        answer_key = AnswerKeyIndex.build(self.test_exam.id)
+        drawn = answer_key.draw(99)
+        undrawn = next(i for i in answer_key.pool if i not in drawn)
+        answer_for = {
+            eq_id: answer_id for eq_id, answer_id in QuestionAnswer.objects.filter(
+                question__exam_questions__id__in=[drawn[0], undrawn]
+            ).values_list('question__exam_questions__id', 'id')
+        }
+        
+        with self.assertRaisesMessage(NotFoundError, 'Exam question not found'):
+            self.answer_service.submit_answer_by_id(self.student_exam, str(undrawn), str(answer_for[undrawn]))
+        
+        items = self.answer_service.submit_answers(self.student_exam, [
+            {'exam_question_id': str(drawn[0]), 'answer_id': str(answer_for[drawn[0]])},
+            {'exam_question_id': str(undrawn), 'answer_id': str(answer_for[undrawn])},
+        ])
+        self.assertEqual(items[0]['status'], 'created')
+        self.assertEqual(items[1]['detail'], 'Exam question not found')
+    
     def test_submit_answer_new_result(self):
         result = self.answer_service.submit_answer(
             self.student_exam, 
@@ -235,18 +352,47 @@ class AnswerSubmissionServiceTest(ServiceTestCase):
         self.assertEqual(updated_result.answer, self.correct_answer)
         self.assertTrue(updated_result.is_correct)
         self.assertEqual(updated_result.score, 20)
+    
+    def test_submit_answer_query_count(self):
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.incorrect_answer)
+        
+        # Savepoint pair, the attempt lock, the previous-score read, the upsert
+        # and the total delta.
+        with self.assertNumQueries(6):
+            self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        stored = StudentExamResult.objects.get(student_exam=self.student_exam)
+        self.assertEqual(stored.answer, self.correct_answer)
+        self.assertEqual(stored.score, 20)
+    
+    def test_repeated_submissions_never_duplicate(self):
+        for answer in (self.correct_answer, self.incorrect_answer, self.correct_answer):
+            self.answer_service.submit_answer(self.student_exam, self.exam_question, answer)
+        
+        self.assertEqual(StudentExamResult.objects.filter(student_exam=self.student_exam).count(), 1)
+        completion_data = self.completion_service.complete_exam(self.student_exam)
+        self.assertEqual(completion_data['total_score'], 20)
+    
+    def test_duplicate_result_rejected_by_constraint(self):
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                StudentExamResult.objects.create(
+                    student_exam=self.student_exam,
+                    exam_question=self.exam_question,
+                    answer=self.incorrect_answer
+                )
 
 
 class ExamCompletionServiceTest(ServiceTestCase):
     
     def setUp(self):
         super().setUp()
-        StudentExamResult.objects.create(
-            student_exam=self.student_exam,
-            exam_question=self.exam_question,
-            answer=self.correct_answer,
-            is_correct=True,
-            score=20
+        self.answer_service.submit_answer(
+            self.student_exam,
+            self.exam_question,
+            self.correct_answer
         )
     
     def test_complete_exam_pass(self):
@@ -277,8 +423,583 @@ class ExamCompletionServiceTest(ServiceTestCase):
     
     def test_complete_exam_no_results(self):
         StudentExamResult.objects.filter(student_exam=self.student_exam).delete()
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(total_score=0)
         
         completion_data = self.completion_service.complete_exam(self.student_exam)
         
         self.assertEqual(completion_data['total_score'], 0)
-        self.assertEqual(completion_data['exam_result'], 'fail')
\ No newline at end of file
+        self.assertEqual(completion_data['exam_result'], 'fail')
+    
+    def test_complete_exam_reads_stored_total(self):
+        # The stored total is read as-is; neither the completion nor the
+        # summary refresh aggregates over the answer results.
+        with CaptureQueriesContext(connection) as queries:
+            completion_data = self.completion_service.complete_exam(self.student_exam)
+        
+        self.assertEqual(completion_data['total_score'], 20)
+        self.assertFalse([q for q in queries if 'student_exam_results' in q['sql']])
+    
+    def test_complete_exam_reads_total_under_the_attempt_lock(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.completion_service.complete_exam(self.student_exam)
+        
+        sql = [q['sql'] for q in queries.captured_queries]
+        total_read = next(i for i, q in enumerate(sql) if q.startswith('SELECT') and 'total_score' in q)
+        self.assertTrue(any(q.startswith('SAVEPOINT') for q in sql[:total_read]))
+    
+    def test_complete_exam_grades_answers_committed_after_loading(self):
+        self.test_exam.passing_score = 40
+        self.test_exam.save()
+        student_exam = StudentExam.objects.select_related('exam').get(pk=self.student_exam.pk)
+        _, (correct, _), exam_question = create_test_question_with_answers(self.test_exam, self.test_user, 'Late answer')
+        self.answer_service.submit_answer(self.student_exam, exam_question, correct)
+        
+        completion_data = self.completion_service.complete_exam(student_exam)
+        
+        self.assertEqual(completion_data['total_score'], 45)
+        self.assertEqual(completion_data['exam_result'], 'pass')
+        self.assertEqual(LeaderboardService.histogram(self.test_exam.id), [(45, 1)])
+
+
+class RunningScoreTest(ServiceTestCase):
+    
+    def _stored_total(self):
+        return StudentExam.objects.get(pk=self.student_exam.pk).total_score
+    
+    def test_total_follows_answer_changes(self):
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        self.assertEqual(self._stored_total(), 20)
+        
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.incorrect_answer)
+        self.assertEqual(self._stored_total(), 0)
+        
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        self.assertEqual(self._stored_total(), 20)
+    
+    def _interleave(self, competing_submission):
+        # Run a second first-time submission while the first one waits on the
+        # attempt lock, as a concurrent request that took the lock first would.
+        real_lock = self.answer_service._lock_attempt
+        calls = self.lock_calls = []
+        
+        def lock_attempt(student_exam_id):
+            calls.append(student_exam_id)
+            if len(calls) == 1:
+                competing_submission()
+            real_lock(student_exam_id)
+        
+        return patch.object(self.answer_service, '_lock_attempt', staticmethod(lock_attempt))
+    
+    def test_concurrent_first_answers_count_once(self):
+        competing = lambda: self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        with self._interleave(competing):
+            self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        self.assertEqual(len(self.lock_calls), 2)
+        self.assertEqual(self._stored_total(), 20)
+        self.assertEqual(StudentExamResult.objects.filter(student_exam=self.student_exam).count(), 1)
+    
+    def test_concurrent_first_batches_count_once(self):
+        answers = [{'exam_question_id': str(self.exam_question.id), 'answer_id': str(self.correct_answer.id)}]
+        competing = lambda: self.answer_service.submit_answers(self.student_exam, answers)
+        
+        with self._interleave(competing):
+            items = self.answer_service.submit_answers(self.student_exam, answers)
+        
+        self.assertEqual(len(self.lock_calls), 2)
+        self.assertEqual(items[0]['status'], 'updated')
+        self.assertEqual(self._stored_total(), 20)
+    
+    def test_answer_to_attempt_completed_meanwhile_is_rejected(self):
+        competing = lambda: self.completion_service.complete_exam(
+            StudentExam.objects.select_related('exam').get(pk=self.student_exam.pk)
+        )
+        
+        with self._interleave(competing):
+            with self.assertRaises(NotFoundError):
+                self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        self.assertEqual(self._stored_total(), 0)
+        self.assertFalse(StudentExamResult.objects.filter(student_exam=self.student_exam).exists())
+    
+    def test_batch_to_attempt_expired_meanwhile_is_rejected(self):
+        answers = [{'exam_question_id': str(self.exam_question.id), 'answer_id': str(self.correct_answer.id)}]
+        competing = lambda: StudentExam.objects.filter(pk=self.student_exam.pk).update(status='expired')
+        
+        with self._interleave(competing):
+            with self.assertRaises(NotFoundError):
+                self.answer_service.submit_answers(self.student_exam, answers)
+        
+        self.assertEqual(self._stored_total(), 0)
+        self.assertFalse(StudentExamResult.objects.filter(student_exam=self.student_exam).exists())
+    
+    def test_attempt_is_locked_before_previous_scores_are_read(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        
+        tables = [
+            'student_exam_results' if 'student_exam_results' in q['sql'] else 'student_exams'
+            for q in queries.captured_queries if q['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(tables[:2], ['student_exams', 'student_exam_results'])
+    
+    def test_rebuild_totals_repairs_drift(self):
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(total_score=75)
+        
+        repaired = self.completion_service.rebuild_totals(StudentExam.objects.all())
+        
+        self.assertEqual(repaired, 1)
+        self.assertEqual(self._stored_total(), 20)
+        self.assertEqual(self.completion_service.rebuild_totals(StudentExam.objects.all()), 0)
+    
+    def test_rebuild_exam_totals_command(self):
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        other_attempt = StudentExam.objects.create(
+            student=create_test_student(),
+            exam=self.test_exam,
+            status='done',
+            total_score=55
+        )
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(total_score=3)
+        out = StringIO()
+        
+        call_command('rebuild_exam_totals', '--batch-size', '1', stdout=out)
+        
+        self.assertEqual(self._stored_total(), 20)
+        other_attempt.refresh_from_db()
+        self.assertEqual(other_attempt.total_score, 0)
+        self.assertIn('Checked 2 attempts, repaired 2 drifted totals.', out.getvalue())
+    
+    def test_rebuild_exam_totals_command_regrades_finished_attempts(self):
+        self.test_exam.passing_score = 10
+        self.test_exam.save()
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        self.completion_service.complete_exam(self.student_exam)
+        StudentExamResult.objects.filter(student_exam=self.student_exam).update(score=0)
+        
+        call_command('rebuild_exam_totals', stdout=StringIO())
+        
+        self.student_exam.refresh_from_db()
+        self.assertEqual((self.student_exam.total_score, self.student_exam.exam_result), (0, 'fail'))
+        self.assertEqual(LeaderboardService.histogram(self.test_exam.id), [(0, 1)])
+        summary = StudentExamSummary.objects.get(student=self.test_student, exam=self.test_exam)
+        self.assertEqual((summary.best_score, summary.passes), (0, 0))
+
+
+class BatchAnswerSubmissionServiceTest(ServiceTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.extra_questions = [
+            create_test_question_with_answers(self.test_exam, self.test_user, f'Batch question {i}')
+            for i in range(10)
+        ]
+    
+    def _answers(self, correct=True):
+        answers = [{
+            'exam_question_id': str(self.exam_question.id),
+            'answer_id': str(self.correct_answer.id if correct else self.incorrect_answer.id),
+        }]
+        for _, question_answers, exam_question in self.extra_questions:
+            answers.append({
+                'exam_question_id': str(exam_question.id),
+                'answer_id': str(question_answers[0 if correct else 1].id),
+            })
+        return answers
+    
+    def test_submit_answers_creates_results(self):
+        items = self.answer_service.submit_answers(self.student_exam, self._answers())
+        
+        self.assertEqual(len(items), 11)
+        self.assertTrue(all(item['status'] == 'created' for item in items))
+        self.assertEqual(StudentExamResult.objects.filter(student_exam=self.student_exam).count(), 11)
+        
+        result = StudentExamResult.objects.get(student_exam=self.student_exam, exam_question=self.exam_question)
+        self.assertTrue(result.is_correct)
+        self.assertEqual(result.score, 20)
+        self.assertEqual(str(result.id), items[0]['result_id'])
+    
+    def test_submit_answers_updates_existing_results(self):
+        self.answer_service.submit_answers(self.student_exam, self._answers(correct=True))
+        
+        items = self.answer_service.submit_answers(self.student_exam, self._answers(correct=False))
+        
+        self.assertTrue(all(item['status'] == 'updated' for item in items))
+        results = StudentExamResult.objects.filter(student_exam=self.student_exam)
+        self.assertEqual(results.count(), 11)
+        self.assertFalse(results.filter(is_correct=True).exists())
+        self.assertEqual(sum(results.values_list('score', flat=True)), 0)
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.total_score, 0)
+    
+    def test_submit_answers_maintains_running_total(self):
+        self.answer_service.submit_answers(self.student_exam, self._answers())
+        
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.total_score, 20 + 10 * 25)
+    
+    def test_submit_answers_query_count_is_constant(self):
+        # Two lookups, the attempt lock, the existing-results read, one upsert
+        # and the total delta, plus the savepoint pair.
+        with self.assertNumQueries(8):
+            self.answer_service.submit_answers(self.student_exam, self._answers()[:2])
+        
+        # Resubmitting the same answers leaves the total unchanged.
+        with self.assertNumQueries(7):
+            self.answer_service.submit_answers(self.student_exam, self._answers()[:2])
+        
+        with self.assertNumQueries(8):
+            self.answer_service.submit_answers(self.student_exam, self._answers())
+    
+    def test_submit_answers_reports_invalid_items(self):
+        other_question, other_answers, _ = self.extra_questions[0]
+        answers = [
+            {'exam_question_id': 'not-a-uuid', 'answer_id': str(self.correct_answer.id)},
+            {'exam_question_id': '00000000-0000-0000-0000-000000000000', 'answer_id': str(self.correct_answer.id)},
+            {'exam_question_id': str(self.exam_question.id), 'answer_id': str(other_answers[0].id)},
+            'garbage',
+        ]
+        
+        items = self.answer_service.submit_answers(self.student_exam, answers)
+        
+        self.assertEqual([item['status'] for item in items], ['error'] * 4)
+        self.assertEqual(items[0]['detail'], 'Invalid Exam Question ID format')
+        self.assertEqual(items[1]['detail'], 'Exam question not found')
+        self.assertEqual(items[2]['detail'], 'Answer not found')
+        self.assertEqual(items[3]['detail'], 'Invalid data format')
+        self.assertFalse(StudentExamResult.objects.filter(student_exam=self.student_exam).exists())
+    
+    def test_submit_answers_later_duplicate_wins(self):
+        answers = [
+            [str(self.exam_question.id), str(self.correct_answer.id)],
+            [str(self.exam_question.id), str(self.incorrect_answer.id)],
+        ]
+        
+        items = self.answer_service.submit_answers(self.student_exam, answers)
+        
+        self.assertEqual(items[0]['status'], 'skipped')
+        self.assertEqual(items[1]['status'], 'created')
+        result = StudentExamResult.objects.get(student_exam=self.student_exam)
+        self.assertEqual(result.answer, self.incorrect_answer)
+    
+    @override_settings(ANSWER_BATCH_MAX_SIZE=5)
+    def test_submit_answers_rejects_oversized_batch(self):
+        with self.assertRaises(ValidationError):
+            self.answer_service.submit_answers(self.student_exam, self._answers())
+
+
+class ExamExpiryServiceTest(ServiceTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        # The fixture exam runs for an hour; this attempt started two hours ago.
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(start_time=self.now - dt.timedelta(hours=2))
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+    
+    def _attempt(self, started_ago):
+        return StudentExam.objects.create(
+            student=self.test_student,
+            exam=self.test_exam,
+            start_time=self.now - started_ago,
+            status='in_progress',
+            max_exam_score=self.test_exam.max_score
+        )
+    
+    def test_expired_attempt_is_totalled_and_closed(self):
+        swept = ExamExpiryService.expire_attempts(now=self.now)
+        
+        self.assertEqual(swept, {'attempts': 1, 'exams': 1})
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.status, 'done')
+        self.assertEqual(self.student_exam.total_score, 20)
+        self.assertEqual(self.student_exam.exam_result, 'fail')
+        self.assertEqual(self.student_exam.end_time, self.student_exam.start_time + dt.timedelta(hours=1))
+    
+    def test_passing_attempt_marked_pass(self):
+        self.test_exam.passing_score = 20
+        self.test_exam.save()
+        
+        ExamExpiryService.expire_attempts(now=self.now)
+        
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.exam_result, 'pass')
+    
+    def test_running_and_untimed_attempts_untouched(self):
+        running = self._attempt(dt.timedelta(minutes=30))
+        within_grace = self._attempt(dt.timedelta(minutes=60, seconds=30))
+        _, untimed_exam = create_test_exam_data()
+        untimed_exam.exam_timer = 0
+        untimed_exam.save()
+        untimed = self._attempt(dt.timedelta(days=3))
+        StudentExam.objects.filter(pk=untimed.pk).update(exam=untimed_exam)
+        
+        ExamExpiryService.expire_attempts(now=self.now)
+        
+        for attempt in (running, within_grace, untimed):
+            attempt.refresh_from_db()
+            self.assertEqual(attempt.status, 'in_progress')
+    
+    def test_batches_cover_every_expired_attempt(self):
+        for _ in range(4):
+            self._attempt(dt.timedelta(hours=3))
+        
+        with CaptureQueriesContext(connection) as queries:
+            swept = ExamExpiryService.expire_attempts(batch_size=2, now=self.now)
+        
+        self.assertEqual(swept['attempts'], 5)
+        self.assertFalse(StudentExam.objects.filter(status='in_progress').exists())
+        closing_updates = [q for q in queries if q['sql'].startswith('UPDATE "student_exams"')]
+        self.assertEqual(len(closing_updates), 3)
+    
+    def test_command_reports_sweep(self):
+        out = StringIO()
+        
+        call_command('expire_exam_attempts', '--batch-size', '10', stdout=out)
+        
+        self.assertIn('Expired 1 attempts across 1 exams.', out.getvalue())
+        self.assertNotEqual(
+            self.exam_service.get_or_create_student_exam(self.test_student, self.test_exam).pk,
+            self.student_exam.pk
+        )
+
+
+class RegradeServiceTest(ServiceTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.test_exam.passing_score = 20
+        self.test_exam.save()
+        self.answer_service.submit_answer(self.student_exam, self.exam_question, self.incorrect_answer)
+        ExamCompletionService.complete_exam(self.student_exam)
+        self.other_attempt = StudentExam.objects.create(
+            student=self.test_student,
+            exam=self.test_exam,
+            start_time=timezone.now(),
+            status='in_progress',
+            max_exam_score=self.test_exam.max_score
+        )
+        self.answer_service.submit_answer(self.other_attempt, self.exam_question, self.correct_answer)
+    
+    def _fix_answer_key(self):
+        # The author marks the other option as correct.
+        QuestionAnswer.objects.filter(pk=self.correct_answer.pk).update(is_correct=False)
+        QuestionAnswer.objects.filter(pk=self.incorrect_answer.pk).update(is_correct=True)
+    
+    def test_regrade_by_question_rewrites_results_and_totals(self):
+        self._fix_answer_key()
+        
+        totals = RegradeService.regrade(question_id=self.test_question.id)
+        
+        self.assertEqual(totals['results'], 2)
+        self.assertEqual(totals['attempts'], 2)
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.total_score, 20)
+        self.assertEqual(self.student_exam.exam_result, 'pass')
+        self.other_attempt.refresh_from_db()
+        self.assertEqual(self.other_attempt.total_score, 0)
+        self.assertIsNone(self.other_attempt.exam_result)
+        result = StudentExamResult.objects.get(student_exam=self.student_exam)
+        self.assertTrue(result.is_correct)
+        self.assertEqual(result.score, 20)
+    
+    def test_score_change_regraded_by_exam(self):
+        ExamQuestion.objects.filter(pk=self.exam_question.pk).update(score=35)
+        
+        totals = RegradeService.regrade(exam_id=self.test_exam.id)
+        
+        self.assertEqual(totals['results'], 1)
+        self.other_attempt.refresh_from_db()
+        self.assertEqual(self.other_attempt.total_score, 35)
+    
+    def test_regrade_is_idempotent(self):
+        self._fix_answer_key()
+        RegradeService.regrade(question_id=self.test_question.id)
+        
+        totals = RegradeService.regrade(question_id=self.test_question.id)
+        
+        self.assertEqual((totals['results'], totals['attempts']), (0, 0))
+    
+    def test_chunked_run_reports_progress_and_resumes(self):
+        self._fix_answer_key()
+        first_id = RegradeService.affected_attempts(exam_id=self.test_exam.id).values_list('pk', flat=True).first()
+        seen = []
+        
+        totals = RegradeService.regrade(
+            exam_id=self.test_exam.id, chunk_size=1, progress=lambda t: seen.append(t['last_attempt_id'])
+        )
+        
+        self.assertEqual(seen[0], first_id)
+        self.assertEqual(totals['results'], 2)
+        
+        # Revert the key and resume after the first attempt: only the second is regraded.
+        QuestionAnswer.objects.filter(pk=self.correct_answer.pk).update(is_correct=True)
+        QuestionAnswer.objects.filter(pk=self.incorrect_answer.pk).update(is_correct=False)
+        resumed = RegradeService.regrade(exam_id=self.test_exam.id, chunk_size=1, start_after=first_id)
+        self.assertEqual(resumed['results'], 1)
+    
+    def test_correlated_fallback_matches(self):
+        self._fix_answer_key()
+        
+        with patch.object(RegradeService, 'UPDATE_FROM_VENDORS', ()):
+            RegradeService.regrade(question_id=self.test_question.id)
+        
+        self.student_exam.refresh_from_db()
+        self.assertEqual((self.student_exam.total_score, self.student_exam.exam_result), (20, 'pass'))
+    
+    def test_command_requires_scope(self):
+        with self.assertRaises(CommandError):
+            call_command('regrade_results', stdout=StringIO())
+    
+    def test_command_reports_totals(self):
+        self._fix_answer_key()
+        out = StringIO()
+        
+        call_command('regrade_results', '--exam', str(self.test_exam.id), '--chunk-size', '1', stdout=out)
+        
+        self.assertIn('Chunk 1:', out.getvalue())
+        self.assertIn('results changed', out.getvalue())
+
+
+class ResultSummaryServiceTest(ServiceTestCase):
+    
+    def _finish_attempt(self, answer):
+        attempt = StudentExam.objects.create(
+            student=self.test_student,
+            exam=self.test_exam,
+            start_time=timezone.now(),
+            status='in_progress',
+            max_exam_score=self.test_exam.max_score
+        )
+        self.answer_service.submit_answer(attempt, self.exam_question, answer)
+        ExamCompletionService.complete_exam(attempt)
+        return attempt
+    
+    def test_completion_updates_summaries(self):
+        self.test_exam.passing_score = 20
+        self.test_exam.save()
+        self._finish_attempt(self.correct_answer)
+        self._finish_attempt(self.incorrect_answer)
+        
+        summary = StudentExamSummary.objects.get(student=self.test_student, exam=self.test_exam)
+        self.assertEqual((summary.attempts, summary.passes), (2, 1))
+        self.assertEqual((summary.best_score, summary.latest_score), (20, 0))
+        self.assertEqual(summary.latest_result, 'fail')
+        category = StudentCategorySummary.objects.get(student=self.test_student)
+        self.assertEqual(category.category, self.test_exam.category)
+        self.assertEqual((category.attempts, category.passes, category.score_sum), (2, 1, 20))
+        self.assertEqual(category.max_score_sum, 200)
+    
+    def test_in_progress_attempts_not_counted(self):
+        ResultSummaryService.refresh([self.test_student.id])
+        
+        self.assertFalse(StudentExamSummary.objects.filter(student=self.test_student).exists())
+    
+    def test_expiry_sweep_updates_summaries(self):
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(start_time=timezone.now() - dt.timedelta(hours=2))
+        
+        ExamExpiryService.expire_attempts()
+        
+        self.assertEqual(StudentExamSummary.objects.get(student=self.test_student).attempts, 1)
+    
+    def test_regrade_updates_summaries(self):
+        self._finish_attempt(self.incorrect_answer)
+        QuestionAnswer.objects.filter(pk=self.incorrect_answer.pk).update(is_correct=True)
+        
+        RegradeService.regrade(exam_id=self.test_exam.id)
+        
+        self.assertEqual(StudentExamSummary.objects.get(student=self.test_student).best_score, 20)
+    
+    def test_rebuild_command(self):
+        self._finish_attempt(self.correct_answer)
+        StudentExamSummary.objects.all().delete()
+        out = StringIO()
+        
+        call_command('rebuild_result_summaries', '--batch-size', '1', stdout=out)
+        
+        self.assertEqual(StudentExamSummary.objects.get(student=self.test_student).attempts, 1)
+        self.assertIn('Rebuilt result summaries for', out.getvalue())
+
+
+class LeaderboardServiceTest(ServiceTestCase):
+    
+    def _finish_attempt(self, answer=None):
+        attempt = StudentExam.objects.create(
+            student=create_test_student(),
+            exam=self.test_exam,
+            start_time=timezone.now(),
+            status='in_progress',
+            max_exam_score=self.test_exam.max_score
+        )
+        if answer is not None:
+            self.answer_service.submit_answer(attempt, self.exam_question, answer)
+        return ExamCompletionService.complete_exam(attempt)
+    
+    def _histogram(self):
+        return LeaderboardService.histogram(self.test_exam.id)
+    
+    def test_rank_in_histogram(self):
+        histogram = [(90, 1), (70, 2), (40, 1)]
+        
+        self.assertEqual(LeaderboardService.rank_in(histogram, 90), {'rank': 1, 'ranked_attempts': 4, 'percentile': 87.5})
+        self.assertEqual(LeaderboardService.rank_in(histogram, 70), {'rank': 2, 'ranked_attempts': 4, 'percentile': 50.0})
+        self.assertEqual(LeaderboardService.rank_in([], 70), {'rank': 1, 'ranked_attempts': 0, 'percentile': None})
+    
+    def test_completion_reports_rank_and_percentile(self):
+        self._finish_attempt(self.correct_answer)
+        self._finish_attempt()
+        
+        completion = self._finish_attempt(self.correct_answer)
+        
+        self.assertEqual(completion['rank'], 1)
+        self.assertEqual(completion['ranked_attempts'], 3)
+        self.assertEqual(completion['percentile'], 66.67)
+        self.assertEqual(self._histogram(), [(20, 2), (0, 1)])
+    
+    def test_standing_reads_histogram_only(self):
+        self._finish_attempt(self.correct_answer)
+        
+        with CaptureQueriesContext(connection) as queries:
+            LeaderboardService.standing(self.test_exam.id, 20)
+        
+        self.assertEqual(len(queries), 1)
+        self.assertIn('exam_score_buckets', queries[0]['sql'])
+    
+    def test_expiry_sweep_adds_closed_attempts(self):
+        StudentExam.objects.filter(pk=self.student_exam.pk).update(start_time=timezone.now() - dt.timedelta(hours=2))
+        
+        ExamExpiryService.expire_attempts()
+        
+        self.assertEqual(self._histogram(), [(0, 1)])
+    
+    def test_regrade_moves_attempts_between_buckets(self):
+        self._finish_attempt(self.incorrect_answer)
+        QuestionAnswer.objects.filter(pk=self.incorrect_answer.pk).update(is_correct=True)
+        
+        RegradeService.regrade(exam_id=self.test_exam.id)
+        
+        self.assertEqual(self._histogram(), [(20, 1)])
+    
+    def test_top_ranks_ties_together(self):
+        self._finish_attempt(self.correct_answer)
+        self._finish_attempt(self.correct_answer)
+        self._finish_attempt()
+        
+        entries, ranked_attempts = LeaderboardService.top(self.test_exam, 2)
+        
+        self.assertEqual(ranked_attempts, 3)
+        self.assertEqual([(rank, attempt.total_score) for rank, attempt in entries], [(1, 20), (1, 20)])
+        self.assertEqual(LeaderboardService.top(self.test_exam, 3)[0][2][0], 3)
+    
+    def test_rebuild_command(self):
+        self._finish_attempt(self.correct_answer)
+        ExamScoreBucket.objects.all().delete()
+        out = StringIO()
+        
+        call_command('rebuild_leaderboards', stdout=out)
+        
+        self.assertEqual(self._histogram(), [(20, 1)])
+        self.assertIn('Rebuilt leaderboards for', out.getvalue())
@@ -1,11 +1,18 @@
-from django.test import TestCase
+from django.test import AsyncRequestFactory, TestCase, RequestFactory, override_settings
+from django.core.cache import cache
 from django.urls import reverse
 from unittest.mock import patch, MagicMock
 import json
 
-from core.test_utils import APITestCase
+from core.test_utils import APITestCase, LOCMEM_CACHES, create_test_question_with_answers
+from exams.question.answer_key import AnswerKeyIndex
 from .models import Student, StudentExam, StudentExamResult
-from core.exceptions import AuthenticationError, NotFoundError
+from .item_analysis import ItemAnalysisService
+from .services import AnswerSubmissionService, AuthenticationService, ExamCompletionService
+from core.exceptions import AuthenticationError, NotFoundError, ServiceUnavailableError
+from .views import (
+    CompleteExamView, DashboardView, LeaderboardView, ResultsView, SubmitAnswerView, SubmitAnswersView, AsyncStartExamView, AsyncSubmitAnswerView, AsyncCompleteExamView
+)
 
 
 class StudentLoginViewTest(APITestCase):
@@ -40,6 +47,25 @@ class StudentLoginViewTest(APITestCase):
             self.assertEqual(data['student']['id'], str(self.test_student.id))
             self.assertEqual(data['student']['email_address'], self.test_student.email_address)
     
+    def test_login_busy_returns_retry_after(self):
+        login_data = {
+            'email': self.test_student.email_address,
+            'password': 'testpass123'
+        }
+        
+        with patch('core.passwords.PasswordHasherPool.verify') as mock_verify:
+            mock_verify.side_effect = ServiceUnavailableError('Busy', retry_after=3)
+            
+            response = self.client.post(
+                '/api/auth/login',
+                data=json.dumps(login_data),
+                content_type='application/json'
+            )
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertEqual(response.json()['detail'], 'Busy')
+    
     def test_login_missing_credentials(self):
         login_data = {'email': self.test_student.email_address}
         
@@ -86,6 +112,33 @@ class StudentLoginViewTest(APITestCase):
         self.assertIn('detail', data)
 
 
+class RefreshTokenViewTest(APITestCase):
+    
+    def _post(self, payload):
+        return self.client.post('/api/auth/refresh', data=json.dumps(payload), content_type='application/json')
+    
+    def test_refresh_success(self):
+        refresh = AuthenticationService.generate_tokens(self.test_student)['refresh']
+        
+        response = self._post({'refresh': refresh})
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn('access', data)
+        self.assertEqual(data['refresh'], refresh)
+    
+    def test_refresh_missing_token(self):
+        response = self._post({})
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_refresh_invalid_token(self):
+        response = self._post({'refresh': 'not-a-token'})
+        
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['detail'], 'Invalid refresh token')
+
+
 class StartExamViewTest(APITestCase):
     
     def setUp(self):
@@ -301,4 +354,341 @@ class CompleteExamViewTest(APITestCase):
             self.assertEqual(response.status_code, 404)
             data = response.json()
             self.assertIn('detail', data)
-            self.assertEqual(data['detail'], 'Student exam not found')
\ No newline at end of file
+            self.assertEqual(data['detail'], 'Student exam not found')
+
+
+class SubmitAnswersViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+    
+    def _post(self, payload):
+        request = self.factory.post(
+            '/api/submit-answers',
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+        request.student = self.test_student
+        return SubmitAnswersView.as_view()(request)
+    
+    def test_submit_answers_success(self):
+        response = self._post({
+            'student_exam_id': str(self.student_exam.id),
+            'answers': [
+                {'exam_question_id': str(self.exam_question.id), 'answer_id': str(self.correct_answer.id)},
+                {'exam_question_id': str(self.exam_question.id), 'answer_id': 'bad'},
+            ]
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['student_exam_id'], str(self.student_exam.id))
+        self.assertEqual(data['submitted'], 1)
+        self.assertEqual(data['failed'], 1)
+        self.assertEqual(data['results'][0]['status'], 'created')
+        self.assertEqual(data['results'][0]['score'], 20)
+        self.assertEqual(data['results'][1]['status'], 'error')
+    
+    def test_submit_answers_missing_answers(self):
+        response = self._post({'student_exam_id': str(self.student_exam.id), 'answers': []})
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_submit_answers_exam_not_in_progress(self):
+        self.student_exam.status = 'done'
+        self.student_exam.save()
+        
+        response = self._post({
+            'student_exam_id': str(self.student_exam.id),
+            'answers': [[str(self.exam_question.id), str(self.correct_answer.id)]],
+        })
+        
+        self.assertEqual(response.status_code, 404)
+    
+    def test_submit_answers_not_a_list(self):
+        response = self._post({'student_exam_id': str(self.student_exam.id), 'answers': 'nope'})
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['detail'], 'answers must be a list')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, EXAM_PAPER_CACHE_SHARED=True)
+class SubmitAnswerGradingTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        AnswerKeyIndex._cache.clear()
+    
+    def _post(self, payload):
+        request = self.factory.post(
+            '/api/submit-answer',
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+        request.student = Student.deferred(self.test_student.id)
+        return SubmitAnswerView.as_view()(request)
+    
+    def _payload(self, answer):
+        return {
+            'student_exam_id': str(self.student_exam.id),
+            'exam_question_id': str(self.exam_question.id),
+            'answer_id': str(answer.id),
+        }
+    
+    def test_submit_answer_grades_in_memory(self):
+        self._post(self._payload(self.incorrect_answer))
+        
+        # Attempt lookup, then savepoint, attempt lock, previous-score read,
+        # upsert, total delta and release; the answer key is already warm.
+        with self.assertNumQueries(7):
+            response = self._post(self._payload(self.correct_answer))
+        
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.content)
+        self.assertEqual(data['exam_question_id'], str(self.exam_question.id))
+        self.assertEqual(data['answer_id'], str(self.correct_answer.id))
+        self.assertTrue(data['is_correct'])
+        self.assertEqual(data['score'], 20)
+        self.student_exam.refresh_from_db()
+        self.assertEqual(self.student_exam.total_score, 20)
+    
+    def test_submit_answer_unknown_question(self):
+        payload = self._payload(self.correct_answer)
+        payload['exam_question_id'] = '00000000-0000-0000-0000-000000000000'
+        
+        response = self._post(payload)
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content)['detail'], 'Exam question not found')
+    
+    def test_submit_answer_for_other_question(self):
+        _, other_answers, _ = create_test_question_with_answers(self.test_exam, self.test_user, 'Other')
+        
+        response = self._post(self._payload(other_answers[0]))
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content)['detail'], 'Answer not found')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AsyncExamFlowViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        AnswerKeyIndex._cache.clear()
+    
+    async def _post(self, view_class, payload, authenticated=True):
+        request = self.factory.post('/', data=json.dumps(payload), content_type='application/json')
+        if authenticated:
+            request.student = Student.deferred(self.test_student.id)
+        return await view_class.as_view()(request)
+    
+    def test_views_are_async(self):
+        for view_class in (AsyncStartExamView, AsyncSubmitAnswerView, AsyncCompleteExamView):
+            self.assertTrue(view_class.view_is_async)
+    
+    async def test_start_submit_complete(self):
+        response = await self._post(AsyncStartExamView, {'exam_id': str(self.test_exam.id)})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.content)['student_exam_id'], str(self.student_exam.id))
+        
+        response = await self._post(AsyncSubmitAnswerView, {
+            'student_exam_id': str(self.student_exam.id),
+            'exam_question_id': str(self.exam_question.id),
+            'answer_id': str(self.correct_answer.id),
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(json.loads(response.content)['is_correct'])
+        
+        response = await self._post(AsyncCompleteExamView, {'student_exam_id': str(self.student_exam.id)})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['total_score'], 20)
+        self.assertEqual(data['exam_result'], 'fail')
+        
+        student_exam = await StudentExam.objects.aget(pk=self.student_exam.pk)
+        self.assertEqual(student_exam.status, 'done')
+    
+    async def test_requires_authentication(self):
+        response = await self._post(AsyncStartExamView, {'exam_id': str(self.test_exam.id)}, authenticated=False)
+        
+        self.assertEqual(response.status_code, 401)
+    
+    async def test_start_exam_not_found(self):
+        response = await self._post(AsyncStartExamView, {'exam_id': '00000000-0000-0000-0000-000000000000'})
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content)['detail'], 'Exam not found')
+    
+    async def test_complete_exam_not_in_progress(self):
+        await StudentExam.objects.filter(pk=self.student_exam.pk).aupdate(status='done')
+        
+        response = await self._post(AsyncCompleteExamView, {'student_exam_id': str(self.student_exam.id)})
+        
+        self.assertEqual(response.status_code, 404)
+
+
+class ResultsDashboardViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        AnswerSubmissionService.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        ExamCompletionService.complete_exam(self.student_exam)
+    
+    def _get(self, view_class):
+        request = self.factory.get('/')
+        request.student = Student.deferred(self.test_student.id)
+        return view_class.as_view()(request)
+    
+    def test_results_single_query(self):
+        with self.assertNumQueries(1):
+            response = self._get(ResultsView)
+        
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.content)['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['exam_id'], str(self.test_exam.id))
+        self.assertEqual(results[0]['exam_name'], self.test_exam.exam_name)
+        self.assertEqual(results[0]['best_score'], 20)
+        self.assertEqual(results[0]['latest_result'], 'fail')
+    
+    def test_dashboard_single_query(self):
+        with self.assertNumQueries(1):
+            response = self._get(DashboardView)
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['overall'], {'attempts': 1, 'passes': 0, 'pass_rate': 0.0, 'average_percentage': 20.0})
+        self.assertEqual(data['categories'][0]['category'], self.test_exam.category)
+        self.assertEqual(data['categories'][0]['average_score'], 20.0)
+    
+    def test_requires_authentication(self):
+        response = ResultsView.as_view()(self.factory.get('/'))
+        
+        self.assertEqual(response.status_code, 401)
+
+
+class LeaderboardViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        AnswerSubmissionService.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        ExamCompletionService.complete_exam(self.student_exam)
+    
+    def _get(self, params):
+        request = self.factory.get('/api/leaderboard', params)
+        request.student = Student.deferred(self.test_student.id)
+        return LeaderboardView.as_view()(request)
+    
+    def test_top_entries(self):
+        response = self._get({'exam_id': str(self.test_exam.id), 'limit': '5'})
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['ranked_attempts'], 1)
+        self.assertEqual(data['results'], [{
+            'rank': 1,
+            'student_name': 'John D',
+            'total_score': 20,
+            'completed_at': StudentExam.objects.get(pk=self.student_exam.pk).end_time.isoformat(),
+        }])
+    
+    def test_invalid_parameters(self):
+        self.assertEqual(self._get({}).status_code, 400)
+        self.assertEqual(self._get({'exam_id': str(self.test_exam.id), 'limit': '0'}).status_code, 400)
+    
+    def test_complete_exam_response_includes_rank(self):
+        student_exam = StudentExam.objects.create(
+            student=self.test_student,
+            exam=self.test_exam,
+            status='in_progress',
+            max_exam_score=self.test_exam.max_score
+        )
+        request = self.factory.post(
+            '/api/complete-exam',
+            data=json.dumps({'student_exam_id': str(student_exam.id)}),
+            content_type='application/json'
+        )
+        request.student = Student.deferred(self.test_student.id)
+        
+        data = json.loads(CompleteExamView.as_view()(request).content)
+        
+        self.assertEqual((data['rank'], data['ranked_attempts'], data['percentile']), (2, 2, 25.0))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ItemStatisticsViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        AnswerSubmissionService.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        ExamCompletionService.complete_exam(self.student_exam)
+        ItemAnalysisService.analyze_exam(self.test_exam.id)
+        self.test_user.is_staff = True
+        self.test_user.save()
+    
+    def _get(self, exam_id):
+        self.client.force_login(self.test_user)
+        return self.client.get('/api/staff/item-statistics', {'exam_id': str(exam_id)})
+    
+    def test_returns_statistics_then_cache_hit(self):
+        first = self._get(self.test_exam.id)
+        second = self._get(self.test_exam.id)
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['X-Stats-Cache'], 'miss')
+        self.assertEqual(second['X-Stats-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+        results = first.json()['results']
+        self.assertEqual(results[0]['exam_question_id'], str(self.exam_question.id))
+        self.assertEqual(results[0]['difficulty'], 1.0)
+        self.assertIsNone(results[0]['discrimination'])
+        self.assertEqual(len(results[0]['answers']), 2)
+    
+    def test_requires_staff(self):
+        self.test_user.is_staff = False
+        self.test_user.save()
+        
+        self.assertEqual(self._get(self.test_exam.id).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/staff/item-statistics').status_code, 401)
+    
+    def test_invalid_and_unknown_exam(self):
+        self.assertEqual(self._get('not-a-uuid').status_code, 400)
+        self.assertEqual(self._get(self.student_exam.id).status_code, 404)
+
+
+@override_settings(RESULT_EXPORT_SETTLE_SECONDS=0)
+class ResultExportViewTest(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        AnswerSubmissionService.submit_answer(self.student_exam, self.exam_question, self.correct_answer)
+        self.test_user.is_staff = True
+        self.test_user.save()
+        self.client.force_login(self.test_user)
+    
+    def test_streams_csv_attachment(self):
+        response = self.client.get('/api/staff/results-export', {'exam_id': str(self.test_exam.id)})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="exam-results.csv"')
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn(str(self.exam_question.id), lines[1])
+    
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/staff/results-export', {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/staff/results-export', {'limit': '0'}).status_code, 400)
+    
+    def test_requires_staff(self):
+        self.client.logout()
+        
+        self.assertEqual(self.client.get('/api/staff/results-export').status_code, 401)
@@ -1,9 +1,16 @@
-from core.base_views import BaseAPIView, AuthenticatedAPIView
-from core.exceptions import ExamAPIException
-from .services import AuthenticationService, ExamService, AnswerSubmissionService, ExamCompletionService
+from django.http import StreamingHttpResponse
+
+from core.base_views import BaseAPIView, AuthenticatedAPIView, AsyncAuthenticatedAPIView, StaffAPIView
+from core.exceptions import ExamAPIException, ServiceUnavailableError
+from .export import ResultExporter
+from .services import (
+    AuthenticationService, ExamService, AnswerSubmissionService, ExamCompletionService, ItemStatisticsService,
+    LeaderboardService, ResultSummaryService
+)
 from .serializers import (
     StudentSerializer, StudentExamSerializer, StudentExamResultSerializer, 
-    ExamCompletionSerializer
+    ExamCompletionSerializer, BatchSubmissionSerializer, ExamSummarySerializer, DashboardSerializer,
+    ItemStatisticSerializer, LeaderboardSerializer
 )
 
 
@@ -29,6 +36,30 @@ class StudentLoginView(BaseAPIView):
                 'student': student_data
             })
             
+        except ServiceUnavailableError as e:
+            response = self.error_response(e.message, e.status_code)
+            response['Retry-After'] = str(e.retry_after)
+            return response
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class RefreshTokenView(BaseAPIView):
+    
+    def post(self, request):
+        try:
+            data = self.get_json_data(request)
+            self.validate_required_fields(data, ['refresh'])
+            
+            tokens = AuthenticationService.refresh_tokens(data['refresh'])
+            
+            return self.success_response({
+                'access': tokens['access'],
+                'refresh': tokens['refresh']
+            })
+            
         except ExamAPIException as e:
             return self.error_response(e.message, e.status_code)
         except Exception as e:
@@ -68,21 +99,39 @@ class SubmitAnswerView(AuthenticatedAPIView):
                 data['student_exam_id']
             )
             
-            exam_question = ExamService.get_exam_question(
-                data['exam_question_id'], 
-                student_exam.exam
+            result = AnswerSubmissionService.submit_answer_by_id(
+                student_exam,
+                data['exam_question_id'],
+                data['answer_id']
             )
             
-            answer = ExamService.get_question_answer(
-                data['answer_id'], 
-                exam_question.question
+            response_data = StudentExamResultSerializer.to_dict(result)
+            
+            return self.success_response(response_data, 201)
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class SubmitAnswersView(AuthenticatedAPIView):
+    
+    def post(self, request):
+        try:
+            data = self.get_json_data(request)
+            self.validate_required_fields(data, ['student_exam_id', 'answers'])
+            
+            student_exam = ExamService.get_active_student_exam(
+                request.student, 
+                data['student_exam_id']
             )
             
-            result = AnswerSubmissionService.submit_answer(student_exam, exam_question, answer)
+            items = AnswerSubmissionService.submit_answers(student_exam, data['answers'])
             
-            response_data = StudentExamResultSerializer.to_dict(result)
+            response_data = BatchSubmissionSerializer.to_dict(student_exam.id, items)
             
-            return self.success_response(response_data, 201)
+            return self.success_response(response_data, 200)
             
         except ExamAPIException as e:
             return self.error_response(e.message, e.status_code)
@@ -111,4 +160,185 @@ class CompleteExamView(AuthenticatedAPIView):
         except ExamAPIException as e:
             return self.error_response(e.message, e.status_code)
         except Exception as e:
-            return self.handle_exception(e)
\ No newline at end of file
+            return self.handle_exception(e)
+
+
+class ResultsView(AuthenticatedAPIView):
+    
+    def get(self, request):
+        try:
+            summaries = ResultSummaryService.exam_summaries(request.student)
+            
+            return self.success_response({'results': ExamSummarySerializer.to_dict_list(summaries)})
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class DashboardView(AuthenticatedAPIView):
+    
+    def get(self, request):
+        try:
+            categories = list(ResultSummaryService.category_summaries(request.student))
+            
+            return self.success_response(DashboardSerializer.to_dict(categories))
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class LeaderboardView(AuthenticatedAPIView):
+    
+    def get(self, request):
+        try:
+            exam_id = request.GET.get('exam_id')
+            if not exam_id:
+                return self.error_response('exam_id is required', 400)
+            
+            exam = LeaderboardService.get_exam(exam_id)
+            
+            entries, ranked_attempts = LeaderboardService.top(
+                exam,
+                LeaderboardService.parse_limit(request.GET.get('limit'))
+            )
+            
+            return self.success_response(LeaderboardSerializer.to_dict(exam, entries, ranked_attempts))
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class ItemStatisticsView(StaffAPIView):
+    
+    def get(self, request):
+        try:
+            exam_id = request.GET.get('exam_id')
+            if not exam_id:
+                return self.error_response('exam_id is required', 400)
+            
+            payload = ItemStatisticsService.get_cached(exam_id)
+            cache_status = 'hit'
+            
+            if payload is None:
+                cache_status = 'miss'
+                exam = ItemStatisticsService.get_exam(exam_id)
+                
+                statistics = ItemStatisticsService.statistics(exam)
+                
+                payload = self.encode_json({
+                    'exam_id': str(exam.id),
+                    'results': ItemStatisticSerializer.to_dict_list(statistics),
+                })
+                ItemStatisticsService.set_cached(exam_id, payload)
+            
+            response = self.raw_json_response(payload)
+            response['X-Stats-Cache'] = cache_status
+            return response
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class ResultExportView(StaffAPIView):
+    
+    def get(self, request):
+        try:
+            exporter = ResultExporter(
+                file_format=request.GET.get('format', 'csv'),
+                exam_id=request.GET.get('exam_id'),
+                since=request.GET.get('since'),
+                until=request.GET.get('until'),
+                after=request.GET.get('after'),
+                limit=ResultExporter.parse_limit(request.GET.get('limit')),
+                compress=request.GET.get('gzip', '').lower() in ('1', 'true', 'yes'),
+            )
+            
+            response = StreamingHttpResponse(exporter.stream(), content_type=exporter.content_type)
+            response['Content-Disposition'] = f'attachment; filename="{exporter.filename}"'
+            return response
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class AsyncStartExamView(AsyncAuthenticatedAPIView):
+    
+    async def post(self, request):
+        try:
+            data = self.get_json_data(request)
+            self.validate_required_fields(data, ['exam_id'])
+            
+            exam = await ExamService.aget_exam_by_id(data['exam_id'])
+            
+            student_exam = await ExamService.aget_or_create_student_exam(request.student, exam)
+            
+            response_data = StudentExamSerializer.to_dict(student_exam)
+            
+            return self.success_response(response_data, 201)
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class AsyncSubmitAnswerView(AsyncAuthenticatedAPIView):
+    
+    async def post(self, request):
+        try:
+            data = self.get_json_data(request)
+            self.validate_required_fields(data, ['student_exam_id', 'exam_question_id', 'answer_id'])
+            
+            student_exam = await ExamService.aget_active_student_exam(
+                request.student, 
+                data['student_exam_id']
+            )
+            
+            result = await AnswerSubmissionService.asubmit_answer_by_id(
+                student_exam,
+                data['exam_question_id'],
+                data['answer_id']
+            )
+            
+            response_data = StudentExamResultSerializer.to_dict(result)
+            
+            return self.success_response(response_data, 201)
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)
+
+
+class AsyncCompleteExamView(AsyncAuthenticatedAPIView):
+    
+    async def post(self, request):
+        try:
+            data = self.get_json_data(request)
+            self.validate_required_fields(data, ['student_exam_id'])
+            
+            student_exam = await ExamService.aget_active_student_exam(
+                request.student, 
+                data['student_exam_id']
+            )
+            
+            completion_data = await ExamCompletionService.acomplete_exam(student_exam)
+            
+            response_data = ExamCompletionSerializer.to_dict(data['student_exam_id'], completion_data)
+            
+            return self.success_response(response_data, 200)
+            
+        except ExamAPIException as e:
+            return self.error_response(e.message, e.status_code)
+        except Exception as e:
+            return self.handle_exception(e)